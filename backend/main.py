@@ -9,11 +9,10 @@ Package Installation Requirement:
         pip install -e .
     
     This allows main.py to import from the installed package:
-        from polyplexity_agent import _checkpointer, main_graph, run_research_agent
+        from polyplexity_agent import _checkpointer, arun_research_agent, main_graph
 """
 import json
 import sys
-import traceback
 from pathlib import Path
 from datetime import datetime
 from typing import List, Optional
@@ -25,10 +24,14 @@ from pydantic import BaseModel
 
 # Import from installed polyplexity_agent package
 # Package must be installed: cd polyplexity_agent && pip install -e .
-from polyplexity_agent import _checkpointer, main_graph, run_research_agent
+from polyplexity_agent import _checkpointer, arun_research_agent, main_graph
 from polyplexity_agent.db_utils import get_database_manager
 from polyplexity_agent.db_utils.db_setup import setup_checkpointer
+from polyplexity_agent.logging import get_logger
 from polyplexity_agent.streaming import create_sse_generator
+from polyplexity_agent.utils.helpers import run_in_thread, wait_for_background_tasks
+
+logger = get_logger(__name__)
 
 app = FastAPI()
 
@@ -67,7 +70,7 @@ async def chat_agent(
     async def sse_generator():
         # Use SSE generator from streaming module
         # It handles all event formatting and completion/error events
-        async for sse_line in create_sse_generator(run_research_agent(request.query, thread_id=thread_id)):
+        async for sse_line in create_sse_generator(arun_research_agent(request.query, thread_id=thread_id)):
             yield sse_line
     
     return StreamingResponse(
@@ -133,9 +136,7 @@ async def list_threads():
             session.close()
         
     except Exception as e:
-        print(f"Error listing threads: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error("list_threads_failed", error=str(e), exc_info=True)
         return []
 
 
@@ -169,15 +170,13 @@ async def delete_thread(thread_id: str):
             try:
                 _checkpointer.delete_thread(thread_id)
             except Exception as e:
-                print(f"Warning: Failed to delete thread from checkpointer: {e}")
+                logger.warning("checkpointer_delete_thread_failed", thread_id=thread_id, error=str(e))
         
         return None  # FastAPI will return 204 No Content
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error deleting thread {thread_id}: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error("delete_thread_failed", thread_id=thread_id, error=str(e), exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to delete thread: {str(e)}"
@@ -230,7 +229,7 @@ async def get_thread_history(thread_id: str):
                 
                 return result
         except Exception as e:
-            print(f"Warning: Failed to get messages from table, falling back to state: {e}")
+            logger.warning("thread_messages_fetch_failed", thread_id=thread_id, error=str(e), fallback="state")
         
         # Fallback to LangGraph state (for backward compatibility or if table is empty)
         if not _checkpointer:
@@ -305,9 +304,7 @@ async def get_thread_history(thread_id: str):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error getting thread history for {thread_id}: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.error("thread_history_failed", thread_id=thread_id, error=str(e), exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve thread history: {str(e)}"
@@ -331,15 +328,21 @@ async def startup_event():
         db_manager = get_database_manager()
         db_manager.initialize_schema()
     except Exception as e:
-        print(f"Warning: Failed to initialize database schema on startup: {e}")
-        traceback.print_exc()
+        logger.warning("startup_schema_init_failed", error=str(e), exc_info=True)
         # Don't fail startup - database may already be set up
     
     # Setup checkpointer separately to ensure it's called even if schema init fails
     try:
         setup_checkpointer(_checkpointer)
     except Exception as e:
-        print(f"Warning: Failed to setup checkpointer in startup event: {e}")
-        traceback.print_exc()
+        logger.warning("startup_checkpointer_setup_failed", error=str(e), exc_info=True)
         # Don't fail startup - checkpointer may have been set up during graph compilation
 
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """
+    Wait for background persistence to finish before the process exits.
+    Thread names and finished exchanges are written off the request path.
+    """
+    await run_in_thread(wait_for_background_tasks, 30)
@@ -1,9 +1,14 @@
 """
 Research agent module.
 Exports the main entry point for the multi-agent research system.
+
+Heavy dependencies (LangGraph, LangChain) are imported lazily on first access.
+Set POLYPLEXITY_EAGER=1 to warm them in a background thread at import time.
 """
+import os
+import threading
 
-__all__ = ["run_research_agent", "main_graph", "_checkpointer"]
+__all__ = ["run_research_agent", "arun_research_agent", "main_graph", "_checkpointer"]
 
 
 def __getattr__(name: str):
@@ -24,9 +29,20 @@ def __getattr__(name: str):
         if name == "run_research_agent":
             from .entrypoint import run_research_agent
             return run_research_agent
+        elif name == "arun_research_agent":
+            from .entrypoint import arun_research_agent
+            return arun_research_agent
         elif name in ["main_graph", "_checkpointer"]:
             from .utils.state_manager import main_graph, _checkpointer
             return main_graph if name == "main_graph" else _checkpointer
     
     raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
 
+
+def _prewarm() -> None:
+    """Import the entry point and its dependency chain ahead of first use."""
+    from . import entrypoint  # noqa: F401
+
+
+if os.getenv("POLYPLEXITY_EAGER") == "1":
+    threading.Thread(target=_prewarm, name="polyplexity-prewarm", daemon=True).start()
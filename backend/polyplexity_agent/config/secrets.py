@@ -4,8 +4,10 @@ Database secrets and connection management.
 Handles PostgreSQL connection string retrieval and PostgresSaver initialization.
 Manages environment variable loading for database configuration.
 """
+import asyncio
+import functools
 import os
-from typing import Optional
+from typing import Any, AsyncIterator, Optional
 
 from dotenv import load_dotenv
 from langgraph.checkpoint.postgres import PostgresSaver
@@ -20,6 +22,43 @@ logger = get_logger(__name__)
 _checkpointer_context = None
 
 
+class ThreadedPostgresSaver(PostgresSaver):
+    """
+    PostgresSaver that also serves LangGraph's async checkpoint API.
+    
+    The synchronous saver raises NotImplementedError from its async methods, which
+    makes graph.astream() unusable. Each async method runs its sync counterpart in
+    the default executor, sharing the saver's connection and lock.
+    """
+    
+    async def _run(self, func: Any, *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking saver method in the default executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+    
+    async def aget_tuple(self, config):
+        """Fetch a checkpoint tuple without blocking the event loop."""
+        return await self._run(self.get_tuple, config)
+    
+    async def alist(self, config, *, filter=None, before=None, limit=None) -> AsyncIterator[Any]:
+        """List checkpoints without blocking the event loop."""
+        items = await self._run(lambda: list(self.list(config, filter=filter, before=before, limit=limit)))
+        for item in items:
+            yield item
+    
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        """Store a checkpoint without blocking the event loop."""
+        return await self._run(self.put, config, checkpoint, metadata, new_versions)
+    
+    async def aput_writes(self, config, writes, task_id, task_path=""):
+        """Store intermediate writes without blocking the event loop."""
+        return await self._run(self.put_writes, config, writes, task_id, task_path)
+    
+    async def adelete_thread(self, thread_id):
+        """Delete a thread's checkpoints without blocking the event loop."""
+        return await self._run(self.delete_thread, thread_id)
+
+
 def get_postgres_connection_string() -> Optional[str]:
     """
     Get PostgreSQL connection string from environment variable.
@@ -35,6 +74,8 @@ def create_checkpointer() -> Optional[PostgresSaver]:
     """
     Create and initialize PostgresSaver checkpointer if database is configured.
     
+    The saver supports both graph.stream() and graph.astream().
+    
     Returns:
         PostgresSaver instance if configured, None otherwise
     """
@@ -52,7 +93,7 @@ def create_checkpointer() -> Optional[PostgresSaver]:
         
         # PostgresSaver.from_conn_string() returns a context manager
         # We need to keep the context manager alive and enter it
-        _checkpointer_context = PostgresSaver.from_conn_string(conn_string)
+        _checkpointer_context = ThreadedPostgresSaver.from_conn_string(conn_string)
         checkpointer = _checkpointer_context.__enter__()
         logger.info("checkpointer_created", checkpointer_type=str(type(checkpointer)), has_setup=hasattr(checkpointer, "setup"))
         # Setup will be called separately to ensure it's only called once
@@ -26,6 +26,21 @@ class Settings(BaseSettings):
     thread_name_model: str = "llama-3.1-8b-instant"
     thread_name_temperature: float = 0.3
     max_structured_output_retries: int = 3
+    supervisor_decision_cache_size: int = 256  # 0 disables the decision cache
+    llm_response_cache_size: int = 128  # 0 disables the direct answer/report cache
+    research_cache_size: int = 64  # 0 disables the per-topic research summary cache
+    query_cache_size: int = 128  # 0 disables the per-topic search query cache
+    search_cache_size: int = 512  # 0 disables the Tavily search result cache
+    search_cache_ttl_seconds: float = 86400.0
+    named_thread_cache_size: int = 1024  # Threads known to be named skip the database lookup
+    state_log_verbose: bool = False  # Log full state snapshots instead of keys and node updates
+    max_parallel_research_topics: int = 3
+    max_supervisor_iterations: int = 8  # Report-format research rounds before the final report is forced
+    supervisor_finish_confidence: float = 0.85  # Research decisions this confident finish instead; >1 disables
+    supervisor_full_notes: int = 3  # Older notes are condensed in the supervisor prompt
+    supervisor_note_digest_chars: int = 300
+    final_report_notes_max_chars: int = 32000  # Older notes are condensed beyond this; 0 disables
+    synthesis_min_chars: int = 300  # Smaller search results become the research note without an LLM call; 0 disables
     
     # State logs configuration
     state_logs_dir: Optional[Path] = None
@@ -2,11 +2,17 @@
 Database manager using SQLAlchemy ORM.
 Consolidates all database operations (migrations and CRUD) into a single entry point.
 """
+import json
 import time
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional
 
-from sqlalchemy import create_engine, text
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
+from sqlalchemy import create_engine, func, insert, text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import Session, sessionmaker
 
@@ -14,6 +20,20 @@ from polyplexity_agent.config.secrets import get_postgres_connection_string
 from .db_schema import Base, ExecutionTrace, Message, Thread
 
 
+def _json_serializer(value: Any) -> str:
+    """Serialize a JSON column value, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(value)
+
+
+def _json_deserializer(value: str) -> Any:
+    """Deserialize a JSON column value, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
+
+
 class DatabaseManager:
     """
     Centralized database manager for all database operations.
@@ -42,7 +62,13 @@ class DatabaseManager:
             logger = get_logger(__name__)
             logger.debug("connection_string_converted", original_format=original_conn_string.split("@")[0], new_format=conn_string.split("@")[0])
         
-        self.engine = create_engine(conn_string, pool_pre_ping=True)
+        # Execution traces are the bulk of JSON written per run, so serialize them with orjson
+        self.engine = create_engine(
+            conn_string,
+            pool_pre_ping=True,
+            json_serializer=_json_serializer,
+            json_deserializer=_json_deserializer,
+        )
         self.SessionLocal = sessionmaker(bind=self.engine, autocommit=False, autoflush=False)
     
     def get_session(self) -> Session:
@@ -73,8 +99,6 @@ class DatabaseManager:
             from polyplexity_agent.logging import get_logger
             logger = get_logger(__name__)
             logger.error("database_schema_init_failed", error=str(e), exc_info=True)
-            import traceback
-            traceback.print_exc()
             return False
     
     def reset_database(self) -> bool:
@@ -110,8 +134,6 @@ class DatabaseManager:
             from polyplexity_agent.logging import get_logger
             logger = get_logger(__name__)
             logger.error("database_reset_failed", error=str(e), exc_info=True)
-            import traceback
-            traceback.print_exc()
             return False
     
     def save_thread_name(self, thread_id: str, name: str) -> None:
@@ -235,7 +257,7 @@ class DatabaseManager:
             The UUID of the created trace event
         """
         if timestamp is None:
-            timestamp = int(time.time() * 1000)  # Milliseconds
+            timestamp = time.time_ns() // 1_000_000  # Milliseconds
         
         session = self.get_session()
         try:
@@ -262,6 +284,38 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def save_execution_traces(
+        self,
+        message_id: str,
+        events: List[Dict[str, Any]],
+        replace: bool = False
+    ) -> None:
+        """
+        Save a message's execution trace events with one batched insert.
+        
+        Args:
+            message_id: The UUID of the message these traces belong to
+            events: Dictionaries with event_type, event_data, timestamp and event_index
+            replace: Delete the message's existing traces in the same transaction first
+        """
+        session = self.get_session()
+        try:
+            if replace:
+                session.query(ExecutionTrace).filter(
+                    ExecutionTrace.message_id == message_id
+                ).delete()
+            if events:
+                session.execute(
+                    insert(ExecutionTrace),
+                    [{"message_id": message_id, **event} for event in events]
+                )
+            session.commit()
+        except SQLAlchemyError as e:
+            session.rollback()
+            raise e
+        finally:
+            session.close()
+    
     def delete_message_traces(self, message_id: str) -> None:
         """
         Delete all execution trace events for a specific message.
@@ -339,6 +393,24 @@ class DatabaseManager:
         finally:
             session.close()
     
+    def count_message_traces(self, message_id: str) -> int:
+        """
+        Count the execution trace events stored for a message.
+        
+        Args:
+            message_id: The message UUID to count traces for
+            
+        Returns:
+            Number of trace events, computed in the database without loading the rows
+        """
+        session = self.get_session()
+        try:
+            return session.query(func.count(ExecutionTrace.id)).filter(
+                ExecutionTrace.message_id == message_id
+            ).scalar() or 0
+        finally:
+            session.close()
+    
     def get_thread_messages_with_traces(self, thread_id: str) -> List[Dict[str, Any]]:
         """
         Get all messages for a thread with their execution traces attached.
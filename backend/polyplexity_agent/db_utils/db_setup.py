@@ -1,7 +1,6 @@
 """
 Database setup utilities for initializing LangGraph checkpointer tables.
 """
-import traceback
 from typing import Optional
 
 from sqlalchemy import text
@@ -128,6 +127,5 @@ def setup_checkpointer(checkpointer: Optional[object]):
         _run_checkpointer_setup(checkpointer)
     except Exception as e:
         logger.error("checkpointer_setup_failed", error=str(e), exc_info=True)
-        traceback.print_exc()
         # Don't raise - allow startup to continue, but log the error
 
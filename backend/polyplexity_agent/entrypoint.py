@@ -6,103 +6,147 @@ Exposes high-level helper functions for easy importing:
 """
 import re
 import uuid
+from contextvars import Token
 from datetime import datetime
-from typing import Any, Iterator, Optional, Tuple
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
 from polyplexity_agent.config import Settings
 from polyplexity_agent.graphs.agent_graph import create_agent_graph
 from polyplexity_agent.logging import get_logger
 from polyplexity_agent.utils.state_manager import (
     _checkpointer,
-    _state_logger,
+    get_state_logger,
+    reset_state_logger,
     set_state_logger,
 )
-from polyplexity_agent.graphs.subgraphs.market_research import set_state_logger as set_market_research_logger
-from polyplexity_agent.graphs.subgraphs.researcher import set_state_logger as set_researcher_logger
 from polyplexity_agent.streaming import process_custom_events, process_update_events
 from polyplexity_agent.streaming.event_serializers import create_trace_event
 from polyplexity_agent.utils.helpers import (
     ensure_trace_completeness,
+    format_date,
     log_node_state,
+    run_in_background,
+    run_in_thread,
 )
 from polyplexity_agent.utils.state_logger import StateLogger
 
+settings = Settings()
 logger = get_logger(__name__)
 
+# Characters stripped from the question when naming state log files
+_SANITIZE_RE = re.compile(r'[^\w\s-]')
+
+# Default graph compiled on first use and shared by later runs
+_default_graph: Optional[Any] = None
+
 
 def create_default_graph() -> Any:
     """
     Create the default agent graph with default settings.
     
+    Reuses the process-wide checkpointer so each graph does not open and
+    register its own Postgres connection.
+    
     Returns:
         Compiled LangGraph instance
     """
-    settings = Settings()
-    return create_agent_graph(settings=settings)
+    return create_agent_graph(settings=settings, checkpointer=_checkpointer)
 
 
-def run_research_agent(
-    message: str,
-    thread_id: Optional[str] = None,
-    graph: Optional[Any] = None
-) -> Iterator[Tuple[str, Any]]:
+def _get_default_graph() -> Any:
+    """Return the shared default graph, compiling it on first use."""
+    global _default_graph
+    if _default_graph is None:
+        _default_graph = create_default_graph()
+    return _default_graph
+
+
+def _prepare_run(thread_id: Optional[str], graph: Optional[Any]) -> Tuple[Any, Optional[str], Dict[str, Any], bool]:
     """
-    Run the multi-agent research system with streaming support.
+    Resolve the graph, thread ID and run config for a research run.
     
     Args:
-        message: The user's research question/request
         thread_id: Optional thread ID for checkpointing
-        graph: Optional graph instance (creates default if None)
+        graph: Optional graph instance (uses the shared default graph if None)
         
-    Yields:
-        Tuples of (mode, data) from LangGraph stream
+    Returns:
+        Tuple of (graph, thread_id, config, may_have_state). may_have_state is
+        False when the thread ID was minted here, so no checkpoint can exist yet.
     """
-    global _state_logger
-    
     if graph is None:
-        graph = create_default_graph()
+        graph = _get_default_graph()
     
-    if thread_id is None and _checkpointer:
+    thread_id_was_generated = thread_id is None and bool(_checkpointer)
+    if thread_id_was_generated:
         thread_id = f"thread_{uuid.uuid4().hex[:12]}"
     
     config = {}
     if _checkpointer and thread_id:
         config = {"configurable": {"thread_id": thread_id}}
+    return graph, thread_id, config, bool(config) and not thread_id_was_generated
+
+
+def _start_state_logger(message: str) -> Tuple[StateLogger, Path]:
+    """
+    Create the per-run state log file.
     
-    settings = Settings()
-    settings.state_logs_dir.mkdir(parents=True, exist_ok=True)
+    The caller registers the logger with set_state_logger() in its own context,
+    so concurrent runs each log to their own file.
+    
+    Args:
+        message: The user's research question, used in the log filename
+        
+    Returns:
+        Tuple of (state logger, path of the state log file)
+    """
+    # StateLogger creates the log directory when it opens the file
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    sanitized_question = re.sub(r'[^\w\s-]', '', message)[:50].strip().replace(' ', '_')
+    sanitized_question = _SANITIZE_RE.sub('', message)[:50].strip().replace(' ', '_')
     log_filename = f"state_log_{timestamp}_{sanitized_question}.txt"
     log_path = settings.state_logs_dir / log_filename
     
-    _state_logger = StateLogger(log_path)
-    set_state_logger(_state_logger)
-    set_researcher_logger(_state_logger)
-    set_market_research_logger(_state_logger)
+    return StateLogger(log_path, verbose=settings.state_log_verbose), log_path
+
+
+def _close_state_logger(state_logger: StateLogger, log_path: Path, token: Token) -> None:
+    """
+    Unregister the per-run state logger and close its log file.
     
-    is_follow_up = False
-    existing_state = None
-    if _checkpointer and thread_id:
-        try:
-            existing_state_snapshot = graph.get_state(config)
-            if existing_state_snapshot and existing_state_snapshot.values:
-                existing_state = existing_state_snapshot.values
-                is_follow_up = True
-        except Exception:
-            pass
+    Args:
+        state_logger: Logger returned by _start_state_logger()
+        log_path: Path of the state log file
+        token: Token returned by set_state_logger() when the run started
+    """
+    reset_state_logger(token)
+    state_logger.close()
+    logger.info("state_log_saved", log_path=str(log_path.absolute()))
+
+
+def _build_initial_state(message: str, existing_state: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Build the initial graph input for a new question.
     
-    if is_follow_up and existing_state:
+    Args:
+        message: The user's research question/request
+        existing_state: Checkpointed state of the thread, or None for a fresh conversation
+        
+    Returns:
+        Initial state dictionary for the graph
+    """
+    if existing_state:
         initial_state = {
             "user_request": message,
             "research_notes": [],
+            "notes_context": "",
             "iterations": 0,
             "conversation_history": [],
             "conversation_summary": existing_state.get("conversation_summary", ""),
             "current_report_version": existing_state.get("current_report_version", 0),
             "next_topic": "",
             "final_report": "",
-            "execution_trace": []
+            # The reset signal drops the previous question's trace from the checkpoint
+            "execution_trace": [{"type": "reset"}]
         }
         
         # Log loaded conversation history size
@@ -118,6 +162,7 @@ def run_research_agent(
         initial_state = {
             "user_request": message,
             "research_notes": [],
+            "notes_context": "",
             "iterations": 0,
             "conversation_history": [],
             "conversation_summary": "",
@@ -126,81 +171,195 @@ def run_research_agent(
             "final_report": "",
             "execution_trace": []
         }
+    # One date for every prompt in this turn, however many iterations it takes
+    initial_state["_current_date"] = format_date()
+    return initial_state
+
+
+def _existing_values(snapshot: Any) -> Optional[Dict[str, Any]]:
+    """Return the values of a state snapshot, or None if the thread has no state."""
+    values = snapshot.values if snapshot else None
+    return values or None
+
+
+def _collect_update_traces(node_name: str, node_data: Dict[str, Any], question_execution_trace: List[Dict]) -> None:
+    """
+    Collect trace events from a node's state update into the question trace.
+    
+    Node execution_trace updates are not collected here: every trace event they
+    carry was already streamed as a custom event, and the state's
+    manage_execution_trace reducer keeps them in the checkpoint.
+    
+    Args:
+        node_name: Name of the node that produced the update
+        node_data: State update returned by the node
+        question_execution_trace: Trace events collected for the current question
+    """
+    # Collect state_update events for approved_markets and polymarket_blurb
+    # These need to be persisted in execution trace for frontend restoration
+    if node_name == "call_market_research" and "approved_markets" in node_data:
+        approved_markets = node_data.get("approved_markets")
+        if isinstance(approved_markets, list) and len(approved_markets) > 0:
+            state_update_event = create_trace_event(
+                "state_update",
+                "call_market_research",
+                {"approved_markets": approved_markets}
+            )
+            if state_update_event is not None:
+                question_execution_trace.append(state_update_event)
+    
+    if node_name == "rewrite_polymarket_response" and "polymarket_blurb" in node_data:
+        polymarket_blurb = node_data.get("polymarket_blurb")
+        if isinstance(polymarket_blurb, str) and len(polymarket_blurb) > 0:
+            state_update_event = create_trace_event(
+                "state_update",
+                "rewrite_polymarket_response",
+                {"polymarket_blurb": polymarket_blurb}
+            )
+            if state_update_event is not None:
+                question_execution_trace.append(state_update_event)
+
+
+def _process_stream_chunk(mode: str, data: Any, question_execution_trace: List[Dict]) -> List[Tuple[str, Any]]:
+    """
+    Process one (mode, data) chunk from the graph stream.
     
-    log_node_state(_state_logger, "START", "MAIN_GRAPH", initial_state, "INITIAL", additional_info=f"Starting research for: {message}")
+    Args:
+        mode: Stream mode of the chunk ("custom" or "updates")
+        data: Chunk payload
+        question_execution_trace: Trace events collected for the current question
+        
+    Returns:
+        List of (mode, data) tuples to yield to the caller
+    """
+    if mode == "custom":
+        # Process custom events - they're already in envelope format from nodes
+        events = list(process_custom_events(mode, data))
+        # Extract trace events from envelope payloads in one pass
+        question_execution_trace.extend(
+            event["payload"] for event in events
+            if event.get("type") == "trace" and "payload" in event
+        )
+        # Yield events for frontend streaming
+        return [(mode, event) for event in events]
+    
+    if mode == "updates":
+        # Process state updates - data is already a dict mapping node names to updates
+        for node_name, node_data in data.items():
+            if isinstance(node_data, dict):
+                _collect_update_traces(node_name, node_data, question_execution_trace)
+                
+                # Log state updates if logger is available
+                state_logger = get_state_logger()
+                if state_logger:
+                    log_node_state(state_logger, f"{node_name}_UPDATE", "MAIN_GRAPH", node_data, "STREAM_UPDATE", node_data.get("iterations"), f"State update from streaming after {node_name} node")
+        
+        # Yield updates in original format for SSE generator
+        return [(mode, data)]
+    return []
+
+
+def run_research_agent(
+    message: str,
+    thread_id: Optional[str] = None,
+    graph: Optional[Any] = None
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Run the multi-agent research system with streaming support.
+    
+    Args:
+        message: The user's research question/request
+        thread_id: Optional thread ID for checkpointing
+        graph: Optional graph instance (creates default if None)
+        
+    Yields:
+        Tuples of (mode, data) from LangGraph stream
+    """
+    graph, thread_id, config, may_have_state = _prepare_run(thread_id, graph)
+    state_logger, log_path = _start_state_logger(message)
+    token = set_state_logger(state_logger)
+    
+    existing_state = None
+    if may_have_state:
+        try:
+            existing_state = _existing_values(graph.get_state(config))
+        except Exception:
+            pass
+    
+    initial_state = _build_initial_state(message, existing_state)
+    log_node_state(state_logger, "START", "MAIN_GRAPH", initial_state, "INITIAL", additional_info=f"Starting research for: {message}")
     
     if thread_id:
         yield ("custom", {"event": "thread_id", "thread_id": thread_id})
+        initial_state["_thread_id"] = thread_id
     
     question_execution_trace: list = []
     
+    try:
+        for mode, data in graph.stream(
+            initial_state,
+            config=config if config else None,
+            stream_mode=["custom", "updates"]
+        ):
+            for item in _process_stream_chunk(mode, data, question_execution_trace):
+                yield item
+        
+        # Queued behind the nodes' background saves, so the stream can close right away
+        if _checkpointer and thread_id:
+            run_in_background(ensure_trace_completeness, thread_id, question_execution_trace)
+    finally:
+        _close_state_logger(state_logger, log_path, token)
+
+
+async def arun_research_agent(
+    message: str,
+    thread_id: Optional[str] = None,
+    graph: Optional[Any] = None
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Async variant of run_research_agent() driving the graph with astream().
+    
+    LLM-bound nodes await their model calls and blocking database work runs in
+    the default executor, so the event loop stays free while the agent runs.
+    
+    Args:
+        message: The user's research question/request
+        thread_id: Optional thread ID for checkpointing
+        graph: Optional graph instance (creates default if None)
+        
+    Yields:
+        Tuples of (mode, data) from LangGraph stream
+    """
+    graph, thread_id, config, may_have_state = _prepare_run(thread_id, graph)
+    state_logger, log_path = await run_in_thread(_start_state_logger, message)
+    token = set_state_logger(state_logger)
+    
+    existing_state = None
+    if may_have_state:
+        try:
+            existing_state = _existing_values(await graph.aget_state(config))
+        except Exception:
+            pass
+    
+    initial_state = _build_initial_state(message, existing_state)
+    log_node_state(state_logger, "START", "MAIN_GRAPH", initial_state, "INITIAL", additional_info=f"Starting research for: {message}")
+    
     if thread_id:
+        yield ("custom", {"event": "thread_id", "thread_id": thread_id})
         initial_state["_thread_id"] = thread_id
     
+    question_execution_trace: list = []
+    
     try:
-        for mode, data in graph.stream(
+        async for mode, data in graph.astream(
             initial_state,
             config=config if config else None,
             stream_mode=["custom", "updates"]
         ):
-            if mode == "custom":
-                # Process custom events - they're already in envelope format from nodes
-                for event in process_custom_events(mode, data):
-                    # Extract trace event from envelope payload if it's a trace event
-                    if event.get("type") == "trace" and "payload" in event:
-                        trace_event = event["payload"]
-                        question_execution_trace.append(trace_event)
-                    
-                    # Yield event for frontend streaming
-                    yield mode, event
-            
-            elif mode == "updates":
-                # Process state updates - data is already a dict mapping node names to updates
-                # We need to yield it in the same format for SSE generator
-                for node_name, node_data in data.items():
-                    if isinstance(node_data, dict):
-                        # Collect execution trace from final_report updates
-                        if node_name == "final_report" and "execution_trace" in node_data:
-                            final_report_trace_events = node_data.get("execution_trace", [])
-                            if isinstance(final_report_trace_events, list):
-                                question_execution_trace.extend(final_report_trace_events)
-                        
-                        # Collect state_update events for approved_markets and polymarket_blurb
-                        # These need to be persisted in execution trace for frontend restoration
-                        if node_name == "call_market_research" and "approved_markets" in node_data:
-                            approved_markets = node_data.get("approved_markets")
-                            if isinstance(approved_markets, list) and len(approved_markets) > 0:
-                                state_update_event = create_trace_event(
-                                    "state_update",
-                                    "call_market_research",
-                                    {"approved_markets": approved_markets}
-                                )
-                                question_execution_trace.append(state_update_event)
-                        
-                        if node_name == "rewrite_polymarket_response" and "polymarket_blurb" in node_data:
-                            polymarket_blurb = node_data.get("polymarket_blurb")
-                            if isinstance(polymarket_blurb, str) and len(polymarket_blurb) > 0:
-                                state_update_event = create_trace_event(
-                                    "state_update",
-                                    "rewrite_polymarket_response",
-                                    {"polymarket_blurb": polymarket_blurb}
-                                )
-                                question_execution_trace.append(state_update_event)
-                        
-                        # Log state updates if logger is available
-                        if _state_logger:
-                            log_node_state(_state_logger, f"{node_name}_UPDATE", "MAIN_GRAPH", dict(node_data), "STREAM_UPDATE", node_data.get("iterations"), f"State update from streaming after {node_name} node")
-                
-                # Yield updates in original format for SSE generator
-                yield mode, data
+            for item in _process_stream_chunk(mode, data, question_execution_trace):
+                yield item
         
         if _checkpointer and thread_id:
-            ensure_trace_completeness(thread_id, question_execution_trace)
+            run_in_background(ensure_trace_completeness, thread_id, question_execution_trace)
     finally:
-        if _state_logger:
-            _state_logger.close()
-            logger.info("state_log_saved", log_path=str(log_path.absolute()))
-            _state_logger = None
-            set_state_logger(None)
-            set_researcher_logger(None)
-
+        _close_state_logger(state_logger, log_path, token)
@@ -4,19 +4,22 @@ Main agent graph construction and compilation.
 This module contains the logic for building and compiling the main supervisor
 agent graph using LangGraph.
 """
+import os
 from typing import Any, Optional
 
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import END, START, StateGraph
+from langgraph.types import Send
 
 from polyplexity_agent.config import Settings
 from polyplexity_agent.config.secrets import create_checkpointer
 from polyplexity_agent.graphs.nodes.supervisor.call_market_research import call_market_research_node
-from polyplexity_agent.graphs.nodes.supervisor.call_researcher import call_researcher_node
+from polyplexity_agent.graphs.nodes.supervisor.call_researcher import acall_researcher_node, call_researcher_node
 from polyplexity_agent.graphs.nodes.supervisor.clarification import clarification_node
-from polyplexity_agent.graphs.nodes.supervisor.direct_answer import direct_answer_node
-from polyplexity_agent.graphs.nodes.supervisor.final_report import final_report_node
+from polyplexity_agent.graphs.nodes.supervisor.direct_answer import adirect_answer_node, direct_answer_node
+from polyplexity_agent.graphs.nodes.supervisor.final_report import afinal_report_node, final_report_node
 from polyplexity_agent.graphs.nodes.supervisor.rewrite_polymarket_response import rewrite_polymarket_response_node
-from polyplexity_agent.graphs.nodes.supervisor.supervisor import supervisor_node
+from polyplexity_agent.graphs.nodes.supervisor.supervisor import asupervisor_node, supervisor_node
 from polyplexity_agent.graphs.nodes.supervisor.summarize_conversation import summarize_conversation_node
 from polyplexity_agent.graphs.state import SupervisorState
 from polyplexity_agent.logging import get_logger
@@ -24,10 +27,24 @@ from polyplexity_agent.testing import draw_graph
 from polyplexity_agent.utils.state_manager import ensure_checkpointer_setup
 
 logger = get_logger(__name__)
+_settings = Settings()
+
+# Rendering the graph PNG costs a Mermaid render and a file write on every
+# compile, so it only happens when POLYPLEXITY_DRAW_GRAPH=1
+DRAW_GRAPH = os.getenv("POLYPLEXITY_DRAW_GRAPH") == "1"
 
 
 def route_supervisor(state: SupervisorState):
-    """Routes based on next_topic and answer_format constraints."""
+    """
+    Routes based on next_topic and answer_format constraints.
+    
+    Concise answers get one research round. Report runs keep researching
+    until the supervisor finishes, which it does early once it is confident
+    enough, or until max_supervisor_iterations rounds have run.
+    
+    When the supervisor picked several independent research topics, one
+    call_researcher task is sent per topic so they run in the same step.
+    """
     next_topic = state.get("next_topic", "")
     answer_format = state.get("answer_format", "concise")
     current_loop = state.get("iterations", 0)
@@ -40,9 +57,20 @@ def route_supervisor(state: SupervisorState):
     if answer_format == "concise":
         if current_loop >= 1:
             return "final_report"
-    else:
-        if current_loop >= 5:
-            return "final_report"
+    elif current_loop >= _settings.max_supervisor_iterations:
+        return "final_report"
+    research_topics = state.get("research_topics") or []
+    if len(research_topics) > 1:
+        # Each task only gets the fields call_researcher reads, not a copy of the whole state
+        return [
+            Send("call_researcher", {
+                "next_topic": topic,
+                "answer_format": answer_format,
+                "iterations": current_loop,
+                "_current_date": state.get("_current_date", ""),
+            })
+            for topic in research_topics
+        ]
     return "call_researcher"
 
 
@@ -68,12 +96,13 @@ def create_agent_graph(
     
     # Build Main Graph
     builder = StateGraph(SupervisorState)
-    builder.add_node("supervisor", supervisor_node)
-    builder.add_node("call_researcher", call_researcher_node)
-    builder.add_node("final_report", final_report_node)
+    # LLM-bound nodes carry async variants so astream() awaits the model calls
+    builder.add_node("supervisor", RunnableLambda(supervisor_node, afunc=asupervisor_node))
+    builder.add_node("call_researcher", RunnableLambda(call_researcher_node, afunc=acall_researcher_node))
+    builder.add_node("final_report", RunnableLambda(final_report_node, afunc=afinal_report_node))
     builder.add_node("call_market_research", call_market_research_node)
     builder.add_node("rewrite_polymarket_response", rewrite_polymarket_response_node)
-    builder.add_node("direct_answer", direct_answer_node)
+    builder.add_node("direct_answer", RunnableLambda(direct_answer_node, afunc=adirect_answer_node))
     builder.add_node("clarification", clarification_node)
     builder.add_node("summarize_conversation", summarize_conversation_node)
     
@@ -96,18 +125,14 @@ def create_agent_graph(
     builder.add_edge("clarification", "summarize_conversation")
     builder.add_edge("summarize_conversation", END)
     
-    # Compile graph with checkpointer if available
+    # Compile graph with checkpointer if available; setup returns None when it fails
     if checkpointer:
         checkpointer = ensure_checkpointer_setup(checkpointer)
-        if checkpointer:
-            compiled_graph = builder.compile(checkpointer=checkpointer)
-        else:
-            compiled_graph = builder.compile()
-    else:
-        compiled_graph = builder.compile()
+    compiled_graph = builder.compile(checkpointer=checkpointer or None)
     
     # Save graph visualization
-    draw_graph(compiled_graph)
+    if DRAW_GRAPH:
+        draw_graph(compiled_graph)
     
     return compiled_graph
 
@@ -10,16 +10,13 @@ from typing import Any, Dict, List
 
 from langchain_core.messages import HumanMessage
 
-from polyplexity_agent.config import Settings
 from polyplexity_agent.graphs.state import MarketResearchState
 from polyplexity_agent.logging import get_logger
 from polyplexity_agent.models import ApprovedMarkets
 from polyplexity_agent.prompts.market_prompts import MARKET_EVALUATION_PROMPT
 from polyplexity_agent.streaming import stream_custom_event
-from polyplexity_agent.utils.helpers import create_llm_model
+from polyplexity_agent.utils.helpers import bind_structured_output, create_llm_model
 
-# Application settings
-settings = Settings()
 logger = get_logger(__name__)
 
 
@@ -40,11 +37,7 @@ def _evaluate_markets_llm(
     Returns:
         An ApprovedMarkets object containing approved slugs and reasoning.
     """
-    model = (
-        create_llm_model()
-        .with_structured_output(ApprovedMarkets)
-        .with_retry(stop_after_attempt=settings.max_structured_output_retries)
-    )
+    model = bind_structured_output(create_llm_model(), ApprovedMarkets)
     markets_str = "\n".join(
         [
             f"- Slug: {m['slug']}, Name: {m['name']}, clobTokenIds: {m.get('clobTokenIds', [])}"
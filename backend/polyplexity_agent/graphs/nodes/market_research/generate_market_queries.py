@@ -11,17 +11,14 @@ from typing import Dict, List
 
 from langchain_core.messages import HumanMessage
 
-from polyplexity_agent.config import Settings
 from polyplexity_agent.graphs.state import MarketResearchState
 from polyplexity_agent.logging import get_logger
 from polyplexity_agent.models import SelectedTags
 from polyplexity_agent.prompts.market_prompts import TAG_SELECTION_PROMPT
 from polyplexity_agent.streaming import stream_custom_event
 from polyplexity_agent.tools.polymarket import _normalize_tag_name, fetch_tags_batch
-from polyplexity_agent.utils.helpers import create_llm_model
+from polyplexity_agent.utils.helpers import bind_structured_output, create_llm_model
 
-# Application settings
-settings = Settings()
 logger = get_logger(__name__)
 
 TARGET_TAG_COUNT = 10
@@ -97,11 +94,7 @@ def _select_tags_from_batch(
         A SelectedTags object containing selected tag names, reasoning,
         and whether to continue searching.
     """
-    model = (
-        create_llm_model()
-        .with_structured_output(SelectedTags)
-        .with_retry(stop_after_attempt=settings.max_structured_output_retries)
-    )
+    model = bind_structured_output(create_llm_model(), SelectedTags)
     tag_batch_str = _format_tag_batch(tag_batch)
     prompt = TAG_SELECTION_PROMPT.format(
         original_topic=original_topic,
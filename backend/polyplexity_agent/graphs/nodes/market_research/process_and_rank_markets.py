@@ -9,16 +9,13 @@ from typing import Dict, List
 
 from langchain_core.messages import HumanMessage
 
-from polyplexity_agent.config import Settings
 from polyplexity_agent.graphs.state import MarketResearchState
 from polyplexity_agent.logging import get_logger
 from polyplexity_agent.models import RankedMarkets
 from polyplexity_agent.prompts.market_prompts import MARKET_RANKING_PROMPT
 from polyplexity_agent.streaming import stream_custom_event
-from polyplexity_agent.utils.helpers import create_llm_model
+from polyplexity_agent.utils.helpers import bind_structured_output, create_llm_model
 
-# Application settings
-settings = Settings()
 logger = get_logger(__name__)
 
 
@@ -39,11 +36,7 @@ def _rank_markets_llm(
     Returns:
         A RankedMarkets object containing ranked slugs and reasoning.
     """
-    model = (
-        create_llm_model()
-        .with_structured_output(RankedMarkets)
-        .with_retry(stop_after_attempt=settings.max_structured_output_retries)
-    )
+    model = bind_structured_output(create_llm_model(), RankedMarkets)
     markets_str = "\n".join(
         [f"- Slug: {m['slug']}, Name: {m['name']}" for m in market_slugs_and_names]
     )
@@ -2,11 +2,14 @@
 
 This module contains nodes for the researcher subgraph.
 """
-from polyplexity_agent.graphs.nodes.researcher.generate_queries import generate_queries_node
-from polyplexity_agent.graphs.nodes.researcher.perform_search import perform_search_node
-from polyplexity_agent.graphs.nodes.researcher.synthesize_research import synthesize_research_node
+from polyplexity_agent.graphs.nodes.researcher.generate_queries import agenerate_queries_node, generate_queries_node
+from polyplexity_agent.graphs.nodes.researcher.perform_search import aperform_search_node, perform_search_node
+from polyplexity_agent.graphs.nodes.researcher.synthesize_research import asynthesize_research_node, synthesize_research_node
 
 __all__ = [
+    "agenerate_queries_node",
+    "aperform_search_node",
+    "asynthesize_research_node",
     "generate_queries_node",
     "perform_search_node",
     "synthesize_research_node",
@@ -3,54 +3,102 @@ Generate queries node for the researcher subgraph.
 
 Breaks a research topic into distinct search queries using LLM.
 """
-from langchain_core.messages import HumanMessage, SystemMessage
+from collections import ChainMap
+from typing import Dict, List
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 
-from polyplexity_agent.config import Settings
-from polyplexity_agent.streaming.event_serializers import create_trace_event
 from polyplexity_agent.graphs.state import ResearcherState
 from polyplexity_agent.logging import get_logger
-from polyplexity_agent.streaming import stream_custom_event, stream_trace_event
+from polyplexity_agent.streaming import stream_custom_event, stream_node_events
 from polyplexity_agent.models import SearchQueries
 from polyplexity_agent.prompts.researcher import (
     QUERY_GENERATION_SYSTEM_PROMPT,
     QUERY_GENERATION_USER_PROMPT_TEMPLATE,
 )
-from polyplexity_agent.utils.helpers import create_llm_model, format_date, log_node_state
+from polyplexity_agent.utils.helpers import (
+    ainvoke_structured,
+    create_llm_model,
+    get_current_date,
+    invoke_structured,
+    log_node_state,
+)
+from polyplexity_agent.utils.prompt_template import compile_template
+from polyplexity_agent.utils.research_cache import cache_queries, get_cached_queries
+from polyplexity_agent.utils.state_manager import get_state_logger
 
-# Application settings
-settings = Settings()
 logger = get_logger(__name__)
 
+_render_query_prompt = compile_template(QUERY_GENERATION_USER_PROMPT_TEMPLATE)
 
-def _generate_queries_llm(state: ResearcherState) -> SearchQueries:
-    """Generate search queries using LLM."""
-    model = create_llm_model().with_structured_output(SearchQueries).with_retry(stop_after_attempt=settings.max_structured_output_retries)
-    system_prompt = QUERY_GENERATION_SYSTEM_PROMPT
-    user_prompt = QUERY_GENERATION_USER_PROMPT_TEMPLATE.format(
-        current_date=format_date(),
+
+def _build_query_messages(state: ResearcherState) -> List[BaseMessage]:
+    """Build the query generation messages for a topic."""
+    user_prompt = _render_query_prompt(
+        current_date=get_current_date(state),
         topic=state['topic']
     )
-    return model.invoke([SystemMessage(content=system_prompt), HumanMessage(content=user_prompt)])
+    return [SystemMessage(content=QUERY_GENERATION_SYSTEM_PROMPT), HumanMessage(content=user_prompt)]
+
+
+def _generate_queries_llm(state: ResearcherState) -> SearchQueries:
+    """Generate search queries using LLM, reusing queries cached for the topic."""
+    current_date = get_current_date(state)
+    resp = get_cached_queries(state["topic"], current_date)
+    if resp is None:
+        resp = invoke_structured(create_llm_model(), SearchQueries, _build_query_messages(state))
+        cache_queries(state["topic"], current_date, resp)
+    return resp
+
+
+async def _agenerate_queries_llm(state: ResearcherState) -> SearchQueries:
+    """Generate search queries using LLM without blocking the event loop."""
+    current_date = get_current_date(state)
+    resp = get_cached_queries(state["topic"], current_date)
+    if resp is None:
+        resp = await ainvoke_structured(create_llm_model(), SearchQueries, _build_query_messages(state))
+        cache_queries(state["topic"], current_date, resp)
+    return resp
+
+
+def _start_generate_queries(state: ResearcherState) -> None:
+    """Log the incoming state and emit the researcher_thinking event."""
+    state_logger = get_state_logger()
+    log_node_state(state_logger, "generate_queries", "SUBGRAPH", state, "BEFORE", additional_info=f"Topic: {state.get('topic', 'N/A')}")
+    stream_custom_event("researcher_thinking", "generate_queries", {"topic": state['topic']})
+
+
+def _finish_generate_queries(state: ResearcherState, resp: SearchQueries) -> Dict:
+    """Emit the generated queries and build the state update."""
+    state_logger = get_state_logger()
+    trace_events = stream_node_events(
+        "generate_queries",
+        traces=[("node_call", {}), ("custom", {"event": "generated_queries", "queries": resp.queries})],
+        custom_events=[("generated_queries", {"queries": resp.queries})],
+    )
+    
+    log_node_state(state_logger, "generate_queries", "SUBGRAPH", ChainMap({"queries": resp.queries}, state), "AFTER", additional_info=f"Generated {len(resp.queries)} queries")
+    return {"queries": resp.queries, "execution_trace": trace_events}
 
 
 def generate_queries_node(state: ResearcherState):
     """Breaks a research topic into distinct search queries."""
     try:
-        # Access state logger from researcher module temporarily (like Phase 4 pattern)
-        from polyplexity_agent.graphs.subgraphs.researcher import _state_logger
-        log_node_state(_state_logger, "generate_queries", "SUBGRAPH", dict(state), "BEFORE", additional_info=f"Topic: {state.get('topic', 'N/A')}")
-        stream_custom_event("researcher_thinking", "generate_queries", {"topic": state['topic']})
-        
+        _start_generate_queries(state)
         resp = _generate_queries_llm(state)
-        node_call_event = create_trace_event("node_call", "generate_queries", {})
-        queries_event = create_trace_event("custom", "generate_queries", {"event": "generated_queries", "queries": resp.queries})
-        
-        stream_trace_event("node_call", "generate_queries", {})
-        stream_trace_event("custom", "generate_queries", {"event": "generated_queries", "queries": resp.queries})
-        stream_custom_event("generated_queries", "generate_queries", {"queries": resp.queries})
-        
-        log_node_state(_state_logger, "generate_queries", "SUBGRAPH", {**state, "queries": resp.queries}, "AFTER", additional_info=f"Generated {len(resp.queries)} queries")
-        return {"queries": resp.queries, "execution_trace": [node_call_event, queries_event]}
+        return _finish_generate_queries(state, resp)
+    except Exception as e:
+        stream_custom_event("error", "generate_queries", {"error": str(e)})
+        logger.error("generate_queries_node_error", error=str(e), exc_info=True)
+        raise
+
+
+async def agenerate_queries_node(state: ResearcherState):
+    """Async variant of generate_queries_node used when the subgraph runs via astream."""
+    try:
+        _start_generate_queries(state)
+        resp = await _agenerate_queries_llm(state)
+        return _finish_generate_queries(state, resp)
     except Exception as e:
         stream_custom_event("error", "generate_queries", {"error": str(e)})
         logger.error("generate_queries_node_error", error=str(e), exc_info=True)
@@ -3,77 +3,143 @@ Perform search node for the researcher subgraph.
 
 Executes a single Tavily search query and formats results.
 """
-from typing import Any, Dict
+import functools
+from collections import ChainMap
+from typing import Any, Dict, List, Tuple
 
 from langchain_tavily import TavilySearch
 
-from polyplexity_agent.streaming.event_serializers import create_trace_event
+from polyplexity_agent.streaming.event_serializers import TraceEvent
 from polyplexity_agent.logging import get_logger
-from polyplexity_agent.streaming import stream_custom_event, stream_trace_event
-from polyplexity_agent.utils.helpers import format_search_url_markdown, log_node_state
+from polyplexity_agent.streaming import stream_custom_event, stream_node_events
+from polyplexity_agent.utils.helpers import format_search_url_markdown, log_node_state, log_text_summary
+from polyplexity_agent.utils.search_cache import cache_search, get_cached_search
+from polyplexity_agent.utils.state_manager import get_state_logger
 
 logger = get_logger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def _get_search_tool(max_results: int) -> TavilySearch:
+    """Return a shared Tavily client for the given result count."""
+    return TavilySearch(max_results=max_results, topic="general")
+
+
 def _perform_search_tavily(query: str, max_results: int = 2) -> Dict[str, Any]:
     """Execute Tavily search."""
-    tool = TavilySearch(max_results=max_results, topic="general")
-    return tool.invoke({"query": query})
+    return _get_search_tool(max_results).invoke({"query": query})
+
+
+async def _aperform_search_tavily(query: str, max_results: int = 2) -> Dict[str, Any]:
+    """Execute Tavily search without blocking the event loop."""
+    return await _get_search_tool(max_results).ainvoke({"query": query})
 
 
 def _format_search_results(results: Dict[str, Any], query: str) -> str:
     """Format search results as markdown."""
-    content = f"--- Results for '{query}' ---\n"
+    parts = [f"--- Results for '{query}' ---\n"]
     for r in results.get("results", []):
         title = r.get('title', 'Untitled')
         url = r.get('url', '')
         text_content = r.get('content', '')
         if url:
-            content += f"Title: [{title}]({url})\n"
+            parts.append(f"Title: [{title}]({url})\n")
         else:
-            content += f"Title: {title}\n"
-        content += f"Content: {text_content}\n\n"
-    return content
+            parts.append(f"Title: {title}\n")
+        parts.append(f"Content: {text_content}\n\n")
+    return "".join(parts)
+
+
+def _start_search(state: dict) -> Tuple[str, int, List[TraceEvent]]:
+    """Log the incoming state and emit the perform_search start events."""
+    query = state["query"]
+    state_logger = get_state_logger()
+    log_node_state(state_logger, "perform_search", "SUBGRAPH", state, "BEFORE", additional_info=f"Search query: {query}")
+    
+    # This node receives a dict from Send(), which includes query_breadth
+    # Default to 2 if missing for backward compatibility
+    max_results = state.get("query_breadth", 2)
+    
+    trace_events = stream_node_events(
+        "perform_search",
+        traces=[
+            ("node_call", {"query": query, "max_results": max_results}),
+            ("search", {"event": "search_start", "query": query}),
+        ],
+        custom_events=[("search_start", {"query": query})],
+    )
+    return query, max_results, trace_events
+
+
+def _record_cache_hit(query: str) -> List[TraceEvent]:
+    """Emit the cache_hit event for a search served from the cache."""
+    logger.debug("search_cache_hit", query=query)
+    return stream_node_events("perform_search", traces=[("search", {"event": "cache_hit", "query": query})])
+
+
+def _finish_search(state: dict, query: str, results: Dict[str, Any], trace_events: List[TraceEvent]) -> Dict:
+    """Emit the search results and build the state update."""
+    state_logger = get_state_logger()
+    search_results_list = [{"title": r.get('title', 'Untitled'), "url": r.get('url', '')} for r in results.get("results", [])]
+    
+    # Formatted web_search_url events for frontend display go out with the results trace
+    url_events = []
+    for res in results.get("results", []):
+        url = res.get('url', '')
+        if url:
+            logger.debug("emitting_web_search_url", url=url)
+            url_events.append(("web_search_url", {"url": url, "markdown": format_search_url_markdown(url)}))
+    trace_events = trace_events + stream_node_events(
+        "perform_search",
+        traces=[("search", {"results": search_results_list})],
+        custom_events=url_events,
+    )
+    
+    content = _format_search_results(results, query)
+    
+    log_node_state(state_logger, "perform_search", "SUBGRAPH", ChainMap(log_text_summary("search_results", content), state), "AFTER", additional_info=f"Found {len(results.get('results', []))} results")
+    return {"search_results": [content], "execution_trace": trace_events}
+
+
+def _handle_search_error(state: dict, e: Exception) -> None:
+    """Stream and log a search failure."""
+    query = state.get("query")
+    stream_custom_event("error", "perform_search", {"error": str(e), "query": query})
+    logger.error("perform_search_node_error", error=str(e), query=query, exc_info=True)
 
 
 def perform_search_node(state: dict):
     """Executes a single Tavily search query."""
     try:
-        query = state["query"]
-        # Access state logger from researcher module temporarily (like Phase 4 pattern)
-        from polyplexity_agent.graphs.subgraphs.researcher import _state_logger
-        log_node_state(_state_logger, "perform_search", "SUBGRAPH", dict(state), "BEFORE", additional_info=f"Search query: {query}")
-        
-        # This node receives a dict from Send(), which includes query_breadth
-        # Default to 2 if missing for backward compatibility
-        max_results = state.get("query_breadth", 2)
-        
-        node_call_event = create_trace_event("node_call", "perform_search", {"query": query, "max_results": max_results})
-        search_start_event = create_trace_event("search", "perform_search", {"event": "search_start", "query": query})
-        
-        stream_trace_event("node_call", "perform_search", {"query": query, "max_results": max_results})
-        stream_trace_event("search", "perform_search", {"event": "search_start", "query": query})
-        stream_custom_event("search_start", "perform_search", {"query": query})
-        
-        results = _perform_search_tavily(query, max_results=max_results)
-        search_results_list = [{"title": r.get('title', 'Untitled'), "url": r.get('url', '')} for r in results.get("results", [])]
-        search_results_event = create_trace_event("search", "perform_search", {"results": search_results_list})
-        
-        stream_trace_event("search", "perform_search", {"results": search_results_list})
-        
-        # Emit formatted web_search_url events for frontend display
-        for res in results.get("results", []):
-            url = res.get('url', '')
-            if url:
-                markdown = format_search_url_markdown(url)
-                logger.debug("emitting_web_search_url", url=url)
-                stream_custom_event("web_search_url", "perform_search", {"url": url, "markdown": markdown})
-        
-        content = _format_search_results(results, query)
-        
-        log_node_state(_state_logger, "perform_search", "SUBGRAPH", {**state, "search_results": [content]}, "AFTER", additional_info=f"Found {len(results.get('results', []))} results")
-        return {"search_results": [content], "execution_trace": [node_call_event, search_start_event, search_results_event]}
+        query, max_results, trace_events = _start_search(state)
+        results = get_cached_search(query, max_results)
+        if results is None:
+            results = _perform_search_tavily(query, max_results=max_results)
+            cache_search(query, max_results, results)
+        else:
+            trace_events.extend(_record_cache_hit(query))
+        return _finish_search(state, query, results, trace_events)
+    except Exception as e:
+        _handle_search_error(state, e)
+        raise
+
+
+async def aperform_search_node(state: dict):
+    """
+    Async variant of perform_search_node used when the subgraph runs via astream.
+    
+    The queries sent by map_queries then search concurrently on the event loop
+    instead of each holding a worker thread for the network round-trip.
+    """
+    try:
+        query, max_results, trace_events = _start_search(state)
+        results = get_cached_search(query, max_results)
+        if results is None:
+            results = await _aperform_search_tavily(query, max_results=max_results)
+            cache_search(query, max_results, results)
+        else:
+            trace_events.extend(_record_cache_hit(query))
+        return _finish_search(state, query, results, trace_events)
     except Exception as e:
-        stream_custom_event("error", "perform_search", {"error": str(e), "query": query})
-        logger.error("perform_search_node_error", error=str(e), query=query, exc_info=True)
+        _handle_search_error(state, e)
         raise
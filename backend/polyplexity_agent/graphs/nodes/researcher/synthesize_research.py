@@ -3,48 +3,139 @@ Synthesize research node for the researcher subgraph.
 
 Summarizes all search results into a clean research note.
 """
+from collections import ChainMap
+from typing import Any, Dict, List, Optional, Tuple
+
 from langchain_core.messages import HumanMessage
 
-from polyplexity_agent.streaming.event_serializers import create_trace_event
+from polyplexity_agent.config import Settings
 from polyplexity_agent.graphs.state import ResearcherState
 from polyplexity_agent.logging import get_logger
-from polyplexity_agent.streaming import stream_custom_event, stream_trace_event
+from polyplexity_agent.streaming import stream_custom_event, stream_node_events
 from polyplexity_agent.prompts.researcher import RESEARCH_SYNTHESIS_PROMPT_TEMPLATE
-from polyplexity_agent.utils.helpers import create_llm_model, format_date, log_node_state
+from polyplexity_agent.utils.helpers import create_llm_model, get_current_date, log_node_state, log_text_summary
+from polyplexity_agent.utils.prompt_template import compile_template
+from polyplexity_agent.utils.state_manager import get_state_logger
 
 logger = get_logger(__name__)
+settings = Settings()
+
+_render_synthesis_prompt = compile_template(RESEARCH_SYNTHESIS_PROMPT_TEMPLATE)
+
+NO_RESULTS_SUMMARY = "No search results were found for {topic}."
 
 
-def _synthesize_research_llm(state: ResearcherState) -> str:
-    """Synthesize research results using LLM."""
-    raw_data = "\n".join(state["search_results"])
-    prompt = RESEARCH_SYNTHESIS_PROMPT_TEMPLATE.format(
-        current_date=format_date(),
+def _join_search_results(state: ResearcherState) -> str:
+    """Join the accumulated search results."""
+    return "\n".join(state["search_results"])
+
+
+def _build_synthesis_prompt(state: ResearcherState) -> str:
+    """Build the synthesis prompt from the accumulated search results."""
+    return _render_synthesis_prompt(
+        current_date=get_current_date(state),
         topic=state['topic'],
-        raw_data=raw_data
+        raw_data=_join_search_results(state)
     )
-    response = create_llm_model().invoke([HumanMessage(content=prompt)])
-    return response.content
+
+
+def _direct_summary(state: ResearcherState) -> Optional[str]:
+    """
+    Return the research note for results too small to be worth synthesizing.
+    
+    Searches that found nothing only leave their "--- Results for" header, so
+    without any "Title:" entry the note says no results were found. Results
+    shorter than synthesis_min_chars are used as they are.
+    
+    Returns:
+        The research note, or None when the results should go to the LLM
+    """
+    results = state.get("search_results", [])
+    if not any("\nTitle: " in block for block in results):
+        return NO_RESULTS_SUMMARY.format(topic=state["topic"])
+    raw_data = _join_search_results(state)
+    if len(raw_data) < settings.synthesis_min_chars:
+        return raw_data
+    return None
+
+
+def _stream_synthesis_delta(state: ResearcherState, delta: str) -> None:
+    """Forward a piece of the research summary as it is generated."""
+    stream_custom_event("research_synthesis_delta", "synthesize_research", {"topic": state["topic"], "delta": delta})
+
+
+def _forward_synthesis_chunk(state: ResearcherState, chunks: List[str], chunk: Any) -> None:
+    """Collect a streamed summary chunk and forward it as a research_synthesis_delta event."""
+    if chunk.content:
+        chunks.append(chunk.content)
+        _stream_synthesis_delta(state, chunk.content)
+
+
+def _prepare_synthesis(state: ResearcherState) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Emit the synthesize_research trace events and check whether the LLM is needed.
+    
+    A summary from _direct_summary is forwarded as a single delta.
+    
+    Returns:
+        Tuple of (trace events, direct summary or None when the LLM should synthesize)
+    """
+    trace_events = stream_node_events(
+        "synthesize_research",
+        traces=[("node_call", {}), ("custom", {"event": "research_synthesis_done"})],
+    )
+    direct = _direct_summary(state)
+    if direct is not None:
+        _stream_synthesis_delta(state, direct)
+    return trace_events, direct
+
+
+def _finish_synthesis(state: ResearcherState, summary: str, trace_events: List[Dict]) -> Dict:
+    """Emit the synthesis summary and build the state update."""
+    stream_custom_event("research_synthesis_done", "synthesize_research", {"summary": summary[:100] + "..."})
+    return {"research_summary": summary, "execution_trace": trace_events}
 
 
 def synthesize_research_node(state: ResearcherState):
     """Summarizes all search results into a clean research note."""
     try:
-        # Access state logger from researcher module temporarily (like Phase 4 pattern)
-        from polyplexity_agent.graphs.subgraphs.researcher import _state_logger
-        log_node_state(_state_logger, "synthesize_research", "SUBGRAPH", dict(state), "BEFORE", additional_info=f"Search results count: {len(state.get('search_results', []))}")
-        
-        node_call_event = create_trace_event("node_call", "synthesize_research", {})
-        synthesis_event = create_trace_event("custom", "synthesize_research", {"event": "research_synthesis_done"})
-        
-        stream_trace_event("node_call", "synthesize_research", {})
-        stream_trace_event("custom", "synthesize_research", {"event": "research_synthesis_done"})
-        
-        summary = _synthesize_research_llm(state)
-        stream_custom_event("research_synthesis_done", "synthesize_research", {"summary": summary[:100] + "..."})
-        
-        log_node_state(_state_logger, "synthesize_research", "SUBGRAPH", {**state, "research_summary": summary}, "AFTER", additional_info=f"Research summary length: {len(summary)} chars")
-        return {"research_summary": summary, "execution_trace": [node_call_event, synthesis_event]}
+        state_logger = get_state_logger()
+        log_node_state(state_logger, "synthesize_research", "SUBGRAPH", state, "BEFORE", additional_info=f"Search results count: {len(state.get('search_results', []))}")
+        trace_events, summary = _prepare_synthesis(state)
+        if summary is None:
+            chunks: List[str] = []
+            for chunk in create_llm_model().stream([HumanMessage(content=_build_synthesis_prompt(state))]):
+                _forward_synthesis_chunk(state, chunks, chunk)
+            summary = "".join(chunks)
+        result = _finish_synthesis(state, summary, trace_events)
+        log_node_state(state_logger, "synthesize_research", "SUBGRAPH", ChainMap(log_text_summary("research_summary", summary), state), "AFTER", additional_info=f"Research summary length: {len(summary)} chars")
+        return result
+    except Exception as e:
+        stream_custom_event("error", "synthesize_research", {"error": str(e)})
+        logger.error("synthesize_research_node_error", error=str(e), exc_info=True)
+        raise
+
+
+async def asynthesize_research_node(state: ResearcherState):
+    """
+    Async variant of synthesize_research_node used when the subgraph runs via astream.
+    
+    Every non-empty chunk is forwarded as a research_synthesis_delta event,
+    tagged with the topic since parallel topics synthesize at the same time,
+    so the UI shows progress from the first token.
+    """
+    try:
+        state_logger = get_state_logger()
+        log_node_state(state_logger, "synthesize_research", "SUBGRAPH", state, "BEFORE", additional_info=f"Search results count: {len(state.get('search_results', []))}")
+        trace_events, summary = _prepare_synthesis(state)
+        if summary is None:
+            chunks: List[str] = []
+            async for chunk in create_llm_model().astream([HumanMessage(content=_build_synthesis_prompt(state))]):
+                _forward_synthesis_chunk(state, chunks, chunk)
+            summary = "".join(chunks)
+        result = _finish_synthesis(state, summary, trace_events)
+        log_node_state(state_logger, "synthesize_research", "SUBGRAPH", ChainMap(log_text_summary("research_summary", summary), state), "AFTER", additional_info=f"Research summary length: {len(summary)} chars")
+        return result
     except Exception as e:
         stream_custom_event("error", "synthesize_research", {"error": str(e)})
         logger.error("synthesize_research_node_error", error=str(e), exc_info=True)
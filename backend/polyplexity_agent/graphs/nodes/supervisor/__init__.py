@@ -15,12 +15,16 @@ from polyplexity_agent.graphs.nodes.supervisor.summarize_conversation import (
 
 __all__ = [
     "supervisor_node",
+    "asupervisor_node",
     "call_researcher_node",
+    "acall_researcher_node",
     "call_market_research_node",
     "rewrite_polymarket_response_node",
     "direct_answer_node",
+    "adirect_answer_node",
     "clarification_node",
     "final_report_node",
+    "afinal_report_node",
     "summarize_conversation_node",
     "manage_chat_history",
 ]
@@ -31,9 +35,15 @@ def __getattr__(name: str):
     if name == "supervisor_node":
         from polyplexity_agent.graphs.nodes.supervisor.supervisor import supervisor_node
         return supervisor_node
+    elif name == "asupervisor_node":
+        from polyplexity_agent.graphs.nodes.supervisor.supervisor import asupervisor_node
+        return asupervisor_node
     elif name == "call_researcher_node":
         from polyplexity_agent.graphs.nodes.supervisor.call_researcher import call_researcher_node
         return call_researcher_node
+    elif name == "acall_researcher_node":
+        from polyplexity_agent.graphs.nodes.supervisor.call_researcher import acall_researcher_node
+        return acall_researcher_node
     elif name == "call_market_research_node":
         from polyplexity_agent.graphs.nodes.supervisor.call_market_research import call_market_research_node
         return call_market_research_node
@@ -43,11 +53,17 @@ def __getattr__(name: str):
     elif name == "direct_answer_node":
         from polyplexity_agent.graphs.nodes.supervisor.direct_answer import direct_answer_node
         return direct_answer_node
+    elif name == "adirect_answer_node":
+        from polyplexity_agent.graphs.nodes.supervisor.direct_answer import adirect_answer_node
+        return adirect_answer_node
     elif name == "clarification_node":
         from polyplexity_agent.graphs.nodes.supervisor.clarification import clarification_node
         return clarification_node
     elif name == "final_report_node":
         from polyplexity_agent.graphs.nodes.supervisor.final_report import final_report_node
         return final_report_node
+    elif name == "afinal_report_node":
+        from polyplexity_agent.graphs.nodes.supervisor.final_report import afinal_report_node
+        return afinal_report_node
     
     raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
@@ -3,12 +3,17 @@ Call market research node for the main agent graph.
 
 Invokes the market research subgraph with user question and final report.
 """
-from polyplexity_agent.streaming.event_serializers import create_trace_event
+from collections import ChainMap
+
+from langgraph.config import get_stream_writer
+
+from polyplexity_agent.streaming.event_serializers import collect_trace_events, create_trace_event
 from polyplexity_agent.graphs.state import SupervisorState
 from polyplexity_agent.graphs.subgraphs.market_research import market_research_graph
 from polyplexity_agent.logging import get_logger
 from polyplexity_agent.streaming import stream_custom_event, stream_trace_event
 from polyplexity_agent.utils.helpers import log_node_state
+from polyplexity_agent.utils.state_manager import get_state_logger
 
 logger = get_logger(__name__)
 
@@ -24,12 +29,12 @@ def call_market_research_node(state: SupervisorState):
         Dictionary with approved_markets and execution_trace updates.
     """
     try:
-        from polyplexity_agent.utils.state_manager import _state_logger
+        state_logger = get_state_logger()
         log_node_state(
-            _state_logger,
+            state_logger,
             "call_market_research",
             "MAIN_GRAPH",
-            dict(state),
+            state,
             "BEFORE",
             state.get("iterations", 0),
             f"User request: {state.get('user_request', 'N/A')[:50]}",
@@ -54,22 +59,19 @@ def call_market_research_node(state: SupervisorState):
                 "market_research_graph_stream_chunk", mode=mode, data_type=str(type(data))
             )
             if mode == "custom":
-                items = data if isinstance(data, list) else [data]
-                for item in items:
-                    from langgraph.config import get_stream_writer
-
-                    writer = get_stream_writer()
-                    if writer:
-                        writer(item)
+                # Forward subgraph events as-is; stream consumers unwrap batched lists
+                writer = get_stream_writer()
+                if writer:
+                    writer(data)
             elif mode == "values":
                 if "approved_markets" in data:
                     approved_markets = data["approved_markets"]
-        result = {"approved_markets": approved_markets, "execution_trace": [node_call_event]}
+        result = {"approved_markets": approved_markets, "execution_trace": collect_trace_events(node_call_event)}
         log_node_state(
-            _state_logger,
+            state_logger,
             "call_market_research",
             "MAIN_GRAPH",
-            {**state, **result},
+            ChainMap(result, state),
             "AFTER",
             state.get("iterations", 0),
             f"Approved markets count: {len(approved_markets)}",
@@ -3,63 +3,125 @@ Call researcher node for the main agent graph.
 
 Invokes the researcher subgraph with the current research topic.
 """
-from polyplexity_agent.streaming.event_serializers import create_trace_event
+from collections import ChainMap
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from langgraph.config import get_stream_writer
+
+from polyplexity_agent.streaming.event_serializers import TraceEvent
 from polyplexity_agent.graphs.state import SupervisorState
 from polyplexity_agent.graphs.subgraphs.researcher import researcher_graph
 from polyplexity_agent.logging import get_logger
-from polyplexity_agent.streaming import stream_custom_event, stream_trace_event
-from polyplexity_agent.utils.helpers import log_node_state
+from polyplexity_agent.streaming import stream_custom_event, stream_node_events
+from polyplexity_agent.utils.helpers import NOTES_SEPARATOR, get_current_date, log_node_state
+from polyplexity_agent.utils.research_cache import cache_research, get_cached_research
+from polyplexity_agent.utils.state_manager import get_state_logger
 
 logger = get_logger(__name__)
 
 
+def _prepare_research(state: SupervisorState) -> Tuple[Dict, List[TraceEvent], Optional[str]]:
+    """
+    Emit the call_researcher node_call events and check the research cache.
+    
+    Args:
+        state: Supervisor state with next_topic and answer_format
+        
+    Returns:
+        Tuple of (researcher subgraph input, node_call trace events, cached summary or None)
+    """
+    topic = state["next_topic"]
+    breadth = 3 if state.get("answer_format", "concise") == "concise" else 5
+    node_call_events = stream_node_events("call_researcher", traces=[("node_call", {"topic": topic, "breadth": breadth})])
+    research_input = {"topic": topic, "query_breadth": breadth, "_current_date": get_current_date(state)}
+    cached = get_cached_research(topic, breadth, research_input["_current_date"])
+    if cached is not None:
+        logger.debug("research_cache_hit", topic=topic)
+    return research_input, node_call_events, cached
+
+
+def _forward_researcher_events(data: Any, seen_urls: Set[str]) -> None:
+    """Forward custom events from the researcher subgraph, skipping duplicate URLs."""
+    items = data if isinstance(data, list) else [data]
+    writer = get_stream_writer()
+    for item in items:
+        event_type = item.get("event", "unknown")
+        logger.debug("forwarding_custom_event", event_type=event_type)
+        if event_type == "web_search_url":
+            url = item.get("url")
+            if not url or url in seen_urls:
+                logger.debug("skipping_duplicate_url", url=url)
+                continue
+            seen_urls.add(url)
+        # Forward event from subgraph (will be normalized if needed)
+        if writer:
+            writer(item)
+
+
+def _finish_research(research_input: Dict, final_summary: str, node_call_events: List[TraceEvent]) -> Dict:
+    """Cache the summary and build the research note update for a finished topic."""
+    cache_research(research_input["topic"], research_input["query_breadth"], research_input["_current_date"], final_summary)
+    formatted_note = f"## Research on: {research_input['topic']}\n{final_summary}"
+    return {
+        "research_notes": [formatted_note],
+        "notes_context": NOTES_SEPARATOR + formatted_note,
+        "execution_trace": node_call_events
+    }
+
+
+def _handle_research_error(state: SupervisorState, e: Exception) -> None:
+    """Stream and log a researcher failure."""
+    stream_custom_event("error", "call_researcher", {"error": str(e), "topic": state.get("next_topic", "N/A")})
+    logger.error("call_researcher_node_error", error=str(e), topic=state.get("next_topic", "N/A"), exc_info=True)
+
+
+def _handle_researcher_chunk(mode: str, data: Any, seen_urls: Set[str], final_summary: str) -> str:
+    """Handle one researcher subgraph stream chunk and return the latest summary."""
+    logger.debug("researcher_graph_stream_chunk", mode=mode, data_type=str(type(data)))
+    if mode == "custom":
+        _forward_researcher_events(data, seen_urls)
+    elif mode == "values" and "research_summary" in data:
+        return data["research_summary"]
+    return final_summary
+
+
 def call_researcher_node(state: SupervisorState):
     """Invokes the researcher subgraph with the current research topic."""
     try:
-        from polyplexity_agent.utils.state_manager import _state_logger
-        log_node_state(_state_logger, "call_researcher", "MAIN_GRAPH", dict(state), "BEFORE", state.get("iterations", 0), f"Topic: {state.get('next_topic', 'N/A')}")
-        topic = state["next_topic"]
-        answer_format = state.get("answer_format", "concise")
-        breadth = 3 if answer_format == "concise" else 5
-        node_call_event = create_trace_event("node_call", "call_researcher", {"topic": topic, "breadth": breadth})
-        stream_trace_event("node_call", "call_researcher", {"topic": topic, "breadth": breadth})
-        seen_urls = set()
-        final_summary = ""
-        for mode, data in researcher_graph.stream(
-            {"topic": topic, "query_breadth": breadth},
-            stream_mode=["custom", "values"]
-        ):
-            logger.debug("researcher_graph_stream_chunk", mode=mode, data_type=str(type(data)))
-            if mode == "custom":
-                items = data if isinstance(data, list) else [data]
-                for item in items:
-                    event_type = item.get("event", "unknown")
-                    logger.debug("forwarding_custom_event", event_type=event_type)
-                    if event_type == "web_search_url":
-                        url = item.get("url")
-                        if url and url not in seen_urls:
-                            seen_urls.add(url)
-                            # Forward event from subgraph (will be normalized if needed)
-                            from langgraph.config import get_stream_writer
-                            writer = get_stream_writer()
-                            if writer:
-                                writer(item)
-                        else:
-                            logger.debug("skipping_duplicate_url", url=url)
-                    else:
-                        # Forward event from subgraph (will be normalized if needed)
-                        from langgraph.config import get_stream_writer
-                        writer = get_stream_writer()
-                        if writer:
-                            writer(item)
-            elif mode == "values":
-                if "research_summary" in data:
-                    final_summary = data["research_summary"]
-        formatted_note = f"## Research on: {topic}\n{final_summary}"
-        result = {"research_notes": [formatted_note], "execution_trace": [node_call_event]}
-        log_node_state(_state_logger, "call_researcher", "MAIN_GRAPH", {**state, **result}, "AFTER", state.get("iterations", 0), f"Summary length: {len(final_summary)} chars")
+        state_logger = get_state_logger()
+        log_node_state(state_logger, "call_researcher", "MAIN_GRAPH", state, "BEFORE", state.get("iterations", 0), f"Topic: {state['next_topic']}")
+        research_input, node_call_events, final_summary = _prepare_research(state)
+        if final_summary is None:
+            seen_urls: Set[str] = set()
+            final_summary = ""
+            for mode, data in researcher_graph.stream(research_input, stream_mode=["custom", "values"]):
+                final_summary = _handle_researcher_chunk(mode, data, seen_urls, final_summary)
+        result = _finish_research(research_input, final_summary, node_call_events)
+        log_node_state(state_logger, "call_researcher", "MAIN_GRAPH", ChainMap(result, state), "AFTER", state.get("iterations", 0), f"Summary length: {len(final_summary)} chars")
+        return result
+    except Exception as e:
+        _handle_research_error(state, e)
+        raise
+
+
+async def acall_researcher_node(state: SupervisorState):
+    """
+    Async variant of call_researcher_node used when the graph runs via astream.
+    
+    Parallel topics sent by route_supervisor run as concurrent tasks on the event loop.
+    """
+    try:
+        state_logger = get_state_logger()
+        log_node_state(state_logger, "call_researcher", "MAIN_GRAPH", state, "BEFORE", state.get("iterations", 0), f"Topic: {state['next_topic']}")
+        research_input, node_call_events, final_summary = _prepare_research(state)
+        if final_summary is None:
+            seen_urls: Set[str] = set()
+            final_summary = ""
+            async for mode, data in researcher_graph.astream(research_input, stream_mode=["custom", "values"]):
+                final_summary = _handle_researcher_chunk(mode, data, seen_urls, final_summary)
+        result = _finish_research(research_input, final_summary, node_call_events)
+        log_node_state(state_logger, "call_researcher", "MAIN_GRAPH", ChainMap(result, state), "AFTER", state.get("iterations", 0), f"Summary length: {len(final_summary)} chars")
         return result
     except Exception as e:
-        stream_custom_event("error", "call_researcher", {"error": str(e), "topic": state.get("next_topic", "N/A")})
-        logger.error("call_researcher_node_error", error=str(e), topic=state.get("next_topic", "N/A"), exc_info=True)
+        _handle_research_error(state, e)
         raise
@@ -3,54 +3,100 @@ Direct answer node for the main agent graph.
 
 Answers simple questions directly without research.
 """
-from typing import Dict
+from collections import ChainMap
+from typing import Dict, List
 
-from langchain_core.messages import HumanMessage
-
-from polyplexity_agent.streaming.event_serializers import create_trace_event
+from polyplexity_agent.streaming.event_serializers import collect_trace_events
 from polyplexity_agent.graphs.state import SupervisorState
 from polyplexity_agent.logging import get_logger
 from polyplexity_agent.prompts.response_generator import DIRECT_ANSWER_PROMPT_TEMPLATE
-from polyplexity_agent.streaming import stream_custom_event, stream_trace_event
-from polyplexity_agent.utils.helpers import create_llm_model, log_node_state, save_messages_and_trace
+from polyplexity_agent.streaming import stream_custom_event, stream_node_events
+from polyplexity_agent.utils.helpers import (
+    create_llm_model,
+    log_node_state,
+    run_in_background,
+    run_in_thread,
+    save_messages_and_trace,
+)
+from polyplexity_agent.utils.response_cache import ainvoke_cached, invoke_cached
+from polyplexity_agent.utils.state_manager import get_state_logger
 
 logger = get_logger(__name__)
 
 
-def _handle_direct_answer(state: SupervisorState) -> Dict:
-    """Handle direct answer generation and event emission."""
-    node_call_event = create_trace_event("node_call", "direct_answer", {})
-    stream_trace_event("node_call", "direct_answer", {})
+def _build_direct_answer_prompt(state: SupervisorState) -> str:
+    """Build the direct answer prompt."""
     conversation_summary = state.get("conversation_summary", "No summary available.")
-    prompt = DIRECT_ANSWER_PROMPT_TEMPLATE.format(
+    return DIRECT_ANSWER_PROMPT_TEMPLATE.format(
         user_request=state["user_request"],
         conversation_summary=conversation_summary
     )
-    final_answer = create_llm_model().invoke([HumanMessage(content=prompt)]).content
-    complete_event = create_trace_event("custom", "direct_answer", {"event": "final_report_complete", "report": final_answer})
-    stream_trace_event("custom", "direct_answer", {"event": "final_report_complete", "report": final_answer})
-    stream_custom_event("final_report_complete", "direct_answer", {"report": final_answer})
-    full_trace = state.get("_question_execution_trace", []) + [node_call_event, complete_event]
+
+
+def _start_direct_answer() -> List[Dict]:
+    """Emit the direct_answer node_call event."""
+    return stream_node_events("direct_answer", traces=[("node_call", {})])
+
+
+def _finish_direct_answer(state: SupervisorState, final_answer: str, node_call_events: List[Dict]) -> Dict:
+    """Emit completion events, persist the exchange and build the state update."""
+    complete_events = stream_node_events(
+        "direct_answer",
+        traces=[("custom", {"event": "final_report_complete", "report": final_answer})],
+        custom_events=[("final_report_complete", {"report": final_answer})]
+    )
+    trace_events = collect_trace_events(*node_call_events, *complete_events)
+    full_trace = state.get("_question_execution_trace", []) + trace_events
     if state.get("_thread_id"):
-        save_messages_and_trace(state["_thread_id"], state["user_request"], final_answer, full_trace)
+        run_in_background(save_messages_and_trace, state["_thread_id"], state["user_request"], final_answer, full_trace)
     user_msg = {"role": "user", "content": state["user_request"], "execution_trace": None}
     asst_msg = {"role": "assistant", "content": final_answer, "execution_trace": full_trace}
     return {
         "final_report": final_answer,
         "current_report_version": state.get("current_report_version", 0) + 1,
-        "execution_trace": [node_call_event, complete_event],
+        "execution_trace": trace_events,
         "conversation_history": [user_msg, asst_msg],
         "next_topic": "FINISH"
     }
 
 
+def _handle_direct_answer(state: SupervisorState) -> Dict:
+    """Handle direct answer generation and event emission."""
+    node_call_events = _start_direct_answer()
+    prompt = _build_direct_answer_prompt(state)
+    final_answer = invoke_cached(create_llm_model(), prompt)
+    return _finish_direct_answer(state, final_answer, node_call_events)
+
+
+async def _ahandle_direct_answer(state: SupervisorState) -> Dict:
+    """Handle direct answer generation without blocking the event loop."""
+    node_call_events = _start_direct_answer()
+    prompt = _build_direct_answer_prompt(state)
+    final_answer = await ainvoke_cached(create_llm_model(), prompt)
+    return await run_in_thread(_finish_direct_answer, state, final_answer, node_call_events)
+
+
 def direct_answer_node(state: SupervisorState):
     """Answers simple questions directly without research."""
     try:
-        from polyplexity_agent.utils.state_manager import _state_logger
-        log_node_state(_state_logger, "direct_answer", "MAIN_GRAPH", dict(state), "BEFORE")
+        state_logger = get_state_logger()
+        log_node_state(state_logger, "direct_answer", "MAIN_GRAPH", state, "BEFORE")
         result = _handle_direct_answer(state)
-        log_node_state(_state_logger, "direct_answer", "MAIN_GRAPH", {**state, **result}, "AFTER")
+        log_node_state(state_logger, "direct_answer", "MAIN_GRAPH", ChainMap(result, state), "AFTER")
+        return result
+    except Exception as e:
+        stream_custom_event("error", "direct_answer", {"error": str(e)})
+        logger.error("direct_answer_node_error", error=str(e), exc_info=True)
+        raise
+
+
+async def adirect_answer_node(state: SupervisorState):
+    """Async variant of direct_answer_node used when the graph runs via astream."""
+    try:
+        state_logger = get_state_logger()
+        log_node_state(state_logger, "direct_answer", "MAIN_GRAPH", state, "BEFORE")
+        result = await _ahandle_direct_answer(state)
+        log_node_state(state_logger, "direct_answer", "MAIN_GRAPH", ChainMap(result, state), "AFTER")
         return result
     except Exception as e:
         stream_custom_event("error", "direct_answer", {"error": str(e)})
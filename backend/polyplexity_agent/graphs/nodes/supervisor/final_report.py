@@ -3,80 +3,169 @@ Final report node for the main agent graph.
 
 Writes the final answer/report based on accumulated research notes.
 """
+from collections import ChainMap
+from typing import Any, Dict, List, Optional, Tuple
+
 from langchain_core.messages import HumanMessage
 
 from polyplexity_agent.config import Settings
-from polyplexity_agent.streaming.event_serializers import create_trace_event
+from polyplexity_agent.streaming.event_serializers import collect_trace_events
 from polyplexity_agent.graphs.state import SupervisorState
 from polyplexity_agent.logging import get_logger
-from polyplexity_agent.streaming import stream_custom_event, stream_trace_event
+from polyplexity_agent.streaming import stream_custom_event, stream_node_events
 from polyplexity_agent.prompts.response_generator import (
     FINAL_RESPONSE_PROMPT_TEMPLATE,
     FINAL_RESPONSE_REFINEMENT_PROMPT_TEMPLATE,
     FORMAT_INSTRUCTIONS_CONCISE,
     FORMAT_INSTRUCTIONS_REPORT,
 )
-from polyplexity_agent.utils.helpers import create_llm_model, format_date, log_node_state, save_messages_and_trace
+from polyplexity_agent.utils.helpers import (
+    compact_notes,
+    create_llm_model,
+    get_current_date,
+    get_notes_context,
+    log_node_state,
+    run_in_background,
+    run_in_thread,
+    save_messages_and_trace,
+)
+from polyplexity_agent.utils.response_cache import cache_response, get_cached_response
+from polyplexity_agent.utils.state_manager import get_state_logger
 
 settings = Settings()
 logger = get_logger(__name__)
 
 
-def _generate_final_report(state: SupervisorState) -> str:
-    """Generate final report using LLM."""
-    notes = "\n\n".join(state["research_notes"])
+def _final_report_notes(state: SupervisorState) -> str:
+    """Get the notes context for the report prompt, condensing older notes past the size limit."""
+    notes = get_notes_context(state)
+    max_chars = settings.final_report_notes_max_chars
+    if max_chars <= 0 or len(notes) <= max_chars:
+        return notes
+    return compact_notes(state.get("research_notes", []), max_chars, settings.supervisor_note_digest_chars)
+
+
+def _build_final_report_prompt(state: SupervisorState) -> str:
+    """Build the final report prompt from research notes and any existing report."""
+    notes = _final_report_notes(state)
     existing_report = state.get("final_report", "")
     current_version = state.get("current_report_version", 0)
     is_refinement = bool(existing_report)
     answer_format = state.get("answer_format", "concise")
     formatting_instructions = FORMAT_INSTRUCTIONS_REPORT if answer_format == "report" else FORMAT_INSTRUCTIONS_CONCISE
     if is_refinement:
-        prompt = FINAL_RESPONSE_REFINEMENT_PROMPT_TEMPLATE.format(
-            current_date=format_date(),
+        return FINAL_RESPONSE_REFINEMENT_PROMPT_TEMPLATE.format(
+            current_date=get_current_date(state),
             version=current_version,
             user_request=state["user_request"],
             existing_report=existing_report,
             notes=notes,
             formatting_instructions=formatting_instructions
         )
-    else:
-        prompt = FINAL_RESPONSE_PROMPT_TEMPLATE.format(
-            current_date=format_date(),
-            user_request=state["user_request"],
-            notes=notes,
-            formatting_instructions=formatting_instructions
-        )
-    response = create_llm_model().invoke([HumanMessage(content=prompt)])
-    return response.content
+    return FINAL_RESPONSE_PROMPT_TEMPLATE.format(
+        current_date=get_current_date(state),
+        user_request=state["user_request"],
+        notes=notes,
+        formatting_instructions=formatting_instructions
+    )
+
+
+def _prepare_final_report(state: SupervisorState) -> Tuple[List[Dict], Any, str, Optional[str]]:
+    """
+    Emit the node_call events, build the prompt and check the response cache.
+    
+    A cached report is forwarded as a single final_report_delta event.
+    
+    Args:
+        state: Supervisor state with research notes and any existing report
+        
+    Returns:
+        Tuple of (node_call trace events, model, prompt, cached report or None)
+    """
+    node_call_events = stream_node_events(
+        "final_report",
+        traces=[("node_call", {})],
+        custom_events=[("writing_report", {})]
+    )
+    prompt = _build_final_report_prompt(state)
+    model = create_llm_model()
+    cached = get_cached_response(model, prompt)
+    if cached is not None:
+        stream_custom_event("final_report_delta", "final_report", {"delta": cached})
+    return node_call_events, model, prompt, cached
+
+
+def _forward_report_chunk(chunks: List[str], chunk: Any) -> None:
+    """Collect a streamed report chunk and forward it as a final_report_delta event."""
+    if chunk.content:
+        chunks.append(chunk.content)
+        stream_custom_event("final_report_delta", "final_report", {"delta": chunk.content})
+
+
+def _finish_final_report(state: SupervisorState, model: Any, prompt: str, final_report: str, node_call_events: List[Dict]) -> Dict:
+    """Cache the report, emit completion events, persist the exchange and build the state update."""
+    cache_response(model, prompt, final_report)
+    complete_events = stream_node_events(
+        "final_report",
+        traces=[("custom", {"event": "final_report_complete", "report": final_report})],
+        custom_events=[("final_report_complete", {"report": final_report})]
+    )
+    trace_events = collect_trace_events(*node_call_events, *complete_events)
+    current_question_trace = state.get("_question_execution_trace", [])
+    full_execution_trace = current_question_trace + trace_events
+    thread_id = state.get("_thread_id")
+    if thread_id:
+        run_in_background(save_messages_and_trace, thread_id, state["user_request"], final_report, full_execution_trace)
+    current_version = state.get("current_report_version", 0)
+    user_message = {"role": "user", "content": state["user_request"], "execution_trace": None}
+    assistant_message = {"role": "assistant", "content": final_report, "execution_trace": full_execution_trace if full_execution_trace else None}
+    return {
+        "final_report": final_report,
+        "current_report_version": current_version + 1,
+        "execution_trace": trace_events,
+        "conversation_history": [user_message, assistant_message]
+    }
 
 
 def final_report_node(state: SupervisorState):
     """Writes the final answer/report based on accumulated research notes."""
     try:
-        from polyplexity_agent.utils.state_manager import _state_logger
-        log_node_state(_state_logger, "final_report", "MAIN_GRAPH", dict(state), "BEFORE", state.get("iterations", 0), f"Research notes count: {len(state.get('research_notes', []))}")
-        node_call_event = create_trace_event("node_call", "final_report", {})
-        stream_trace_event("node_call", "final_report", {})
-        stream_custom_event("writing_report", "final_report", {})
-        final_report = _generate_final_report(state)
-        complete_event = create_trace_event("custom", "final_report", {"event": "final_report_complete", "report": final_report})
-        stream_trace_event("custom", "final_report", {"event": "final_report_complete", "report": final_report})
-        stream_custom_event("final_report_complete", "final_report", {"report": final_report})
-        current_question_trace = state.get("_question_execution_trace", [])
-        full_execution_trace = current_question_trace + [node_call_event, complete_event]
-        thread_id = state.get("_thread_id")
-        if thread_id:
-            save_messages_and_trace(thread_id, state["user_request"], final_report, full_execution_trace)
-        current_version = state.get("current_report_version", 0)
-        user_message = {"role": "user", "content": state["user_request"], "execution_trace": None}
-        assistant_message = {"role": "assistant", "content": final_report, "execution_trace": full_execution_trace if full_execution_trace else None}
-        result = {
-            "final_report": final_report,
-            "current_report_version": current_version + 1,
-            "execution_trace": [node_call_event, complete_event],
-            "conversation_history": [user_message, assistant_message]
-        }
-        log_node_state(_state_logger, "final_report", "MAIN_GRAPH", {**state, **result}, "AFTER", state.get("iterations", 0), f"Final report length: {len(final_report)} chars")
+        state_logger = get_state_logger()
+        log_node_state(state_logger, "final_report", "MAIN_GRAPH", state, "BEFORE", state.get("iterations", 0), f"Research notes count: {len(state.get('research_notes', []))}")
+        node_call_events, model, prompt, final_report = _prepare_final_report(state)
+        if final_report is None:
+            chunks: List[str] = []
+            for chunk in model.stream([HumanMessage(content=prompt)]):
+                _forward_report_chunk(chunks, chunk)
+            final_report = "".join(chunks)
+        result = _finish_final_report(state, model, prompt, final_report, node_call_events)
+        log_node_state(state_logger, "final_report", "MAIN_GRAPH", ChainMap(result, state), "AFTER", state.get("iterations", 0), f"Final report length: {len(final_report)} chars")
+        return result
+    except Exception as e:
+        stream_custom_event("error", "final_report", {"error": str(e)})
+        logger.error("final_report_node_error", error=str(e), exc_info=True)
+        raise
+
+
+async def afinal_report_node(state: SupervisorState):
+    """
+    Async variant of final_report_node used when the graph runs via astream.
+    
+    Every non-empty chunk is forwarded as a final_report_delta event so the UI
+    can render the report from the first token instead of waiting for the
+    whole response.
+    """
+    try:
+        state_logger = get_state_logger()
+        log_node_state(state_logger, "final_report", "MAIN_GRAPH", state, "BEFORE", state.get("iterations", 0), f"Research notes count: {len(state.get('research_notes', []))}")
+        node_call_events, model, prompt, final_report = _prepare_final_report(state)
+        if final_report is None:
+            chunks: List[str] = []
+            async for chunk in model.astream([HumanMessage(content=prompt)]):
+                _forward_report_chunk(chunks, chunk)
+            final_report = "".join(chunks)
+        result = await run_in_thread(_finish_final_report, state, model, prompt, final_report, node_call_events)
+        log_node_state(state_logger, "final_report", "MAIN_GRAPH", ChainMap(result, state), "AFTER", state.get("iterations", 0), f"Final report length: {len(final_report)} chars")
         return result
     except Exception as e:
         stream_custom_event("error", "final_report", {"error": str(e)})
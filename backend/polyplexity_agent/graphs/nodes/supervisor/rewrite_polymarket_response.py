@@ -3,14 +3,17 @@ Rewrite polymarket response node for the main agent graph.
 
 Generates a convincing salesman-like blurb connecting user's question to approved markets.
 """
+from collections import ChainMap
+
 from langchain_core.messages import HumanMessage
 
-from polyplexity_agent.streaming.event_serializers import create_trace_event
+from polyplexity_agent.streaming.event_serializers import collect_trace_events, create_trace_event
 from polyplexity_agent.graphs.state import SupervisorState
 from polyplexity_agent.logging import get_logger
 from polyplexity_agent.prompts.response_generator import POLYMARKET_BLURB_PROMPT_TEMPLATE
 from polyplexity_agent.streaming import stream_custom_event, stream_trace_event
 from polyplexity_agent.utils.helpers import create_llm_model, log_node_state
+from polyplexity_agent.utils.state_manager import get_state_logger
 
 logger = get_logger(__name__)
 
@@ -69,12 +72,12 @@ def rewrite_polymarket_response_node(state: SupervisorState):
         Dictionary with polymarket_blurb and execution_trace updates.
     """
     try:
-        from polyplexity_agent.utils.state_manager import _state_logger
+        state_logger = get_state_logger()
         log_node_state(
-            _state_logger,
+            state_logger,
             "rewrite_polymarket_response",
             "MAIN_GRAPH",
-            dict(state),
+            state,
             "BEFORE",
             state.get("iterations", 0),
             f"Approved markets count: {len(state.get('approved_markets', []))}",
@@ -99,12 +102,12 @@ def rewrite_polymarket_response_node(state: SupervisorState):
             "rewrite_polymarket_response",
             {"event": "polymarket_blurb_complete"},
         )
-        result = {"polymarket_blurb": blurb, "execution_trace": [trace_event]}
+        result = {"polymarket_blurb": blurb, "execution_trace": collect_trace_events(trace_event)}
         log_node_state(
-            _state_logger,
+            state_logger,
             "rewrite_polymarket_response",
             "MAIN_GRAPH",
-            {**state, **result},
+            ChainMap(result, state),
             "AFTER",
             state.get("iterations", 0),
             f"Blurb length: {len(blurb)} chars",
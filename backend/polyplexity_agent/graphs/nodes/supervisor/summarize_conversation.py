@@ -13,6 +13,9 @@ from polyplexity_agent.utils.helpers import create_llm_model
 
 logger = get_logger(__name__)
 
+# Hard safety limit on raw conversation_history between summarizations
+MAX_CONVERSATION_HISTORY = 50
+
 
 def manage_chat_history(current: List[Dict], new: List[Dict]) -> List[Dict]:
     """
@@ -20,7 +23,10 @@ def manage_chat_history(current: List[Dict], new: List[Dict]) -> List[Dict]:
     
     1. Checks for reset signal (type="reset") to replace history.
     2. Appends new messages.
-    3. Enforces a hard safety limit (e.g., keep last 50).
+    3. Enforces a hard safety limit (keep last MAX_CONVERSATION_HISTORY).
+    
+    Only the tail of the current history that survives the limit is copied,
+    so an update never builds the full concatenated list just to trim it.
     
     Args:
         current: Current conversation history list
@@ -32,20 +38,17 @@ def manage_chat_history(current: List[Dict], new: List[Dict]) -> List[Dict]:
     if new and isinstance(new, list) and len(new) > 0:
         if new[0].get("type") == "reset":
             return new[1:]
-    full_list = current + new
-    if len(full_list) > 50:
-        return full_list[-50:]
-    return full_list
+    if len(new) >= MAX_CONVERSATION_HISTORY:
+        return new[-MAX_CONVERSATION_HISTORY:]
+    keep = MAX_CONVERSATION_HISTORY - len(new)
+    if len(current) > keep:
+        return current[-keep:] + new
+    return current + new
 
 
 def _format_history_for_summary(history: List[Dict]) -> str:
     """Formats conversation history for the summarizer prompt."""
-    formatted = []
-    for msg in history:
-        role = msg.get("role", "unknown")
-        content = msg.get("content", "")
-        formatted.append(f"{role.upper()}: {content}")
-    return "\n".join(formatted)
+    return "\n".join(f"{msg.get('role', 'unknown').upper()}: {msg.get('content', '')}" for msg in history)
 
 
 def _generate_summary(current_summary: str, history_str: str) -> str:
@@ -3,127 +3,334 @@ Supervisor node for the main agent graph.
 
 Decides whether to research more, finish, or ask for clarification.
 """
-from typing import Dict
+from collections import ChainMap
+from typing import Any, Dict, List, Optional, Tuple
 
-from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 
 from polyplexity_agent.config import Settings
-from polyplexity_agent.streaming.event_serializers import create_trace_event
+from polyplexity_agent.db_utils import get_database_manager
+from polyplexity_agent.streaming.event_serializers import TraceEvent
 from polyplexity_agent.graphs.state import SupervisorState
 from polyplexity_agent.logging import get_logger
-from polyplexity_agent.streaming import stream_custom_event, stream_trace_event
-from polyplexity_agent.models import SupervisorDecision
+from polyplexity_agent.streaming import stream_custom_event, stream_node_events
+from polyplexity_agent.models import AnswerFormat, NextStep, SupervisorDecision
 from polyplexity_agent.prompts.supervisor import (
     SUPERVISOR_FOLLOW_UP_CONTEXT_TEMPLATE,
     SUPERVISOR_FOLLOW_UP_SYSTEM_PROMPT_TEMPLATE,
     SUPERVISOR_SYSTEM_PROMPT_TEMPLATE,
+    SUPERVISOR_THREAD_NAME_REQUEST,
     SUPERVISOR_USER_PROMPT_TEMPLATE,
 )
+from polyplexity_agent.utils.decision_cache import cache_decision, get_cached_decision
 from polyplexity_agent.utils.helpers import (
+    ainvoke_structured,
+    condense_note,
     create_llm_model,
-    format_date,
-    generate_thread_name,
+    NOTES_SEPARATOR,
+    get_current_date,
+    get_notes_context,
+    invoke_structured,
     log_node_state,
+    normalize_thread_name,
+    report_preview,
+    run_in_background,
+    run_in_thread,
 )
+from polyplexity_agent.utils.lru_cache import LRUCache
+from polyplexity_agent.utils.state_manager import get_state_logger
 
 settings = Settings()
 logger = get_logger(__name__)
 
+# Thread names are at most this many words (see normalize_thread_name)
+THREAD_NAME_MAX_WORDS = 5
 
-def _handle_thread_name_generation(state: SupervisorState):
-    """Generate and save thread name on first iteration."""
+_named_threads = LRUCache(settings.named_thread_cache_size)
+
+
+def _remember_named_thread(thread_id: str) -> None:
+    """Record that a thread has a name, evicting the least recently seen thread when full."""
+    _named_threads.put(thread_id, True)
+
+
+def _thread_needing_name(state: SupervisorState) -> Optional[str]:
+    """Return the thread id if the thread has no name yet, otherwise None."""
     thread_id = state.get("_thread_id")
-    user_request = state.get("user_request", "")
-    if thread_id and user_request:
-        try:
-            from polyplexity_agent.db_utils import get_database_manager
-            db_manager = get_database_manager()
-            existing_thread = db_manager.get_thread(thread_id)
-            if existing_thread and existing_thread.name:
-                return
-            thread_name = generate_thread_name(user_request)
-            db_manager.save_thread_name(thread_id, thread_name)
-            stream_custom_event("thread_name", "supervisor", {"thread_id": thread_id, "name": thread_name})
-        except Exception as e:
-            logger.warning("thread_name_generation_failed", thread_id=thread_id, error=str(e))
-
-
-def _make_supervisor_decision(state: SupervisorState, iteration: int) -> SupervisorDecision:
-    """Make supervisor decision using LLM."""
-    notes_context = "\n\n".join(state.get("research_notes", []))
-    current_date = format_date()
+    if not thread_id or not state.get("user_request"):
+        return None
+    if _named_threads.get(thread_id):
+        return None
+    try:
+        existing_thread = get_database_manager().get_thread(thread_id)
+        if existing_thread and existing_thread.name:
+            _remember_named_thread(thread_id)
+            return None
+        return thread_id
+    except Exception as e:
+        logger.warning("thread_name_generation_failed", thread_id=thread_id, error=str(e))
+        return None
+
+
+def _query_is_thread_name(user_request: str) -> bool:
+    """Whether a request is short enough to serve as its own thread name."""
+    return len(user_request.split()) <= THREAD_NAME_MAX_WORDS
+
+
+def _persist_thread_name(thread_id: str, thread_name: str) -> None:
+    """Write a thread name to the database, remembering the thread once saved."""
+    try:
+        get_database_manager().save_thread_name(thread_id, thread_name)
+        _remember_named_thread(thread_id)
+    except Exception as e:
+        logger.warning("thread_name_generation_failed", thread_id=thread_id, error=str(e))
+
+
+def _save_thread_name(state: SupervisorState, thread_id: str, decision: SupervisorDecision):
+    """
+    Save the thread name returned alongside the first supervisor decision.
+    
+    Requests of THREAD_NAME_MAX_WORDS words or fewer are used as the name
+    directly. The name is streamed right away and written on the background
+    pool, so the database round trip stays off the supervisor's path.
+    """
+    try:
+        generated_name = "" if _query_is_thread_name(state["user_request"]) else getattr(decision, "thread_name", None) or ""
+        thread_name = normalize_thread_name(generated_name, state["user_request"])
+        run_in_background(_persist_thread_name, thread_id, thread_name)
+        stream_custom_event("thread_name", "supervisor", {"thread_id": thread_id, "name": thread_name})
+    except Exception as e:
+        logger.warning("thread_name_generation_failed", thread_id=thread_id, error=str(e))
+
+
+def _supervisor_notes_context(state: SupervisorState) -> str:
+    """
+    Build the notes block for the supervisor prompt with a bounded size.
+    
+    The most recent notes are kept in full; older ones are condensed so the
+    prompt stops growing with every research iteration.
+    
+    Args:
+        state: Supervisor state with research_notes
+        
+    Returns:
+        Notes context for the supervisor user prompt
+    """
+    notes = state.get("research_notes", [])
+    keep = max(settings.supervisor_full_notes, 1)
+    if len(notes) <= keep:
+        return get_notes_context(state)
+    condensed = NOTES_SEPARATOR.join(condense_note(note, settings.supervisor_note_digest_chars) for note in notes[:-keep])
+    recent = NOTES_SEPARATOR.join(notes[-keep:])
+    return f"Earlier Research (condensed):\n{condensed}\n\nLatest Research:\n{recent}"
+
+
+def _build_supervisor_prompts(state: SupervisorState, iteration: int, request_thread_name: bool = False) -> Tuple[str, str]:
+    """Build the supervisor system and user prompts, optionally asking for a thread name."""
+    notes_context = _supervisor_notes_context(state)
+    current_date = get_current_date(state)
     is_follow_up = bool(state.get("final_report") or state.get("conversation_history"))
     existing_report = state.get("final_report", "")
     conversation_history = state.get("conversation_history", [])
     conversation_summary = state.get("conversation_summary", "None")
-    model = create_llm_model().with_structured_output(SupervisorDecision).with_retry(stop_after_attempt=settings.max_structured_output_retries)
-    system_msg = (SUPERVISOR_FOLLOW_UP_SYSTEM_PROMPT_TEMPLATE if is_follow_up else SUPERVISOR_SYSTEM_PROMPT_TEMPLATE).format(current_date=current_date)
+    system_msg = SUPERVISOR_FOLLOW_UP_SYSTEM_PROMPT_TEMPLATE if is_follow_up else SUPERVISOR_SYSTEM_PROMPT_TEMPLATE
     follow_up_context = ""
     if is_follow_up and existing_report:
         follow_up_context = SUPERVISOR_FOLLOW_UP_CONTEXT_TEMPLATE.format(
             version=state.get("current_report_version", 0),
-            existing_report=existing_report[:1000] + "..." if len(existing_report) > 1000 else existing_report,
+            existing_report=report_preview(existing_report),
             conversation_history="\n".join(conversation_history[-5:]) if conversation_history else "None"
         )
     user_msg = SUPERVISOR_USER_PROMPT_TEMPLATE.format(
+        current_date=current_date,
         user_request=state["user_request"],
         follow_up_context=follow_up_context,
         conversation_summary=conversation_summary,
         iteration=iteration,
         notes_context=notes_context
     )
-    return model.invoke([SystemMessage(content=system_msg), HumanMessage(content=user_msg)])
+    if request_thread_name:
+        user_msg += SUPERVISOR_THREAD_NAME_REQUEST
+    return system_msg, user_msg
 
 
-def _emit_supervisor_trace_events(decision: SupervisorDecision, node_call_event: Dict):
-    """Emit supervisor trace events."""
-    reasoning_event = create_trace_event("reasoning", "supervisor", {"reasoning": decision.reasoning})
-    stream_trace_event("reasoning", "supervisor", {"reasoning": decision.reasoning})
-    stream_custom_event("supervisor_decision", "supervisor", {
-        "decision": decision.next_step,
-        "reasoning": decision.reasoning,
-        "topic": decision.research_topic
-    })
-    return [node_call_event, reasoning_event]
+def _emit_supervisor_trace_events(decision: SupervisorDecision, node_call_events: List[TraceEvent], next_step: str):
+    """Emit the reasoning trace and supervisor_decision event in one stream write."""
+    reasoning_events = stream_node_events(
+        "supervisor",
+        traces=[("reasoning", {"reasoning": decision.reasoning})],
+        custom_events=[("supervisor_decision", {
+            "decision": next_step,
+            "reasoning": decision.reasoning,
+            "topic": decision.research_topic
+        })]
+    )
+    return node_call_events + reasoning_events
+
+
+def _log_supervisor_start(state_logger: Optional[Any], state: SupervisorState) -> int:
+    """Log the incoming supervisor state and return the current iteration."""
+    history = state.get("conversation_history", [])
+    logger.debug("supervisor_conversation_history", history_count=len(history))
+    if history:
+        logger.debug("supervisor_history_sample", sample=str(history[-1])[:100])
+    iteration = state.get("iterations", 0)
+    log_node_state(state_logger, "supervisor", "MAIN_GRAPH", state, "BEFORE", iteration)
+    return iteration
+
+
+def _max_iterations_result(state_logger: Optional[Any], state: SupervisorState, iteration: int) -> Dict:
+    """Force a finish once the iteration cap is reached."""
+    trace_events = stream_node_events(
+        "supervisor",
+        traces=[("node_call", {})],
+        custom_events=[("supervisor_log", {"message": "Max iterations reached. Forcing finish."})]
+    )
+    result = {"next_topic": "FINISH", "execution_trace": trace_events}
+    log_node_state(state_logger, "supervisor", "MAIN_GRAPH", ChainMap(result, state), "AFTER", iteration, "Max iterations reached")
+    return result
+
+
+def _prepare_decision(state: SupervisorState, iteration: int, thread_id: Optional[str]) -> Tuple[List[TraceEvent], List[BaseMessage], Optional[SupervisorDecision]]:
+    """
+    Emit the node_call event, build the decision messages and check the decision cache.
+    
+    New threads get their name from the first decision call unless the request
+    is already short enough to be its own name.
+    
+    Args:
+        state: Supervisor state
+        iteration: Research iterations completed this turn
+        thread_id: Thread that still needs a name, or None
+        
+    Returns:
+        Tuple of (node_call trace events, system and user messages, cached decision or None)
+    """
+    node_call_events = stream_node_events("supervisor", traces=[("node_call", {})])
+    request_thread_name = thread_id is not None and not _query_is_thread_name(state["user_request"])
+    system_msg, user_msg = _build_supervisor_prompts(state, iteration, request_thread_name)
+    cached = get_cached_decision(system_msg, user_msg)
+    if cached is not None:
+        logger.debug("supervisor_decision_cache_hit", iteration=iteration)
+    return node_call_events, [SystemMessage(content=system_msg), HumanMessage(content=user_msg)], cached
+
+
+def _collect_research_topics(decision: SupervisorDecision) -> List[str]:
+    """
+    Gather the distinct topics to research this iteration, primary topic first.
+    
+    Args:
+        decision: Supervisor decision with research_topic and optional research_topics
+        
+    Returns:
+        De-duplicated topics capped at max_parallel_research_topics
+    """
+    extra_topics = getattr(decision, "research_topics", None)
+    candidates = [decision.research_topic] + (list(extra_topics) if isinstance(extra_topics, list) else [])
+    topics: List[str] = []
+    seen = set()
+    for topic in candidates:
+        key = topic.strip().lower() if isinstance(topic, str) else ""
+        if key and key not in seen:
+            seen.add(key)
+            topics.append(topic.strip())
+    return topics[:max(settings.max_parallel_research_topics, 1)]
+
+
+def _effective_next_step(state: SupervisorState, decision: SupervisorDecision, iteration: int) -> str:
+    """
+    Resolve the next step, finishing early when research is already sufficient.
+    
+    A 'research' decision is turned into 'finish' once this turn has researched
+    at least once and the supervisor's confidence reaches
+    supervisor_finish_confidence. research_notes accumulates across turns, so
+    only the iteration count shows whether the current question was researched.
+    
+    Args:
+        state: Supervisor state with research_notes
+        decision: Supervisor decision with next_step and confidence
+        iteration: Research iterations completed this turn
+        
+    Returns:
+        The next step to take
+    """
+    confidence = getattr(decision, "confidence", 0.0)
+    if (
+        decision.next_step == NextStep.RESEARCH
+        and iteration > 0
+        and state.get("research_notes")
+        and isinstance(confidence, (int, float))
+        and confidence >= settings.supervisor_finish_confidence
+    ):
+        logger.debug("supervisor_confident_finish", confidence=confidence)
+        return NextStep.FINISH.value
+    return decision.next_step
+
+
+def _decision_result(
+    state_logger: Optional[Any],
+    state: SupervisorState,
+    messages: List[BaseMessage],
+    decision: SupervisorDecision,
+    iteration: int,
+    node_call_events: List[TraceEvent],
+) -> Dict:
+    """Cache a supervisor decision for its messages and turn it into the node's state update."""
+    system_msg, user_msg = messages
+    cache_decision(system_msg.content, user_msg.content, decision)
+    ans_fmt = decision.answer_format if hasattr(decision, "answer_format") and decision.answer_format in (AnswerFormat.CONCISE, AnswerFormat.REPORT) else AnswerFormat.CONCISE.value
+    next_step = _effective_next_step(state, decision, iteration)
+    trace_events = _emit_supervisor_trace_events(decision, node_call_events, next_step)
+    next_topic = decision.research_topic
+    if next_step == NextStep.CLARIFY:
+        next_topic = f"CLARIFY:{decision.reasoning}"
+    elif next_step == NextStep.FINISH:
+        next_topic = "FINISH"
+    result = {
+        "next_topic": next_topic,
+        "iterations": iteration + 1 if next_step == NextStep.RESEARCH else iteration,
+        "execution_trace": trace_events,
+        "answer_format": ans_fmt,
+        "research_topics": _collect_research_topics(decision) if next_step == NextStep.RESEARCH else []
+    }
+    log_node_state(state_logger, "supervisor", "MAIN_GRAPH", ChainMap(result, state), "AFTER", iteration, f"Decision: {next_step}, Iter: {iteration}, Format: {ans_fmt}")
+    return result
 
 
 def supervisor_node(state: SupervisorState):
     """Decides whether to research more or finish and write the final report."""
     try:
-        from polyplexity_agent.utils.state_manager import _state_logger
-        history = state.get("conversation_history", [])
-        logger.debug("supervisor_conversation_history", history_count=len(history))
-        if history:
-            logger.debug("supervisor_history_sample", sample=str(history[-1])[:100])
-        log_node_state(_state_logger, "supervisor", "MAIN_GRAPH", dict(state), "BEFORE", state.get("iterations", 0))
-        iteration = state.get("iterations", 0)
-        if iteration == 0:
-            _handle_thread_name_generation(state)
-        if iteration >= 10:
-            node_call_event = create_trace_event("node_call", "supervisor", {})
-            stream_trace_event("node_call", "supervisor", {})
-            stream_custom_event("supervisor_log", "supervisor", {"message": "Max iterations reached. Forcing finish."})
-            result = {"next_topic": "FINISH", "execution_trace": [node_call_event]}
-            log_node_state(_state_logger, "supervisor", "MAIN_GRAPH", {**state, **result}, "AFTER", iteration, "Max iterations reached")
-            return result
-        node_call_event = create_trace_event("node_call", "supervisor", {})
-        stream_trace_event("node_call", "supervisor", {})
-        decision = _make_supervisor_decision(state, iteration)
-        ans_fmt = decision.answer_format if hasattr(decision, "answer_format") and decision.answer_format in ["concise", "report"] else "concise"
-        trace_events = _emit_supervisor_trace_events(decision, node_call_event)
-        next_topic = decision.research_topic
-        if decision.next_step == "clarify":
-            next_topic = f"CLARIFY:{decision.reasoning}"
-        elif decision.next_step == "finish":
-            next_topic = "FINISH"
-        result = {
-            "next_topic": next_topic,
-            "iterations": iteration + 1 if decision.next_step == "research" else iteration,
-            "execution_trace": trace_events,
-            "answer_format": ans_fmt
-        }
-        log_node_state(_state_logger, "supervisor", "MAIN_GRAPH", {**state, **result}, "AFTER", iteration, f"Decision: {decision.next_step}, Iter: {iteration}, Format: {ans_fmt}")
-        return result
+        state_logger = get_state_logger()
+        iteration = _log_supervisor_start(state_logger, state)
+        if iteration >= settings.max_supervisor_iterations:
+            return _max_iterations_result(state_logger, state, iteration)
+        thread_id = _thread_needing_name(state) if iteration == 0 else None
+        node_call_events, messages, decision = _prepare_decision(state, iteration, thread_id)
+        if decision is None:
+            decision = invoke_structured(create_llm_model(), SupervisorDecision, messages)
+        if thread_id:
+            _save_thread_name(state, thread_id, decision)
+        return _decision_result(state_logger, state, messages, decision, iteration, node_call_events)
+    except Exception as e:
+        stream_custom_event("error", "supervisor", {"error": str(e)})
+        logger.error("supervisor_node_error", error=str(e), exc_info=True)
+        raise
+
+
+async def asupervisor_node(state: SupervisorState):
+    """Async variant of supervisor_node used when the graph runs via astream."""
+    try:
+        state_logger = get_state_logger()
+        iteration = _log_supervisor_start(state_logger, state)
+        if iteration >= settings.max_supervisor_iterations:
+            return _max_iterations_result(state_logger, state, iteration)
+        thread_id = await run_in_thread(_thread_needing_name, state) if iteration == 0 else None
+        node_call_events, messages, decision = _prepare_decision(state, iteration, thread_id)
+        if decision is None:
+            decision = await ainvoke_structured(create_llm_model(), SupervisorDecision, messages)
+        if thread_id:
+            await run_in_thread(_save_thread_name, state, thread_id, decision)
+        return _decision_result(state_logger, state, messages, decision, iteration, node_call_events)
     except Exception as e:
         stream_custom_event("error", "supervisor", {"error": str(e)})
         logger.error("supervisor_node_error", error=str(e), exc_info=True)
@@ -3,12 +3,87 @@ State definitions for the research agent graph system.
 Uses TypedDict for type safety and Annotated reducers for state accumulation.
 """
 import operator
-from typing import Annotated, Dict, List, Optional, TypedDict
+import re
+from typing import Annotated, Dict, List, Optional, Set, TypedDict
 
 # Import manage_chat_history - this creates a circular dependency that is resolved
 # by importing state classes before importing supervisor nodes in __init__.py
 from polyplexity_agent.graphs.nodes.supervisor.summarize_conversation import manage_chat_history
 
+# Most recent execution_trace events kept in the graph state and its checkpoints
+MAX_EXECUTION_TRACE = 500
+
+# Total characters of formatted search results kept for one research synthesis
+MAX_SEARCH_RESULTS_CHARS = 64_000
+
+# Result links in the "Title: [title](url)" lines written by perform_search
+_RESULT_URL_PATTERN = re.compile(r"^Title: \[.*\]\((.+)\)$", re.MULTILINE)
+
+
+def manage_execution_trace(current: List[dict], new: List[dict]) -> List[dict]:
+    """
+    Custom reducer for execution_trace.
+    
+    1. Checks for reset signal (type="reset") to replace the trace.
+    2. Appends new events.
+    3. Keeps only the last MAX_EXECUTION_TRACE events.
+    
+    The full trace of each question is persisted with its assistant message,
+    so the checkpointed copy only needs to stay bounded.
+    
+    Args:
+        current: Current execution trace
+        new: New trace events to add
+        
+    Returns:
+        Updated execution trace
+    """
+    if new and new[0].get("type") == "reset":
+        return new[1:]
+    if len(new) >= MAX_EXECUTION_TRACE:
+        return new[-MAX_EXECUTION_TRACE:]
+    keep = MAX_EXECUTION_TRACE - len(new)
+    if len(current) > keep:
+        return current[-keep:] + new
+    return current + new
+
+
+def merge_search_results(current: List[str], new: List[str]) -> List[str]:
+    """
+    Custom reducer for search_results.
+    
+    1. Skips blocks already present, or whose result URLs were all seen in
+       earlier blocks, since they add nothing for synthesis.
+    2. Drops blocks that would take the total past MAX_SEARCH_RESULTS_CHARS,
+       so the synthesis prompt stays within the model's context.
+    
+    Args:
+        current: Search result blocks accumulated so far
+        new: Search result blocks from the latest searches
+        
+    Returns:
+        Updated search results
+    """
+    if not new:
+        return current
+    merged = list(current)
+    seen_blocks = set(current)
+    seen_urls: Set[str] = set()
+    for block in current:
+        seen_urls.update(_RESULT_URL_PATTERN.findall(block))
+    budget = MAX_SEARCH_RESULTS_CHARS - sum(len(block) for block in current)
+    for block in new:
+        urls = set(_RESULT_URL_PATTERN.findall(block))
+        if block in seen_blocks or (urls and urls <= seen_urls):
+            continue
+        if len(block) > budget:
+            continue
+        merged.append(block)
+        seen_blocks.add(block)
+        seen_urls.update(urls)
+        budget -= len(block)
+    return merged
+
 
 class ResearcherState(TypedDict):
     """
@@ -20,15 +95,17 @@ class ResearcherState(TypedDict):
     Fields:
         topic: The research topic to investigate
         queries: List of search queries generated from the topic
-        search_results: Accumulated search results from parallel searches (uses operator.add)
+        search_results: Accumulated search results from parallel searches, deduplicated and size-capped (uses merge_search_results)
         research_summary: Final synthesized summary of all research
         query_breadth: Maximum number of results per Tavily search (3-5)
+        _current_date: Internal date string for prompts, passed down from the main graph
     """
     topic: str
     queries: List[str]
-    search_results: Annotated[List[str], operator.add]  # Accumulates search results
+    search_results: Annotated[List[str], merge_search_results]  # Accumulates search results
     research_summary: str
     query_breadth: int
+    _current_date: str  # Internal: prompt date formatted once per request
 
 
 class MarketResearchState(TypedDict, total=False):
@@ -67,32 +144,38 @@ class SupervisorState(TypedDict, total=False):
     Fields:
         user_request: The original user question/request
         research_notes: Accumulated research notes from multiple iterations (uses operator.add)
+        notes_context: The research notes pre-joined for prompts, each prefixed with a blank line (uses operator.add)
         prediction_markets: List of approved prediction markets to include in the report
         next_topic: The next topic to research (or "FINISH" to end)
+        research_topics: Independent topics to research in parallel this iteration
         final_report: The final generated report
         iterations: Current iteration count (prevents infinite loops)
         conversation_history: Accumulated conversation history as structured messages (uses operator.add)
         current_report_version: Version number for report refinement in follow-ups
-        execution_trace: Accumulated execution trace events for current question only (uses operator.add)
+        execution_trace: Execution trace events for the current question, bounded to the most recent (uses manage_execution_trace)
         answer_format: "concise" or "report"
         approved_markets: List of approved markets returned from market research subgraph
         polymarket_blurb: Optional rewritten convincing market recommendation text
         _thread_id: Internal field for passing thread_id to nodes (not persisted in checkpoints)
         _question_execution_trace: Internal field for passing current question's execution trace to final_report_node (not persisted in checkpoints)
+        _current_date: Internal date string for prompts, formatted once per request by the entrypoint
     """
     user_request: str
     research_notes: Annotated[List[str], operator.add]  # Accumulates notes from iterations
+    notes_context: Annotated[str, operator.add]  # research_notes joined incrementally for prompts
     prediction_markets: List[Dict]  # Approved prediction markets
     next_topic: str  # To pass to subgraph
+    research_topics: List[str]  # Topics fanned out to call_researcher in parallel
     final_report: str
     iterations: int
     conversation_summary: str  # Summarized context
     conversation_history: Annotated[List[dict], manage_chat_history]  # Structured messages: [{"role": "user"|"assistant", "content": str, "execution_trace": List[dict]|None}, ...]
     current_report_version: int  # Track report iterations for refinement
-    execution_trace: Annotated[List[dict], operator.add]  # Track execution trace events (reset per question)
+    execution_trace: Annotated[List[dict], manage_execution_trace]  # Track execution trace events (reset per question)
     answer_format: str  # "concise" or "report"
     approved_markets: List[Dict]  # Approved markets from market research subgraph
     polymarket_blurb: Optional[str]  # Rewritten convincing market recommendation text
     _thread_id: Optional[str]  # Internal: thread_id for storing messages in separate table
     _question_execution_trace: Optional[List[dict]]  # Internal: current question's execution trace for final_report_node
+    _current_date: str  # Internal: prompt date formatted once per request
 
@@ -10,8 +10,6 @@ Handles market research workflow using tag-based selection:
 The subgraph streams incremental events for tags and markets, then provides
 a final reasoning summary.
 """
-from typing import Optional
-
 from langgraph.graph import END, START, StateGraph
 
 from polyplexity_agent.graphs.nodes.market_research import (
@@ -22,23 +20,16 @@ from polyplexity_agent.graphs.nodes.market_research import (
 )
 from polyplexity_agent.graphs.state import MarketResearchState
 
-# Global state logger instance (temporary, like Phase 5 pattern)
-_state_logger: Optional[object] = None
-
 
 def set_state_logger(logger: object) -> None:
     """
-    Set the global state logger instance.
+    Deprecated no-op kept for backward compatibility.
 
-    This function is used to configure a logger for state tracking within
-    the market research subgraph. The logger is stored globally to allow
-    access from node functions without circular import issues.
+    Nodes read the current run's logger from state_manager.get_state_logger().
 
     Args:
-        logger: The logger instance to use for state logging.
+        logger: Ignored.
     """
-    global _state_logger
-    _state_logger = logger
 
 
 def build_market_research_subgraph():
@@ -3,40 +3,52 @@ Researcher subgraph implementation.
 
 Handles focused research workflow: Topic -> Generate Queries -> Parallel Search -> Synthesize Results
 """
-from typing import Optional
-
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import END, START, StateGraph
 from langgraph.types import Send
 
 from polyplexity_agent.graphs.nodes.researcher import (
+    agenerate_queries_node,
+    aperform_search_node,
+    asynthesize_research_node,
     generate_queries_node,
     perform_search_node,
     synthesize_research_node,
 )
 from polyplexity_agent.graphs.state import ResearcherState
-
-# Global state logger instance (temporary, like Phase 4 pattern)
-_state_logger: Optional[object] = None
+from polyplexity_agent.utils.search_cache import normalize_query
 
 
 def set_state_logger(logger):
-    """Set the global state logger instance."""
-    global _state_logger
-    _state_logger = logger
+    """
+    Deprecated no-op kept for backward compatibility.
+    
+    Nodes read the current run's logger from state_manager.get_state_logger().
+    """
 
 
 def map_queries(state: ResearcherState):
-    """Maps queries to parallel search node invocations."""
+    """
+    Maps queries to parallel search node invocations.
+    
+    Queries that only differ in case or spacing are sent once: parallel
+    searches all miss the search cache, so each duplicate would cost its own
+    Tavily call and repeat the same results in the synthesis prompt.
+    """
     breadth = state.get("query_breadth", 2)
-    return [Send("perform_search", {"query": q, "query_breadth": breadth}) for q in state["queries"]]
+    unique_queries = {}
+    for q in state["queries"]:
+        unique_queries.setdefault(normalize_query(q), q)
+    return [Send("perform_search", {"query": q, "query_breadth": breadth}) for q in unique_queries.values()]
 
 
 def build_researcher_subgraph():
     """Build and compile the researcher subgraph."""
     builder = StateGraph(ResearcherState)
-    builder.add_node("generate_queries", generate_queries_node)
-    builder.add_node("perform_search", perform_search_node)
-    builder.add_node("synthesize_research", synthesize_research_node)
+    # LLM and search nodes await their network calls when the subgraph runs via astream
+    builder.add_node("generate_queries", RunnableLambda(generate_queries_node, afunc=agenerate_queries_node))
+    builder.add_node("perform_search", RunnableLambda(perform_search_node, afunc=aperform_search_node))
+    builder.add_node("synthesize_research", RunnableLambda(synthesize_research_node, afunc=asynthesize_research_node))
     
     builder.add_edge(START, "generate_queries")
     builder.add_conditional_edges("generate_queries", map_queries, ["perform_search"])
@@ -2,9 +2,23 @@
 Pydantic models for structured outputs used by the research agent.
 These models define the schema for LLM responses that require structured formatting.
 """
-from typing import List, Literal
+from enum import Enum
+from typing import Annotated, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class NextStep(str, Enum):
+    """Next action chosen by the supervisor."""
+    RESEARCH = "research"
+    FINISH = "finish"
+    CLARIFY = "clarify"
+
+
+class AnswerFormat(str, Enum):
+    """Answer format chosen by the supervisor."""
+    CONCISE = "concise"
+    REPORT = "report"
 
 
 class SearchQueries(BaseModel):
@@ -23,19 +37,38 @@ class SupervisorDecision(BaseModel):
     
     Used by the supervisor node to structure the LLM's decision about
     whether to continue researching or finish and generate the final report.
+    Enum fields are stored as their plain string values so decisions can be
+    written to graph state and checkpoints unchanged.
     """
-    next_step: Literal["research", "finish", "clarify"] = Field(
+    model_config = ConfigDict(use_enum_values=True)
+    
+    next_step: NextStep = Field(
         description="Choose 'research' if more information is needed, 'finish' if you have sufficient information, or 'clarify' if input is ambiguous."
     )
     research_topic: str = Field(
         description="If researching, the specific topic to investigate next. If finishing, clarifying, or answering directly, leave empty.",
-        default=""
+        default="",
+        max_length=512
+    )
+    research_topics: List[Annotated[str, Field(max_length=512)]] = Field(
+        description="If researching, additional independent topics to investigate in parallel with research_topic. Leave empty otherwise.",
+        default_factory=list
     )
-    answer_format: Literal["concise", "report"] = Field(
+    answer_format: AnswerFormat = Field(
         description="Select 'concise' for standard Q&A (bullet points, natural language). Select 'report' ONLY if the user explicitly asks for a report, comprehensive study, or in-depth analysis.",
-        default="concise"
+        default=AnswerFormat.CONCISE.value
+    )
+    reasoning: str = Field(description="Brief reasoning for the decision.", max_length=1024)
+    confidence: float = Field(
+        description="How confident you are, from 0 to 1, that the research gathered so far is enough to fully answer the request.",
+        default=0.0,
+        ge=0.0,
+        le=1.0
+    )
+    thread_name: Optional[str] = Field(
+        description="Only when asked for a thread title: a concise title (5 words or less) for the conversation. Otherwise leave empty.",
+        default=None
     )
-    reasoning: str = Field(description="Brief reasoning for the decision.")
 
 
 class MarketQueries(BaseModel):
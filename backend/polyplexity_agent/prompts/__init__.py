@@ -12,6 +12,7 @@ from .supervisor import (
     SUPERVISOR_FOLLOW_UP_SYSTEM_PROMPT_TEMPLATE,
     SUPERVISOR_USER_PROMPT_TEMPLATE,
     SUPERVISOR_FOLLOW_UP_CONTEXT_TEMPLATE,
+    SUPERVISOR_THREAD_NAME_REQUEST,
 )
 from .response_generator import (
     FINAL_RESPONSE_PROMPT_TEMPLATE,
@@ -32,6 +33,7 @@ __all__ = [
     "SUPERVISOR_FOLLOW_UP_SYSTEM_PROMPT_TEMPLATE",
     "SUPERVISOR_USER_PROMPT_TEMPLATE",
     "SUPERVISOR_FOLLOW_UP_CONTEXT_TEMPLATE",
+    "SUPERVISOR_THREAD_NAME_REQUEST",
     "FINAL_RESPONSE_PROMPT_TEMPLATE",
     "FINAL_RESPONSE_REFINEMENT_PROMPT_TEMPLATE",
     "DIRECT_ANSWER_PROMPT_TEMPLATE",
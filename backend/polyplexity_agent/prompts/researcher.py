@@ -19,18 +19,22 @@ Rules:
 
 CRITICAL: You MUST respond with valid JSON format using the provided tool. Use the structured output tool to return your response."""
 
-QUERY_GENERATION_USER_PROMPT_TEMPLATE = """For context, the current date is {current_date}.
+# Static instructions come first and per-call fields last so the prompt
+# prefix stays cacheable by the provider.
+QUERY_GENERATION_USER_PROMPT_TEMPLATE = """IMPORTANT: You MUST use the structured output tool to return your response in JSON format. Do not include any markdown code blocks or additional text - only return valid JSON through the tool.
 
-Generate 3 specific search queries to gather comprehensive information about: {topic}
+For context, the current date is {current_date}.
 
-IMPORTANT: You MUST use the structured output tool to return your response in JSON format. Do not include any markdown code blocks or additional text - only return valid JSON through the tool."""
+Generate 3 specific search queries to gather comprehensive information about: {topic}"""
 
-RESEARCH_SYNTHESIS_PROMPT_TEMPLATE = """For context, the current date is {current_date}.
-
-Analyze the following search results about '{topic}'. Write a detailed summary of the findings. Ignore irrelevant info.
+RESEARCH_SYNTHESIS_PROMPT_TEMPLATE = """Analyze the search results below about the given topic. Write a detailed summary of the findings. Ignore irrelevant info.
 
 IMPORTANT: Maintain inline links with facts using markdown format: [link text](url).
 When citing information from sources, preserve the source URLs inline with the facts.
 Format links as markdown: [descriptive text](source_url).
 
+For context, the current date is {current_date}.
+
+Topic: {topic}
+
 {raw_data}"""
@@ -36,46 +36,48 @@ FORMATTING REQUIREMENTS (REPORT):
 
 # Main prompt for generating the initial response from research notes.
 # Injects the appropriate formatting instructions based on user preference.
-FINAL_RESPONSE_PROMPT_TEMPLATE = """For context, the current date is {current_date}.
-
-Based on the following research notes, write a response to: {user_request}
+# Static instructions come first and per-request fields last so the prompt
+# prefix stays cacheable by the provider.
+FINAL_RESPONSE_PROMPT_TEMPLATE = """Based on the research notes below, write a response to the user request.
 
 {formatting_instructions}
 
+For context, the current date is {current_date}.
+
+User Request: {user_request}
+
 Notes:
 {notes}"""
 
 # Prompt for refining an existing response based on follow-up questions.
 # Handles integrating new research notes into an existing report/answer.
-FINAL_RESPONSE_REFINEMENT_PROMPT_TEMPLATE = """For context, the current date is {current_date}.
-
-This is a REFINEMENT of an existing response (Version {version}).
-The user has asked a follow-up question: {user_request}
-
-Previous Response (Version {version}):
-{existing_report}
-
-New Research Notes:
-{notes}
+# The previous response is stable for a thread, so it precedes the new notes.
+FINAL_RESPONSE_REFINEMENT_PROMPT_TEMPLATE = """This is a REFINEMENT of an existing response.
 
 TASK: Refine and expand the response based on:
-- The new research notes provided above
+- The new research notes provided below
 - The user's follow-up question
 - Integrate new findings with existing content
 
 {formatting_instructions}
 
-Clearly indicate what's new vs. what was already covered."""
+Clearly indicate what's new vs. what was already covered.
+
+Previous Response (Version {version}):
+{existing_report}
+
+For context, the current date is {current_date}.
+
+Follow-up Question: {user_request}
+
+New Research Notes:
+{notes}"""
 
 # Prompt for direct answers that don't require research (0 iterations).
 # Used when the supervisor determines the query can be answered immediately.
+# The formatting rules precede the conversation so the prefix is shared across requests.
 DIRECT_ANSWER_PROMPT_TEMPLATE = """You are a helpful assistant. Answer the user's request directly.
 
-Conversation Summary:
-{conversation_summary}
-
-User Request: {user_request}
-
 FORMATTING:
 - Provide a clear summary header or title.
 - Write 1-3 sentences of explanation or context.
@@ -83,6 +85,11 @@ FORMATTING:
 - Use simple markdown headers (###) to separate sections if needed.
 - Be concise but complete.
 - If referencing general knowledge, no citations are needed, but if citing specific facts from context, use [source](url).
+
+Conversation Summary:
+{conversation_summary}
+
+User Request: {user_request}
 """
 
 # Prompt for generating a convincing salesman-like blurb connecting user's question to Polymarket markets.
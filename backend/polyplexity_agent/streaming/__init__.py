@@ -9,7 +9,9 @@ from polyplexity_agent.streaming.event_processor import (
     process_update_events,
 )
 from polyplexity_agent.streaming.event_serializers import (
+    TraceEvent,
     TraceEventType,
+    collect_trace_events,
     create_trace_event,
     serialize_custom_event,
     serialize_event,
@@ -25,14 +27,17 @@ from polyplexity_agent.streaming.sse import (
 from polyplexity_agent.streaming.stream_writer import (
     stream_custom_event,
     stream_event,
+    stream_node_events,
     stream_state_update,
     stream_trace_event,
 )
 
 __all__ = [
     # Event serializers
+    "TraceEvent",
     "TraceEventType",
     "create_trace_event",
+    "collect_trace_events",
     "serialize_event",
     "serialize_trace_event",
     "serialize_custom_event",
@@ -41,6 +46,7 @@ __all__ = [
     "stream_event",
     "stream_trace_event",
     "stream_custom_event",
+    "stream_node_events",
     "stream_state_update",
     # SSE formatting
     "format_sse_event",
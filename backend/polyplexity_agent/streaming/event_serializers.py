@@ -10,18 +10,51 @@ All events are serialized into a common envelope format:
     "payload": dict        # Event-specific data
 }
 """
+import os
+import sys
 import time
-from typing import Any, Dict, Literal
+from typing import Any, Dict, List, Literal, Optional, TypedDict
 
 # Trace event type definition (migrated from execution_trace.py)
 TraceEventType = Literal["node_call", "reasoning", "search", "state_update", "custom"]
 
 
+class TraceEvent(TypedDict):
+    """
+    Shape of an execution trace event.
+    
+    Kept as a plain dict so events pass through state reducers, the checkpointer,
+    SSE serialization and the database without conversion.
+    """
+    type: TraceEventType
+    node: str
+    timestamp: int
+    data: Dict[str, Any]
+
+
+# Execution tracing can be switched off with POLYPLEXITY_TRACE=0
+TRACING_ENABLED = os.getenv("POLYPLEXITY_TRACE", "1") != "0"
+
+# Bound once to skip the attribute lookup on every event
+_time_ns = time.time_ns
+
+
+def current_timestamp_ms() -> int:
+    """
+    Get the current time for event timestamps.
+    
+    Returns:
+        Unix timestamp in milliseconds
+    """
+    return _time_ns() // 1_000_000
+
+
 def create_trace_event(
     event_type: TraceEventType,
     node: str,
-    data: Dict[str, Any]
-) -> Dict[str, Any]:
+    data: Dict[str, Any],
+    timestamp: Optional[int] = None
+) -> Optional[TraceEvent]:
     """
     Create a structured execution trace event.
     
@@ -31,23 +64,41 @@ def create_trace_event(
         event_type: Type of event (node_call, reasoning, search, state_update, custom)
         node: Name of the node that generated the event
         data: Event-specific data dictionary
+        timestamp: Optional Unix timestamp in milliseconds; defaults to now
         
     Returns:
-        Structured trace event dictionary
+        Structured trace event dictionary, or None when tracing is disabled
     """
+    if not TRACING_ENABLED:
+        return None
+    # Interned so long traces share one string object per type and node name
     return {
-        "type": event_type,
-        "node": node,
-        "timestamp": int(time.time() * 1000),  # Unix timestamp in milliseconds
+        "type": sys.intern(event_type),
+        "node": sys.intern(node),
+        "timestamp": current_timestamp_ms() if timestamp is None else timestamp,
         "data": data
     }
 
 
+def collect_trace_events(*events: Optional[TraceEvent]) -> List[TraceEvent]:
+    """
+    Collect trace events for an execution_trace state update.
+    
+    Args:
+        *events: Trace events returned by create_trace_event
+        
+    Returns:
+        List of events, without the None placeholders produced when tracing is disabled
+    """
+    return [event for event in events if event is not None]
+
+
 def serialize_event(
     event_type: str,
     node: str,
     event: str,
-    payload: Dict[str, Any]
+    payload: Dict[str, Any],
+    timestamp: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Create a standardized event envelope.
@@ -57,13 +108,14 @@ def serialize_event(
         node: Name of the node that generated the event
         event: Specific event name (e.g., "supervisor_decision", "node_call")
         payload: Event-specific data dictionary
+        timestamp: Optional Unix timestamp in milliseconds; defaults to now
         
     Returns:
         Standardized event envelope dictionary
     """
     return {
         "type": event_type,
-        "timestamp": int(time.time() * 1000),  # Unix timestamp in milliseconds
+        "timestamp": current_timestamp_ms() if timestamp is None else timestamp,
         "node": node,
         "event": event,
         "payload": payload
@@ -88,7 +140,8 @@ def serialize_trace_event(
     Returns:
         Standardized event envelope with trace event in payload
     """
-    trace_event = create_trace_event(trace_type, node, data)
+    timestamp = current_timestamp_ms()
+    trace_event = create_trace_event(trace_type, node, data, timestamp)
     
     # Extract event name from trace type or data
     event_name = trace_type
@@ -99,14 +152,16 @@ def serialize_trace_event(
         event_type="trace",
         node=node,
         event=event_name,
-        payload=trace_event
+        payload=trace_event,
+        timestamp=timestamp
     )
 
 
 def serialize_custom_event(
     event_name: str,
     node: str,
-    data: Dict[str, Any]
+    data: Dict[str, Any],
+    timestamp: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Serialize a custom event into envelope format.
@@ -115,6 +170,7 @@ def serialize_custom_event(
         event_name: Name of the custom event (e.g., "supervisor_decision", "generated_queries")
         node: Name of the node that generated the event
         data: Event-specific data dictionary
+        timestamp: Optional Unix timestamp in milliseconds; defaults to now
         
     Returns:
         Standardized event envelope with custom event data in payload
@@ -123,7 +179,8 @@ def serialize_custom_event(
         event_type="custom",
         node=node,
         event=event_name,
-        payload=data
+        payload=data,
+        timestamp=timestamp
     )
 
 
@@ -5,11 +5,23 @@ Handles formatting of standardized event envelopes into SSE format
 and creating async generators for FastAPI StreamingResponse.
 """
 import json
-from typing import Any, AsyncIterator, Dict, Iterator
+from typing import Any, AsyncIterator, Dict, Iterator, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
 
 from polyplexity_agent.streaming.event_processor import normalize_event
 
 
+def _dumps(event: Dict[str, Any]) -> str:
+    """Serialize an event to a JSON string, using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(event, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+    return json.dumps(event)
+
+
 def format_sse_event(event: Dict[str, Any]) -> str:
     """
     Format an event envelope as an SSE data line.
@@ -20,21 +32,33 @@ def format_sse_event(event: Dict[str, Any]) -> str:
     Returns:
         SSE-formatted string: "data: {json}\n\n"
     """
-    event_data = json.dumps(event)
+    event_data = _dumps(event)
     return f"data: {event_data}\n\n"
 
 
+async def _aiterate(
+    event_iterator: Union[Iterator[Tuple[str, Any]], AsyncIterator[Tuple[str, Any]]]
+) -> AsyncIterator[Tuple[str, Any]]:
+    """Iterate a sync or async (mode, data) iterator asynchronously."""
+    if hasattr(event_iterator, "__aiter__"):
+        async for item in event_iterator:
+            yield item
+    else:
+        for item in event_iterator:
+            yield item
+
+
 async def create_sse_generator(
-    event_iterator: Iterator[tuple[str, Any]]
+    event_iterator: Union[Iterator[Tuple[str, Any]], AsyncIterator[Tuple[str, Any]]]
 ) -> AsyncIterator[str]:
     """
     Create an async SSE generator from a LangGraph event iterator.
     
-    Processes events from run_research_agent() and formats them as SSE.
-    Handles both custom events and state updates.
+    Processes events from run_research_agent() or arun_research_agent() and
+    formats them as SSE. Handles both custom events and state updates.
     
     Args:
-        event_iterator: Iterator yielding (mode, data) tuples from LangGraph stream
+        event_iterator: Sync or async iterator yielding (mode, data) tuples from LangGraph stream
         
     Yields:
         SSE-formatted strings ready for StreamingResponse
@@ -42,11 +66,13 @@ async def create_sse_generator(
     try:
         final_response = None
         
-        for mode, data in event_iterator:
+        async for mode, data in _aiterate(event_iterator):
             if mode == "custom":
                 # Custom events are already in envelope format
                 # Ensure data is iterable (list) for uniform processing
                 items = data if isinstance(data, list) else [data]
+                # A batch of events is sent as one chunk of consecutive SSE data lines
+                frames = []
                 
                 for item in items:
                     if not isinstance(item, dict):
@@ -54,11 +80,14 @@ async def create_sse_generator(
                     
                     # Normalize to envelope format if needed
                     normalized = normalize_event(item)
-                    yield format_sse_event(normalized)
+                    frames.append(format_sse_event(normalized))
                     
                     # Capture final report when complete
                     if normalized.get("event") == "final_report_complete":
                         final_response = normalized.get("payload", {}).get("report", "")
+                
+                if frames:
+                    yield "".join(frames)
             
             elif mode == "updates":
                 # Emit state updates in envelope format
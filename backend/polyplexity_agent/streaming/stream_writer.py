@@ -4,16 +4,20 @@ Centralized streaming interface for nodes.
 Nodes should use these functions instead of directly calling get_stream_writer().
 All events are automatically serialized into the standardized envelope format.
 """
-from typing import Any, Dict
+from typing import Any, Dict, List, Sequence, Tuple
 
 from langgraph.config import get_stream_writer
 
+from polyplexity_agent.streaming import event_serializers
 from polyplexity_agent.streaming.event_serializers import (
+    create_trace_event,
+    current_timestamp_ms,
     serialize_custom_event,
+    serialize_event,
     serialize_state_update,
     serialize_trace_event,
 )
-from polyplexity_agent.streaming.event_serializers import TraceEventType
+from polyplexity_agent.streaming.event_serializers import TraceEvent, TraceEventType
 
 
 def stream_event(
@@ -31,8 +35,6 @@ def stream_event(
         event: Specific event name
         payload: Event-specific data dictionary
     """
-    from polyplexity_agent.streaming.event_serializers import serialize_event
-    
     writer = get_stream_writer()
     if writer:
         envelope = serialize_event(event_type, node, event, payload)
@@ -52,6 +54,8 @@ def stream_trace_event(
         node: Name of the node that generated the event
         data: Event-specific data dictionary
     """
+    if not event_serializers.TRACING_ENABLED:
+        return
     writer = get_stream_writer()
     if writer:
         envelope = serialize_trace_event(trace_type, node, data)
@@ -92,3 +96,43 @@ def stream_state_update(
     if writer:
         envelope = serialize_state_update(node, update_data)
         writer(envelope)
+
+
+def stream_node_events(
+    node: str,
+    traces: Sequence[Tuple[TraceEventType, Dict[str, Any]]] = (),
+    custom_events: Sequence[Tuple[str, Dict[str, Any]]] = ()
+) -> List[TraceEvent]:
+    """
+    Create trace events and stream them with custom events in one writer call.
+    
+    The envelopes are written as a single list, which every stream consumer
+    already unwraps in order, so a node's related events cross the stream
+    queue once. The streamed trace payloads are the same objects returned
+    for execution_trace, so each trace event is only built once, and the
+    whole batch shares one timestamp.
+    
+    Args:
+        node: Name of the node that generated the events
+        traces: (trace_type, data) pairs, streamed first and in order
+        custom_events: (event_name, data) pairs, streamed after the traces
+        
+    Returns:
+        Trace events for the node's execution_trace update
+    """
+    timestamp = current_timestamp_ms()
+    trace_events: List[TraceEvent] = []
+    envelopes: List[Dict[str, Any]] = []
+    for trace_type, data in traces:
+        trace_event = create_trace_event(trace_type, node, data, timestamp)
+        if trace_event is None:
+            continue
+        trace_events.append(trace_event)
+        envelopes.append(serialize_event("trace", node, data.get("event", trace_type), trace_event, timestamp))
+    for event_name, data in custom_events:
+        envelopes.append(serialize_custom_event(event_name, node, data, timestamp))
+    if envelopes:
+        writer = get_stream_writer()
+        if writer:
+            writer(envelopes)
+    return trace_events
@@ -11,6 +11,11 @@ from typing import Any, Dict, List, Optional
 
 import requests
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the standard library
+    orjson = None
+
 from polyplexity_agent.config import Settings
 
 POLYMARKET_SEARCH_URL = "https://gamma-api.polymarket.com/public-search"
@@ -18,6 +23,13 @@ POLYMARKET_EVENTS_URL = "https://gamma-api.polymarket.com/events"
 POLYMARKET_TAGS_URL = "https://gamma-api.polymarket.com/tags"
 
 
+def _loads(data: Any) -> Any:
+    """Parse JSON text or bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def _fetch_search_results(query: str) -> Dict[str, Any]:
     """
     Fetch raw search results from Polymarket API.
@@ -34,7 +46,7 @@ def _fetch_search_results(query: str) -> Dict[str, Any]:
     params = {"q": query}
     response = requests.get(POLYMARKET_SEARCH_URL, params=params)
     response.raise_for_status()
-    return response.json()
+    return _loads(response.content)
 
 
 def _parse_json_field(value: Any, default: Any = None) -> Any:
@@ -57,8 +69,8 @@ def _parse_json_field(value: Any, default: Any = None) -> Any:
         return default
     if isinstance(value, str):
         try:
-            return json.loads(value)
-        except (json.JSONDecodeError, TypeError):
+            return _loads(value)
+        except (ValueError, TypeError):
             return default
     return value
 
@@ -183,7 +195,7 @@ def _fetch_event_details(slug: str) -> List[Dict[str, Any]]:
     params = {"slug": slug}
     response = requests.get(POLYMARKET_EVENTS_URL, params=params)
     response.raise_for_status()
-    return response.json()
+    return _loads(response.content)
 
 
 def get_event_details(slug: str) -> Optional[Dict[str, Any]]:
@@ -246,7 +258,7 @@ def fetch_tags_batch(offset: int, limit: int = 20) -> List[Dict[str, Any]]:
     params = {"limit": limit, "offset": offset, "ascending": True}
     response = requests.get(POLYMARKET_TAGS_URL, params=params)
     response.raise_for_status()
-    return response.json()
+    return _loads(response.content)
 
 
 def fetch_events_by_tag_id(tag_id: str) -> List[Dict[str, Any]]:
@@ -273,7 +285,7 @@ def fetch_events_by_tag_id(tag_id: str) -> List[Dict[str, Any]]:
     params = {"tag_id": tag_id}
     response = requests.get(POLYMARKET_EVENTS_URL, params=params)
     response.raise_for_status()
-    events = response.json()
+    events = _loads(response.content)
     
     filtered_events = []
     for event in events:
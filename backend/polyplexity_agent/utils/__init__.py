@@ -5,9 +5,21 @@ Helper functions for LLM operations, state logging, trace events, and more.
 
 from .helpers import (
     generate_thread_name,
+    normalize_thread_name,
     create_llm_model,
+    bind_structured_output,
+    run_in_thread,
+    run_in_background,
+    wait_for_background_tasks,
     format_date,
+    get_current_date,
+    get_notes_context,
+    condense_note,
+    compact_notes,
+    report_preview,
+    NOTES_SEPARATOR,
     log_node_state,
+    log_text_summary,
     save_messages_and_trace,
     ensure_trace_completeness,
     format_search_url_markdown,
@@ -15,9 +27,21 @@ from .helpers import (
 
 __all__ = [
     "generate_thread_name",
+    "normalize_thread_name",
     "create_llm_model",
+    "bind_structured_output",
+    "run_in_thread",
+    "run_in_background",
+    "wait_for_background_tasks",
     "format_date",
+    "get_current_date",
+    "get_notes_context",
+    "condense_note",
+    "compact_notes",
+    "report_preview",
+    "NOTES_SEPARATOR",
     "log_node_state",
+    "log_text_summary",
     "save_messages_and_trace",
     "ensure_trace_completeness",
     "format_search_url_markdown",
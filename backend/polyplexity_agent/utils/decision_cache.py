@@ -0,0 +1,63 @@
+"""
+In-process cache for supervisor decisions.
+
+The supervisor prompt is fully determined by the request, research notes,
+history and iteration, so identical prompts can reuse an earlier decision
+instead of making another structured-output LLM call.
+"""
+import hashlib
+from typing import Any, Optional
+
+from polyplexity_agent.config import Settings
+from polyplexity_agent.models import SupervisorDecision
+from polyplexity_agent.utils.lru_cache import LRUCache
+from polyplexity_agent.utils.response_cache import canonicalize_prompt
+
+_settings = Settings()
+_decisions = LRUCache(_settings.supervisor_decision_cache_size)
+
+
+def _cache_key(system_msg: str, user_msg: str) -> str:
+    """Hash the model id and the canonical system and user prompts into a cache key."""
+    digest = hashlib.sha256(_settings.model_name.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(canonicalize_prompt(system_msg).encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(canonicalize_prompt(user_msg).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def get_cached_decision(system_msg: str, user_msg: str) -> Optional[SupervisorDecision]:
+    """
+    Look up a cached supervisor decision for the given prompts.
+
+    Args:
+        system_msg: Supervisor system prompt
+        user_msg: Supervisor user prompt
+
+    Returns:
+        Fresh SupervisorDecision instance on a hit, None on a miss
+    """
+    payload = _decisions.get(_cache_key(system_msg, user_msg))
+    if payload is None:
+        return None
+    # Cached data was validated when the LLM returned it, so skip re-validation
+    return SupervisorDecision.model_construct(**payload)
+
+
+def cache_decision(system_msg: str, user_msg: str, decision: Any) -> None:
+    """
+    Store a supervisor decision, evicting the least recently used entry when full.
+
+    Args:
+        system_msg: Supervisor system prompt
+        user_msg: Supervisor user prompt
+        decision: Decision returned by the LLM; ignored unless it is a SupervisorDecision
+    """
+    if isinstance(decision, SupervisorDecision):
+        _decisions.put(_cache_key(system_msg, user_msg), decision.model_dump())
+
+
+def clear_decision_cache() -> None:
+    """Remove all cached supervisor decisions."""
+    _decisions.clear()
@@ -2,13 +2,19 @@
 Helper functions for agent operations.
 Extracted from node implementations to keep nodes concise and maintainable.
 """
+import asyncio
+import contextvars
+import functools
+import threading
 import time
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import date
+from typing import Any, Callable, Dict, List, Mapping, Optional, Set, Tuple, Type
 from urllib.parse import urlparse
 
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
 from langchain_groq import ChatGroq
+from pydantic import BaseModel
 
 from polyplexity_agent.config import Settings
 from polyplexity_agent.db_utils import get_database_manager
@@ -19,21 +25,150 @@ from polyplexity_agent.prompts.thread_prompts import THREAD_NAME_GENERATION_PROM
 # Application settings
 _settings = Settings()
 
-# Lightweight model for fast thread name generation
-_thread_name_model = ChatGroq(
-    model=_settings.thread_name_model,
-    temperature=_settings.thread_name_temperature
+# Chat models keyed by (model name, temperature)
+_llm_models: Dict[Tuple[str, float], ChatGroq] = {}
+
+# Structured-output runnables keyed by (schema, model name, temperature)
+_structured_models: Dict[Tuple[Any, ...], Any] = {}
+
+# Structured-output runnables returning raw output and parsing errors, same keys
+_raw_structured_models: Dict[Tuple[Any, ...], Any] = {}
+
+STRUCTURED_OUTPUT_FEEDBACK = (
+    "Your previous response did not match the required output schema: {error}\n"
+    "Respond again with output that matches the schema exactly."
 )
 
+# Persistence work that should not hold up node completion or the end of the
+# stream. A single worker keeps writes in submission order, so a thread row
+# saved by the supervisor exists before the messages that reference it, and
+# the post-run trace check sees the saved exchange.
+_background_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="polyplexity-persist")
+_background_tasks: Set[Future] = set()
+_background_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _format_ordinal_date(ordinal: int) -> str:
+    """Format a proleptic Gregorian ordinal as 'MM DD YY'."""
+    return date.fromordinal(ordinal).strftime("%m %d %y")
+
 
 def format_date() -> str:
-    """Format current date as 'MM DD YY'."""
-    return datetime.now().strftime("%m %d %y")
+    """Format current date as 'MM DD YY', formatting each day only once."""
+    return _format_ordinal_date(date.today().toordinal())
+
+
+def get_current_date(state: Mapping[str, Any]) -> str:
+    """
+    Get the date for prompts, formatted once per request.
+    
+    Args:
+        state: Graph state, carrying _current_date when set by the entrypoint
+        
+    Returns:
+        The request's date as 'MM DD YY', or today's date if the state has none
+    """
+    return state.get("_current_date") or format_date()
+
+
+# Separator placed before each research note in the notes_context state field
+NOTES_SEPARATOR = "\n\n"
+
+# Characters of the previous report shown to the supervisor on follow-ups
+REPORT_PREVIEW_CHARS = 1000
+
+# Characters of long text values kept in state log entries
+LOG_PREVIEW_CHARS = 200
+
+
+def get_notes_context(state: Mapping[str, Any]) -> str:
+    """
+    Get the research notes joined for prompts.
+    
+    Reads the incrementally built notes_context field, falling back to joining
+    research_notes for checkpoints written before that field existed.
+    
+    Args:
+        state: Supervisor state
+        
+    Returns:
+        Research notes separated by blank lines
+    """
+    notes_context = state.get("notes_context")
+    if notes_context:
+        return notes_context[len(NOTES_SEPARATOR):]
+    return NOTES_SEPARATOR.join(state.get("research_notes", []))
+
+
+def condense_note(note: str, digest_chars: int) -> str:
+    """
+    Shorten a research note to its heading and the start of its summary.
+    
+    Args:
+        note: Research note, a heading line followed by the summary
+        digest_chars: Maximum summary characters to keep
+        
+    Returns:
+        The heading and summary prefix, with "..." appended if truncated
+    """
+    heading, _, body = note.partition("\n")
+    if len(body) > digest_chars:
+        body = body[:digest_chars].rstrip() + "..."
+    return f"{heading}\n{body}" if body else heading
+
+
+def compact_notes(notes: List[str], max_chars: int, digest_chars: int) -> str:
+    """
+    Join research notes for a prompt, condensing the oldest to fit a size budget.
+    
+    The newest notes are kept verbatim while they fit within max_chars (the
+    latest note is always kept); earlier notes are condensed with condense_note.
+    
+    Args:
+        notes: Research notes in the order they were written
+        max_chars: Character budget for the verbatim notes
+        digest_chars: Summary characters kept for each condensed note
+        
+    Returns:
+        Notes context, split into condensed and latest sections when compacted
+    """
+    budget = max_chars
+    recent_start = len(notes)
+    while recent_start > 0:
+        cost = len(notes[recent_start - 1]) + len(NOTES_SEPARATOR)
+        if cost > budget and recent_start < len(notes):
+            break
+        budget -= cost
+        recent_start -= 1
+    if recent_start == 0:
+        return NOTES_SEPARATOR.join(notes)
+    condensed = NOTES_SEPARATOR.join(condense_note(note, digest_chars) for note in notes[:recent_start])
+    recent = NOTES_SEPARATOR.join(notes[recent_start:])
+    return f"Earlier Research (condensed):\n{condensed}\n\nLatest Research:\n{recent}"
+
+
+def report_preview(report: str) -> str:
+    """
+    Truncate a report for the supervisor's follow-up context.
+    
+    Args:
+        report: Final report or answer text
+        
+    Returns:
+        The first REPORT_PREVIEW_CHARS characters, with "..." appended if truncated
+    """
+    if len(report) > REPORT_PREVIEW_CHARS:
+        return report[:REPORT_PREVIEW_CHARS] + "..."
+    return report
 
 
 def create_llm_model(model_name: Optional[str] = None, temperature: Optional[float] = None) -> ChatGroq:
     """
-    Create a ChatGroq LLM model instance.
+    Get a ChatGroq LLM model instance.
+    
+    Instances are shared per model configuration so the client and its
+    connection pool are built once instead of on every node invocation.
     
     Args:
         model_name: Model identifier (defaults to settings.model_name)
@@ -46,7 +181,214 @@ def create_llm_model(model_name: Optional[str] = None, temperature: Optional[flo
         model_name = _settings.model_name
     if temperature is None:
         temperature = _settings.temperature
-    return ChatGroq(model=model_name, temperature=temperature)
+    key = (model_name, temperature)
+    model = _llm_models.get(key)
+    if model is None:
+        model = ChatGroq(model=model_name, temperature=temperature)
+        _llm_models[key] = model
+    return model
+
+
+def bind_structured_output(model: ChatGroq, schema: Type[BaseModel]) -> Any:
+    """
+    Bind structured output and retries to a model, reusing earlier bindings.
+    
+    Binding regenerates the schema's JSON schema and tool spec, so the bound
+    runnable is cached per schema and model configuration and shared across calls.
+    
+    Args:
+        model: ChatGroq model instance to bind
+        schema: Pydantic model class describing the structured output
+        
+    Returns:
+        Runnable returning instances of the schema, with retries applied
+    """
+    key = (schema, getattr(model, "model_name", None), getattr(model, "temperature", None))
+    runnable = _structured_models.get(key)
+    if runnable is None:
+        runnable = model.with_structured_output(schema).with_retry(
+            stop_after_attempt=_settings.max_structured_output_retries
+        )
+        _structured_models[key] = runnable
+    return runnable
+
+
+def _bind_raw_structured_output(model: ChatGroq, schema: Type[BaseModel]) -> Any:
+    """Bind structured output with include_raw=True and API retries, reusing earlier bindings."""
+    key = (schema, getattr(model, "model_name", None), getattr(model, "temperature", None))
+    runnable = _raw_structured_models.get(key)
+    if runnable is None:
+        runnable = model.with_structured_output(schema, include_raw=True).with_retry(
+            stop_after_attempt=_settings.max_structured_output_retries
+        )
+        _raw_structured_models[key] = runnable
+    return runnable
+
+
+def _structured_attempts() -> range:
+    """Attempt numbers for output that fails schema validation."""
+    return range(1, max(1, _settings.max_structured_output_retries) + 1)
+
+
+def _parse_structured_result(result: Dict[str, Any], messages: List[Any], attempt: int) -> Tuple[Any, List[Any]]:
+    """
+    Unpack one include_raw structured output attempt.
+    
+    On a parsing failure the model's raw reply is appended to the messages,
+    followed by the validation error: as the result of each tool call it
+    made, or as a user message when it made none.
+    
+    Returns:
+        Tuple of (parsed output or None, messages for the next attempt)
+        
+    Raises:
+        ValueError: If parsing failed on the last attempt
+    """
+    parsed = result.get("parsed")
+    if parsed is not None:
+        return parsed, messages
+    error = result.get("parsing_error") or "no structured output returned"
+    if attempt >= max(1, _settings.max_structured_output_retries):
+        raise ValueError(f"Structured output failed after {attempt} attempts: {error}")
+    feedback = STRUCTURED_OUTPUT_FEEDBACK.format(error=error)
+    raw = result.get("raw")
+    if not isinstance(raw, AIMessage):
+        return None, messages + [HumanMessage(content=feedback)]
+    if not raw.tool_calls:
+        return None, messages + [raw, HumanMessage(content=feedback)]
+    return None, messages + [raw] + [ToolMessage(content=feedback, tool_call_id=call["id"]) for call in raw.tool_calls]
+
+
+def invoke_structured(model: ChatGroq, schema: Type[BaseModel], messages: List[Any]) -> Any:
+    """
+    Invoke a model for structured output, feeding validation errors back on retry.
+    
+    API errors are retried with backoff by with_retry. Output that fails schema
+    validation is retried with the model's reply and the error appended, so the
+    next attempt can correct it instead of repeating the same mistake. Both are
+    capped by max_structured_output_retries.
+    
+    Args:
+        model: ChatGroq model instance to bind
+        schema: Pydantic model class describing the structured output
+        messages: Prompt messages for the first attempt
+        
+    Returns:
+        Instance of the schema
+        
+    Raises:
+        ValueError: If no attempt produced output matching the schema
+    """
+    runnable = _bind_raw_structured_output(model, schema)
+    for attempt in _structured_attempts():
+        parsed, messages = _parse_structured_result(runnable.invoke(messages), messages, attempt)
+        if parsed is not None:
+            return parsed
+
+
+async def ainvoke_structured(model: ChatGroq, schema: Type[BaseModel], messages: List[Any]) -> Any:
+    """Async variant of invoke_structured."""
+    runnable = _bind_raw_structured_output(model, schema)
+    for attempt in _structured_attempts():
+        parsed, messages = _parse_structured_result(await runnable.ainvoke(messages), messages, attempt)
+        if parsed is not None:
+            return parsed
+
+
+async def run_in_thread(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a blocking function in the default executor from async code.
+    
+    The current context is copied into the worker thread so LangGraph's stream
+    writer and run config remain available to the function.
+    
+    Args:
+        func: Blocking function to run
+        *args: Positional arguments passed to the function
+        
+    Returns:
+        The function's return value
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(None, functools.partial(context.run, func, *args))
+
+
+def run_in_background(func: Callable[..., Any], *args: Any) -> Future:
+    """
+    Run a blocking function on the background pool without waiting for it.
+    
+    Used for persistence that the graph does not depend on, such as saving the
+    finished exchange, so nodes can return as soon as their result is ready.
+    
+    Args:
+        func: Blocking function to run
+        *args: Positional arguments passed to the function
+        
+    Returns:
+        Future for the submitted call
+    """
+    future = _background_executor.submit(func, *args)
+    with _background_lock:
+        _background_tasks.add(future)
+    future.add_done_callback(_discard_background_task)
+    return future
+
+
+def _discard_background_task(future: Future) -> None:
+    """Forget a finished background task, logging any error it raised."""
+    with _background_lock:
+        _background_tasks.discard(future)
+    if not future.cancelled() and future.exception() is not None:
+        from polyplexity_agent.logging import get_logger
+        get_logger(__name__).error("background_task_failed", error=str(future.exception()))
+
+
+def wait_for_background_tasks(timeout: Optional[float] = None) -> None:
+    """
+    Block until all background tasks submitted so far have finished.
+    
+    Args:
+        timeout: Optional maximum number of seconds to wait
+    """
+    with _background_lock:
+        pending = list(_background_tasks)
+    if pending:
+        wait(pending, timeout=timeout)
+
+
+def normalize_thread_name(name: str, user_query: str) -> str:
+    """
+    Clean up a generated thread name, falling back to the start of the query.
+    
+    Args:
+        name: Raw thread name returned by the LLM (may be empty)
+        user_query: The user's initial query/question
+        
+    Returns:
+        A 5-word (or less) thread name
+    """
+    name = (name or "").strip()
+    
+    # Remove quotes if present
+    if name.startswith('"') and name.endswith('"'):
+        name = name[1:-1]
+    if name.startswith("'") and name.endswith("'"):
+        name = name[1:-1]
+    
+    # Ensure it's 5 words or less
+    words = name.split()
+    if len(words) > 5:
+        name = " ".join(words[:5])
+    
+    # Fallback to truncated query if name is empty or too short
+    if not name or len(name) < 3:
+        words = user_query.split()[:5]
+        name = " ".join(words)
+        if len(name) > 50:
+            name = name[:47] + "..."
+    
+    return name or "New Chat"
 
 
 def generate_thread_name(user_query: str) -> str:
@@ -61,44 +403,22 @@ def generate_thread_name(user_query: str) -> str:
     """
     try:
         prompt = THREAD_NAME_GENERATION_PROMPT_TEMPLATE.format(user_query=user_query)
-        response = _thread_name_model.invoke([HumanMessage(content=prompt)])
-        name = response.content.strip()
-        
-        # Remove quotes if present
-        if name.startswith('"') and name.endswith('"'):
-            name = name[1:-1]
-        if name.startswith("'") and name.endswith("'"):
-            name = name[1:-1]
-        
-        # Ensure it's 5 words or less
-        words = name.split()
-        if len(words) > 5:
-            name = " ".join(words[:5])
-        
-        # Fallback to truncated query if name is empty or too short
-        if not name or len(name) < 3:
-            words = user_query.split()[:5]
-            name = " ".join(words)
-            if len(name) > 50:
-                name = name[:47] + "..."
-        
-        return name
+        # Lightweight model for fast thread name generation, created on first use
+        model = create_llm_model(_settings.thread_name_model, _settings.thread_name_temperature)
+        response = model.invoke([HumanMessage(content=prompt)])
+        return normalize_thread_name(response.content, user_query)
     except Exception as e:
         from polyplexity_agent.logging import get_logger
         logger = get_logger(__name__)
         logger.warning("thread_name_generation_failed", error=str(e))
-        words = user_query.split()[:5]
-        name = " ".join(words)
-        if len(name) > 50:
-            name = name[:47] + "..."
-        return name or "New Chat"
+        return normalize_thread_name("", user_query)
 
 
 def log_node_state(
     logger: Optional[Any],
     node_name: str,
     graph_type: str,
-    state: Dict[str, Any],
+    state: Mapping[str, Any],
     timing: str,
     iteration: Optional[int] = None,
     additional_info: Optional[str] = None
@@ -115,7 +435,9 @@ def log_node_state(
         logger: StateLogger instance (can be None to disable logging)
         node_name: Name of the node
         graph_type: Type of graph (MAIN_GRAPH or SUBGRAPH)
-        state: State dictionary to log
+        state: State mapping to log. Nodes pass their state by reference, or a
+            ChainMap(update, state) view for AFTER logs, so nothing is copied
+            unless a logger is actually writing
         timing: Timing indicator (BEFORE, AFTER, INITIAL, etc.)
         iteration: Optional iteration number
         additional_info: Optional additional information string
@@ -131,6 +453,37 @@ def log_node_state(
         )
 
 
+def _trace_rows(execution_trace: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert trace events into execution_traces rows for a batched insert."""
+    rows = []
+    for idx, trace_event in enumerate(execution_trace):
+        event_data = trace_event.get("data", {})
+        if "node" not in event_data and "node" in trace_event:
+            event_data["node"] = trace_event["node"]
+        rows.append({
+            "event_type": trace_event.get("type", "custom"),
+            "event_data": event_data,
+            "timestamp": trace_event.get("timestamp", time.time_ns() // 1_000_000),
+            "event_index": idx,
+        })
+    return rows
+
+
+def log_text_summary(key: str, text: str) -> Dict[str, Any]:
+    """
+    Summarize a long text value for a state log entry.
+    
+    Args:
+        key: State key the text is stored under
+        text: Text value to summarize
+        
+    Returns:
+        Dict with "<key>_preview" (the first LOG_PREVIEW_CHARS characters) and
+        "<key>_len" (the full length)
+    """
+    return {f"{key}_preview": text[:LOG_PREVIEW_CHARS], f"{key}_len": len(text)}
+
+
 def save_messages_and_trace(
     thread_id: str,
     user_request: str,
@@ -167,28 +520,13 @@ def save_messages_and_trace(
         )
         
         # Save execution trace events
-        for idx, trace_event in enumerate(execution_trace):
-            event_type = trace_event.get("type", "custom")
-            event_data = trace_event.get("data", {})
-            if "node" not in event_data and "node" in trace_event:
-                event_data["node"] = trace_event["node"]
-            timestamp = trace_event.get("timestamp", int(time.time() * 1000))
-            
-            db_manager.save_execution_trace(
-                message_id=assistant_message_id,
-                event_type=event_type,
-                event_data=event_data,
-                timestamp=timestamp,
-                event_index=idx
-            )
+        db_manager.save_execution_traces(assistant_message_id, _trace_rows(execution_trace))
         
         return assistant_message_id
     except Exception as e:
         from polyplexity_agent.logging import get_logger
         logger = get_logger(__name__)
         logger.warning("save_messages_failed", error=str(e), exc_info=True)
-        import traceback
-        traceback.print_exc()
         return None
 
 
@@ -218,38 +556,22 @@ def ensure_trace_completeness(
         latest_assistant = assistant_messages[-1]
         assistant_message_id = latest_assistant["id"]
         
-        existing_traces = db_manager.get_message_traces(str(assistant_message_id))
-        existing_count = len(existing_traces)
+        existing_count = db_manager.count_message_traces(str(assistant_message_id))
         expected_count = len(expected_trace)
         
         if existing_count < expected_count:
             from polyplexity_agent.logging import get_logger
             logger = get_logger(__name__)
             logger.debug("trace_incomplete", existing_count=existing_count, expected_count=expected_count)
-            db_manager.delete_message_traces(str(assistant_message_id))
-            
-            for idx, trace_event in enumerate(expected_trace):
-                event_type = trace_event.get("type", "custom")
-                event_data = trace_event.get("data", {})
-                if "node" not in event_data and "node" in trace_event:
-                    event_data["node"] = trace_event["node"]
-                timestamp = trace_event.get("timestamp", int(time.time() * 1000))
-                
-                db_manager.save_execution_trace(
-                    message_id=assistant_message_id,
-                    event_type=event_type,
-                    event_data=event_data,
-                    timestamp=timestamp,
-                    event_index=idx
-                )
+            db_manager.save_execution_traces(
+                str(assistant_message_id), _trace_rows(expected_trace), replace=True
+            )
             
             logger.debug("trace_updated", event_count=len(expected_trace))
     except Exception as e:
         from polyplexity_agent.logging import get_logger
         logger = get_logger(__name__)
         logger.warning("ensure_trace_completeness_failed", error=str(e), exc_info=True)
-        import traceback
-        traceback.print_exc()
 
 
 def format_search_url_markdown(url: str) -> str:
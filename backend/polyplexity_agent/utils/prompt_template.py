@@ -0,0 +1,42 @@
+"""
+Pre-parsed prompt templates.
+
+str.format re-parses the whole template on every call. The researcher
+prompts are rendered once per topic and per synthesis, so their templates
+are split into literal chunks and field names once at import, and rendering
+only joins the pieces.
+"""
+from string import Formatter
+from typing import Any, Callable, List, Optional, Tuple
+
+
+def compile_template(template: str) -> Callable[..., str]:
+    """
+    Compile a str.format template with simple named fields into a renderer.
+
+    Args:
+        template: Template text using {name} fields and {{ }} escapes
+
+    Returns:
+        Function taking the field values as keyword arguments and returning
+        the same text as template.format(**kwargs)
+
+    Raises:
+        ValueError: If the template uses positional, indexed or attribute
+            fields, conversions or format specs
+    """
+    pieces: List[Tuple[str, Optional[str]]] = []
+    for literal, field, spec, conversion in Formatter().parse(template):
+        if field is not None and (not field.isidentifier() or spec or conversion):
+            raise ValueError(f"Unsupported template field: {{{field}}}")
+        pieces.append((literal, field))
+
+    def render(**kwargs: Any) -> str:
+        parts: List[str] = []
+        for literal, field in pieces:
+            parts.append(literal)
+            if field is not None:
+                parts.append(str(kwargs[field]))
+        return "".join(parts)
+
+    return render
@@ -0,0 +1,108 @@
+"""
+In-process cache for researcher subgraph summaries and search queries.
+
+With the supervisor decision and response caches, a repeated request already
+skips its supervisor and report LLM calls, but every research topic still
+re-runs query generation, web searches and synthesis. Caching the finished
+summary per topic lets an identical plan replay without any of that work.
+Generated queries do not depend on the result breadth, so they are cached
+separately and reused when the same topic is researched at another breadth.
+Entries are keyed by date, so research is never reused across days.
+"""
+import hashlib
+from typing import Optional
+
+from polyplexity_agent.config import Settings
+from polyplexity_agent.models import SearchQueries
+from polyplexity_agent.utils.lru_cache import LRUCache
+from polyplexity_agent.utils.response_cache import canonicalize_prompt
+
+_settings = Settings()
+_summaries = LRUCache(_settings.research_cache_size)
+_queries = LRUCache(_settings.query_cache_size)
+
+
+def _cache_key(topic: str, query_breadth: int, current_date: str) -> str:
+    """Hash the model id, normalized topic, breadth and date into a cache key."""
+    digest = hashlib.sha256(_settings.model_name.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(canonicalize_prompt(topic).lower().encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(f"{query_breadth}\x00{current_date}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def get_cached_research(topic: str, query_breadth: int, current_date: str) -> Optional[str]:
+    """
+    Look up a cached research summary for a topic.
+
+    Args:
+        topic: Research topic sent to the researcher subgraph
+        query_breadth: Results per search the summary was built from
+        current_date: Date the research was run for
+
+    Returns:
+        Cached research summary on a hit, None on a miss
+    """
+    return _summaries.get(_cache_key(topic, query_breadth, current_date))
+
+
+def cache_research(topic: str, query_breadth: int, current_date: str, summary: str) -> None:
+    """
+    Store a research summary, evicting the least recently used entry when full.
+
+    Args:
+        topic: Research topic sent to the researcher subgraph
+        query_breadth: Results per search the summary was built from
+        current_date: Date the research was run for
+        summary: Research summary; ignored if empty
+    """
+    if summary:
+        _summaries.put(_cache_key(topic, query_breadth, current_date), summary)
+
+
+def _queries_key(topic: str, current_date: str) -> str:
+    """Hash the model id, normalized topic and date into a query cache key."""
+    digest = hashlib.sha256(_settings.model_name.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(canonicalize_prompt(topic).lower().encode("utf-8"))
+    digest.update(f"\x00{current_date}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def get_cached_queries(topic: str, current_date: str) -> Optional[SearchQueries]:
+    """
+    Look up cached search queries for a topic.
+
+    Args:
+        topic: Research topic the queries were generated for
+        current_date: Date the queries were generated for
+
+    Returns:
+        Fresh SearchQueries instance on a hit, None on a miss
+    """
+    queries = _queries.get(_queries_key(topic, current_date))
+    if queries is None:
+        return None
+    # Cached data was validated when the LLM returned it, so skip re-validation
+    return SearchQueries.model_construct(queries=list(queries))
+
+
+def cache_queries(topic: str, current_date: str, resp: object) -> None:
+    """
+    Store generated search queries, evicting the least recently used entry when full.
+
+    Args:
+        topic: Research topic the queries were generated for
+        current_date: Date the queries were generated for
+        resp: Response returned by the LLM; ignored unless it is a SearchQueries
+            instance with at least one query
+    """
+    if isinstance(resp, SearchQueries) and resp.queries:
+        _queries.put(_queries_key(topic, current_date), tuple(resp.queries))
+
+
+def clear_research_cache() -> None:
+    """Remove all cached research summaries and search queries."""
+    _summaries.clear()
+    _queries.clear()
@@ -0,0 +1,115 @@
+"""
+In-process exact-match cache for plain-text LLM responses.
+
+Direct answers and final reports are generated at temperature 0 from fully
+rendered prompts, so a repeated prompt for the same model (retries, resent
+follow-ups) can be answered from memory instead of another network round-trip.
+"""
+import hashlib
+from typing import Any, Optional
+
+from langchain_core.messages import HumanMessage
+
+from polyplexity_agent.config import Settings
+from polyplexity_agent.utils.lru_cache import LRUCache
+
+_settings = Settings()
+_responses = LRUCache(_settings.llm_response_cache_size)
+
+
+def canonicalize_prompt(prompt: str) -> str:
+    """
+    Collapse whitespace so prompts that differ only in spacing share a cache key.
+    
+    Args:
+        prompt: Rendered prompt text
+        
+    Returns:
+        Prompt with every whitespace run replaced by a single space
+    """
+    return " ".join(prompt.split())
+
+
+def _cache_key(model: Any, prompt: str) -> Optional[str]:
+    """Hash the model id and canonical prompt into a cache key, or None if the model has no string id."""
+    model_name = getattr(model, "model_name", None)
+    if not isinstance(model_name, str):
+        return None
+    digest = hashlib.sha256(model_name.encode("utf-8"))
+    digest.update(b"\x00")
+    digest.update(canonicalize_prompt(prompt).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def get_cached_response(model: Any, prompt: str) -> Optional[str]:
+    """
+    Look up a cached response for the given model and prompt.
+
+    Args:
+        model: Chat model the prompt would be sent to
+        prompt: Fully rendered prompt text
+
+    Returns:
+        Cached response content on a hit, None on a miss
+    """
+    key = _cache_key(model, prompt)
+    if key is None:
+        return None
+    return _responses.get(key)
+
+
+def cache_response(model: Any, prompt: str, content: Any) -> None:
+    """
+    Store a response, evicting the least recently used entry when full.
+
+    Args:
+        model: Chat model that produced the response
+        prompt: Fully rendered prompt text
+        content: Response content; ignored unless it is a non-empty string
+    """
+    key = _cache_key(model, prompt)
+    if key is not None and isinstance(content, str) and content:
+        _responses.put(key, content)
+
+
+def invoke_cached(model: Any, prompt: str) -> str:
+    """
+    Invoke a chat model with a single human message, serving repeats from the cache.
+
+    Args:
+        model: Chat model to invoke
+        prompt: Fully rendered prompt text
+
+    Returns:
+        Response content
+    """
+    content = get_cached_response(model, prompt)
+    if content is not None:
+        return content
+    content = model.invoke([HumanMessage(content=prompt)]).content
+    cache_response(model, prompt, content)
+    return content
+
+
+async def ainvoke_cached(model: Any, prompt: str) -> str:
+    """
+    Async variant of invoke_cached.
+
+    Args:
+        model: Chat model to invoke
+        prompt: Fully rendered prompt text
+
+    Returns:
+        Response content
+    """
+    content = get_cached_response(model, prompt)
+    if content is not None:
+        return content
+    content = (await model.ainvoke([HumanMessage(content=prompt)])).content
+    cache_response(model, prompt, content)
+    return content
+
+
+def clear_response_cache() -> None:
+    """Remove all cached responses."""
+    _responses.clear()
@@ -0,0 +1,70 @@
+"""
+In-process cache for Tavily search results.
+
+Researcher topics often overlap, and follow-up questions frequently repeat
+queries from earlier turns, so the same search would otherwise cost another
+network round-trip each time. Results are keyed by the normalized query and
+result count, and expire after a configurable time-to-live so cached web
+results never go stale for long.
+"""
+import hashlib
+from typing import Any, Dict, Optional
+
+from polyplexity_agent.config import Settings
+from polyplexity_agent.utils.lru_cache import LRUCache
+from polyplexity_agent.utils.response_cache import canonicalize_prompt
+
+_settings = Settings()
+_results = LRUCache(_settings.search_cache_size, ttl=_settings.search_cache_ttl_seconds)
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalize a search query so trivially different spellings compare equal.
+    
+    Args:
+        query: Search query text
+        
+    Returns:
+        Query lowercased with whitespace runs collapsed
+    """
+    return canonicalize_prompt(query).lower()
+
+
+def _cache_key(query: str, max_results: int) -> str:
+    """Hash the normalized query and result count into a cache key."""
+    digest = hashlib.sha256(normalize_query(query).encode("utf-8"))
+    digest.update(f"\x00{max_results}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def get_cached_search(query: str, max_results: int) -> Optional[Dict[str, Any]]:
+    """
+    Look up cached Tavily results for a query.
+
+    Args:
+        query: Search query sent to Tavily
+        max_results: Number of results the search was run with
+
+    Returns:
+        Cached Tavily response on a fresh hit, None on a miss or expired entry.
+        The response is shared with the cache and must not be mutated.
+    """
+    return _results.get(_cache_key(query, max_results))
+
+
+def cache_search(query: str, max_results: int, results: Dict[str, Any]) -> None:
+    """
+    Store Tavily results, evicting the least recently used entry when full.
+
+    Args:
+        query: Search query sent to Tavily
+        max_results: Number of results the search was run with
+        results: Tavily response to cache
+    """
+    _results.put(_cache_key(query, max_results), results)
+
+
+def clear_search_cache() -> None:
+    """Remove all cached search results."""
+    _results.clear()
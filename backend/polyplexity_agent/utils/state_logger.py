@@ -19,9 +19,10 @@ of LangGraph agent execution flows.
 - Keeping them separate allows developers to enable/disable detailed state logging
   independently from application logging.
 """
+from collections import ChainMap
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Mapping, Optional
 
 
 class StateLogger:
@@ -36,14 +37,17 @@ class StateLogger:
     handles general application logging in JSON format for production monitoring.
     """
     
-    def __init__(self, log_file_path: Path):
+    def __init__(self, log_file_path: Path, verbose: bool = True):
         """
         Initialize the state logger with a log file path.
         
         Args:
             log_file_path: Path to the log file where states will be written
+            verbose: Write the full state on every entry. When False, BEFORE entries
+                only list the state keys and AFTER entries only the node's update.
         """
         self.log_file_path = log_file_path
+        self.verbose = verbose
         self.log_file = None
         self._ensure_log_file()
     
@@ -103,7 +107,7 @@ class StateLogger:
         self,
         node_name: str,
         graph_type: str,
-        state: Dict[str, Any],
+        state: Mapping[str, Any],
         timing: str,
         iteration: Optional[int] = None,
         additional_info: Optional[str] = None
@@ -114,7 +118,7 @@ class StateLogger:
         Args:
             node_name: Name of the node being executed
             graph_type: Type of graph (MAIN_GRAPH or SUBGRAPH)
-            state: The state dictionary to log
+            state: The state mapping to log
             timing: When this log occurs (BEFORE, AFTER, INITIAL, FINAL, etc.)
             iteration: Optional iteration number
             additional_info: Optional additional context information
@@ -141,15 +145,34 @@ class StateLogger:
             self.log_file.write(f"Additional Info: {additional_info}\n")
             self.log_file.write("-" * 80 + "\n")
         
-        # Write formatted state
-        self.log_file.write("State:\n")
+        if self.verbose:
+            self._write_state("State:", state)
+        elif isinstance(state, ChainMap):
+            # Node AFTER logs pass ChainMap(result, state); only the update is new
+            self._write_state("State update:", state.maps[0])
+        elif timing == "BEFORE":
+            self._write_state_summary(state)
+        else:
+            self._write_state("State:", state)
+        
+        self.log_file.write("\n")
+        self.log_file.flush()  # Ensure it's written immediately
+    
+    def _write_state(self, title: str, state: Mapping[str, Any]):
+        """Write every key of a state mapping with its formatted value."""
+        self.log_file.write(f"{title}\n")
         for key, value in state.items():
             formatted_value = self._format_state_value(value)
             self.log_file.write(f"{key}:\n{formatted_value}\n")
             self.log_file.write("-" * 80 + "\n")
-        
-        self.log_file.write("\n")
-        self.log_file.flush()  # Ensure it's written immediately
+    
+    def _write_state_summary(self, state: Mapping[str, Any]):
+        """Write the state keys with value sizes instead of the formatted values."""
+        self.log_file.write("State keys:\n")
+        for key, value in state.items():
+            size = f" (len {len(value)})" if isinstance(value, (str, list, tuple, dict)) else ""
+            self.log_file.write(f"  {key}{size}\n")
+        self.log_file.write("-" * 80 + "\n")
     
     def close(self):
         """Close the log file."""
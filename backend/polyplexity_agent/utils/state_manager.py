@@ -4,7 +4,8 @@ State manager module for global application state.
 Manages global state logger, checkpointer, and main graph instances.
 This module centralizes state management that was previously in orchestrator.py.
 """
-import traceback
+from contextvars import ContextVar, Token
+from threading import Lock
 from typing import Any, Optional
 
 from dotenv import load_dotenv
@@ -20,24 +21,52 @@ load_dotenv()
 settings = Settings()
 logger = get_logger(__name__)
 
-# Global logger instance
-_state_logger: Optional[StateLogger] = None
+# State logger of the current run. A context variable keeps concurrent runs
+# from sharing a logger; LangGraph copies the context into node threads/tasks.
+_state_logger_ctx: ContextVar[Optional[StateLogger]] = ContextVar("state_logger", default=None)
 
 
-def set_state_logger(logger_instance: Optional[StateLogger]) -> None:
+def get_state_logger() -> Optional[StateLogger]:
     """
-    Set the global state logger instance.
+    Get the state logger of the current run.
+    
+    Returns:
+        The StateLogger set for this context, or None if state logging is off
+    """
+    return _state_logger_ctx.get()
+
+
+def set_state_logger(logger_instance: Optional[StateLogger]) -> Token:
+    """
+    Set the state logger for the current context.
     
     Args:
         logger_instance: The StateLogger instance to set, or None to clear
+        
+    Returns:
+        Token for restoring the previous logger with reset_state_logger()
+    """
+    return _state_logger_ctx.set(logger_instance)
+
+
+def reset_state_logger(token: Token) -> None:
+    """
+    Restore the state logger that was set before set_state_logger() returned token.
+    
+    Args:
+        token: Token returned by set_state_logger()
     """
-    global _state_logger
-    _state_logger = logger_instance
+    try:
+        _state_logger_ctx.reset(token)
+    except ValueError:
+        # An abandoned async generator may be closed from another context
+        _state_logger_ctx.set(None)
 
 
 # Create checkpointer if database is configured
 _checkpointer = create_checkpointer()
 _checkpointer_setup_done = False
+_checkpointer_setup_lock = Lock()
 
 
 def ensure_checkpointer_setup(checkpointer: Optional[Any] = None) -> Optional[Any]:
@@ -56,22 +85,25 @@ def ensure_checkpointer_setup(checkpointer: Optional[Any] = None) -> Optional[An
     target_checkpointer = checkpointer if checkpointer is not None else _checkpointer
     
     if target_checkpointer and not _checkpointer_setup_done:
-        try:
-            if hasattr(target_checkpointer, "setup"):
-                target_checkpointer.setup()
-                logger.info("checkpointer_setup_completed")
-            else:
-                logger.warning("checkpointer_no_setup_method")
-            _checkpointer_setup_done = True
-            return target_checkpointer
-        except Exception as e:
-            logger.error("checkpointer_setup_failed", error=str(e), exc_info=True)
-            traceback.print_exc()
-            logger.info("continuing_without_checkpointing")
-            _checkpointer_setup_done = True  # Mark as done to prevent retrying
-            if checkpointer is None:
-                _checkpointer = None
-            return None
+        # Graphs may be compiled from several request threads at once; run setup only once
+        with _checkpointer_setup_lock:
+            if _checkpointer_setup_done:
+                return target_checkpointer
+            try:
+                if hasattr(target_checkpointer, "setup"):
+                    target_checkpointer.setup()
+                    logger.info("checkpointer_setup_completed")
+                else:
+                    logger.warning("checkpointer_no_setup_method")
+                _checkpointer_setup_done = True
+                return target_checkpointer
+            except Exception as e:
+                logger.error("checkpointer_setup_failed", error=str(e), exc_info=True)
+                logger.info("continuing_without_checkpointing")
+                _checkpointer_setup_done = True  # Mark as done to prevent retrying
+                if checkpointer is None:
+                    _checkpointer = None
+                return None
     
     return target_checkpointer
 
@@ -89,12 +121,15 @@ def __getattr__(name: str) -> Any:
         name: Name of the attribute to get
         
     Returns:
-        The requested attribute (main_graph)
+        The requested attribute (main_graph, or _state_logger for the current run)
         
     Raises:
         AttributeError: If the attribute doesn't exist
     """
     global _main_graph
+    if name == "_state_logger":
+        # Backward-compatible read of the current run's logger
+        return _state_logger_ctx.get()
     if name == "main_graph":
         if _main_graph is None:
             from polyplexity_agent.graphs.agent_graph import create_agent_graph
@@ -105,9 +140,11 @@ def __getattr__(name: str) -> Any:
 
 # Export all public symbols
 __all__ = [
-    "_state_logger",
+    "_state_logger",  # Accessed via __getattr__
     "_checkpointer",
+    "get_state_logger",
     "set_state_logger",
+    "reset_state_logger",
     "ensure_checkpointer_setup",
     "main_graph",  # Accessed via __getattr__
 ]
@@ -56,7 +56,7 @@ def test_is_checkpointing_available_without_env_var():
         assert result is False
 
 
-@patch("polyplexity_agent.config.secrets.PostgresSaver")
+@patch("polyplexity_agent.config.secrets.ThreadedPostgresSaver")
 def test_create_checkpointer_success(mock_postgres_saver):
     """
     Test create_checkpointer when database is configured correctly.
@@ -75,7 +75,7 @@ def test_create_checkpointer_success(mock_postgres_saver):
         mock_context.__enter__.assert_called_once()
 
 
-@patch("polyplexity_agent.config.secrets.PostgresSaver")
+@patch("polyplexity_agent.config.secrets.ThreadedPostgresSaver")
 def test_create_checkpointer_with_psycopg_format(mock_postgres_saver):
     """
     Test create_checkpointer converts postgresql+psycopg:// to postgresql://.
@@ -105,7 +105,7 @@ def test_create_checkpointer_no_env_var():
         assert result is None
 
 
-@patch("polyplexity_agent.config.secrets.PostgresSaver")
+@patch("polyplexity_agent.config.secrets.ThreadedPostgresSaver")
 def test_create_checkpointer_exception_handling(mock_postgres_saver):
     """
     Test create_checkpointer handles exceptions gracefully.
@@ -20,6 +20,46 @@ from polyplexity_agent.graphs.state import (
 from polyplexity_agent.models import SearchQueries, SupervisorDecision
 
 
+def fake_stream_node_events(node: str, traces: Any = (), custom_events: Any = ()) -> List[Dict[str, Any]]:
+    """Stand in for stream_node_events, returning one trace event per trace.
+
+    Args:
+        node: Node name the events belong to.
+        traces: (trace_type, data) pairs to turn into trace events.
+        custom_events: Custom events, which are not returned.
+
+    Returns:
+        One trace event dict per trace.
+    """
+    return [{"type": trace_type, "node": node, "data": data} for trace_type, data in traces]
+
+
+@pytest.fixture(autouse=True)
+def fresh_research_caches() -> Iterator[None]:
+    """Start every test without cached Tavily clients, search results, queries, supervisor decisions or LLM responses.
+
+    Yields:
+        None; caches are cleared before and after the test.
+    """
+    from polyplexity_agent.graphs.nodes.researcher.perform_search import _get_search_tool
+    from polyplexity_agent.utils.decision_cache import clear_decision_cache
+    from polyplexity_agent.utils.research_cache import clear_research_cache
+    from polyplexity_agent.utils.response_cache import clear_response_cache
+    from polyplexity_agent.utils.search_cache import clear_search_cache
+
+    _get_search_tool.cache_clear()
+    clear_search_cache()
+    clear_research_cache()
+    clear_response_cache()
+    clear_decision_cache()
+    yield
+    _get_search_tool.cache_clear()
+    clear_search_cache()
+    clear_research_cache()
+    clear_response_cache()
+    clear_decision_cache()
+
+
 @pytest.fixture
 def mock_settings() -> Settings:
     """Create Settings instance with temporary directory for state logs.
@@ -1,14 +1,16 @@
 """
 Tests for generate_queries node.
 """
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
-from polyplexity_agent.graphs.nodes.researcher.generate_queries import generate_queries_node
+from polyplexity_agent.graphs.nodes.researcher.generate_queries import agenerate_queries_node, generate_queries_node
 from polyplexity_agent.graphs.state import ResearcherState
 from polyplexity_agent.models import SearchQueries
 
+from tests.conftest import fake_stream_node_events
+
 
 @pytest.fixture
 def sample_state():
@@ -29,19 +31,15 @@ def mock_search_queries():
     return queries
 
 
-@patch("polyplexity_agent.graphs.subgraphs.researcher._state_logger")
 @patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.stream_trace_event")
+@patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.stream_node_events", side_effect=fake_stream_node_events)
 @patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.create_llm_model")
-@patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.create_trace_event")
 @patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.log_node_state")
 def test_generate_queries_node(
     mock_log_node_state,
-    mock_create_trace_event,
     mock_create_llm_model,
-    mock_stream_trace_event,
+    mock_stream_node_events,
     mock_stream_custom_event,
-    mock_state_logger,
     sample_state,
     mock_search_queries,
 ):
@@ -49,14 +47,9 @@ def test_generate_queries_node(
     
     # Mock LLM chain
     mock_llm_chain = Mock()
-    mock_llm_chain.with_structured_output.return_value.with_retry.return_value.invoke.return_value = mock_search_queries
+    mock_llm_chain.with_structured_output.return_value.with_retry.return_value.invoke.return_value = {"raw": Mock(), "parsed": mock_search_queries, "parsing_error": None}
     mock_create_llm_model.return_value = mock_llm_chain
     
-    mock_create_trace_event.side_effect = [
-        {"event": "trace", "type": "node_call"},
-        {"event": "trace", "type": "custom"},
-    ]
-    
     result = generate_queries_node(sample_state)
     
     assert "queries" in result
@@ -66,39 +59,32 @@ def test_generate_queries_node(
     assert len(result["execution_trace"]) == 2
     
     # Verify streaming functions were called
-    assert mock_stream_custom_event.call_count >= 2  # researcher_thinking, generated_queries
-    assert mock_stream_trace_event.call_count >= 2  # node_call, custom trace
+    assert mock_stream_custom_event.call_count >= 1  # researcher_thinking
+    mock_stream_node_events.assert_called_once()  # node_call, custom trace and generated_queries
+    custom_events = mock_stream_node_events.call_args.kwargs["custom_events"]
+    assert [name for name, _ in custom_events] == ["generated_queries"]
     
     # Verify log_node_state was called
     assert mock_log_node_state.call_count == 2  # BEFORE and AFTER
 
 
-@patch("polyplexity_agent.graphs.subgraphs.researcher._state_logger")
 @patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.stream_trace_event")
+@patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.stream_node_events", side_effect=fake_stream_node_events)
 @patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.create_llm_model")
-@patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.create_trace_event")
 @patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.log_node_state")
 def test_generate_queries_node_different_topics(
     mock_log_node_state,
-    mock_create_trace_event,
     mock_create_llm_model,
-    mock_stream_trace_event,
+    mock_stream_node_events,
     mock_stream_custom_event,
-    mock_state_logger,
     mock_search_queries,
 ):
     """Test generate_queries_node with different topics."""
     
     mock_llm_chain = Mock()
-    mock_llm_chain.with_structured_output.return_value.with_retry.return_value.invoke.return_value = mock_search_queries
+    mock_llm_chain.with_structured_output.return_value.with_retry.return_value.invoke.return_value = {"raw": Mock(), "parsed": mock_search_queries, "parsing_error": None}
     mock_create_llm_model.return_value = mock_llm_chain
     
-    mock_create_trace_event.side_effect = [
-        {"event": "trace", "type": "node_call"},
-        {"event": "trace", "type": "custom"},
-    ]
-    
     state = {
         "topic": "quantum computing",
         "queries": [],
@@ -119,7 +105,6 @@ def test_generate_queries_node_different_topics(
     assert any("quantum computing" in str(msg.content) for msg in call_args)
 
 
-@patch("polyplexity_agent.graphs.subgraphs.researcher._state_logger")
 @patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.stream_custom_event")
 @patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.create_llm_model")
 @patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.log_node_state")
@@ -127,7 +112,6 @@ def test_generate_queries_node_error_handling(
     mock_log_node_state,
     mock_create_llm_model,
     mock_stream_custom_event,
-    mock_state_logger,
     sample_state,
 ):
     """Test generate_queries_node handles errors gracefully."""
@@ -145,3 +129,28 @@ def test_generate_queries_node_error_handling(
     # Verify error call details
     error_call = error_calls[0]
     assert error_call[0][1] == "generate_queries"  # node
+
+
+@pytest.mark.asyncio
+@patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.stream_custom_event")
+@patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.stream_node_events", side_effect=fake_stream_node_events)
+@patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.create_llm_model")
+@patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.log_node_state")
+async def test_agenerate_queries_node(
+    mock_log_node_state,
+    mock_create_llm_model,
+    mock_stream_node_events,
+    mock_stream_custom_event,
+    sample_state,
+    mock_search_queries,
+):
+    """Test agenerate_queries_node awaits the structured LLM call."""
+    structured = mock_create_llm_model.return_value.with_structured_output.return_value.with_retry.return_value
+    structured.ainvoke = AsyncMock(return_value={"raw": Mock(), "parsed": mock_search_queries, "parsing_error": None})
+    
+    result = await agenerate_queries_node(sample_state)
+    
+    assert result["queries"] == ["AI definition", "AI applications", "AI history"]
+    structured.ainvoke.assert_awaited_once()
+    structured.invoke.assert_not_called()
+
@@ -1,10 +1,12 @@
 """
 Tests for perform_search node.
 """
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
+from tests.conftest import fake_stream_node_events
+
 
 @pytest.fixture
 def sample_state():
@@ -34,21 +36,17 @@ def mock_tavily_results():
     }
 
 
-@patch("polyplexity_agent.graphs.subgraphs.researcher._state_logger")
 @patch("polyplexity_agent.graphs.nodes.researcher.perform_search.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.researcher.perform_search.stream_trace_event")
+@patch("polyplexity_agent.graphs.nodes.researcher.perform_search.stream_node_events", side_effect=fake_stream_node_events)
 @patch("polyplexity_agent.graphs.nodes.researcher.perform_search.TavilySearch")
-@patch("polyplexity_agent.graphs.nodes.researcher.perform_search.create_trace_event")
 @patch("polyplexity_agent.graphs.nodes.researcher.perform_search.log_node_state")
 @patch("polyplexity_agent.graphs.nodes.researcher.perform_search.format_search_url_markdown")
 def test_perform_search_node(
     mock_format_markdown,
     mock_log_node_state,
-    mock_create_trace_event,
     mock_tavily_search,
-    mock_stream_trace_event,
+    mock_stream_node_events,
     mock_stream_custom_event,
-    mock_state_logger,
     sample_state,
     mock_tavily_results,
 ):
@@ -61,12 +59,6 @@ def test_perform_search_node(
     
     mock_format_markdown.side_effect = lambda url: f"[{url}]({url})"
     
-    mock_create_trace_event.side_effect = [
-        {"event": "trace", "type": "node_call"},
-        {"event": "trace", "type": "search"},
-        {"event": "trace", "type": "search"},
-    ]
-    
     from polyplexity_agent.graphs.nodes.researcher.perform_search import perform_search_node
     
     result = perform_search_node(sample_state)
@@ -82,27 +74,24 @@ def test_perform_search_node(
     mock_tavily_search.assert_called_once_with(max_results=3, topic="general")
     mock_tool.invoke.assert_called_once_with({"query": "artificial intelligence"})
     
-    # Verify web_search_url events were emitted
-    url_calls = [
-        call for call in mock_stream_custom_event.call_args_list
-        if call[0][0] == "web_search_url"
+    # Verify web_search_url events were emitted with the results trace
+    url_events = [
+        data for call in mock_stream_node_events.call_args_list
+        for name, data in call.kwargs.get("custom_events", ())
+        if name == "web_search_url"
     ]
-    assert len(url_calls) == 2  # Two URLs in results
+    assert [event["url"] for event in url_events] == ["https://example.com/ai", "https://example.com/ml"]
 
 
-@patch("polyplexity_agent.graphs.subgraphs.researcher._state_logger")
 @patch("polyplexity_agent.graphs.nodes.researcher.perform_search.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.researcher.perform_search.stream_trace_event")
+@patch("polyplexity_agent.graphs.nodes.researcher.perform_search.stream_node_events", side_effect=fake_stream_node_events)
 @patch("polyplexity_agent.graphs.nodes.researcher.perform_search.TavilySearch")
-@patch("polyplexity_agent.graphs.nodes.researcher.perform_search.create_trace_event")
 @patch("polyplexity_agent.graphs.nodes.researcher.perform_search.log_node_state")
 def test_perform_search_node_query_breadth_default(
     mock_log_node_state,
-    mock_create_trace_event,
     mock_tavily_search,
-    mock_stream_trace_event,
+    mock_stream_node_events,
     mock_stream_custom_event,
-    mock_state_logger,
     mock_tavily_results,
 ):
     """Test perform_search_node defaults query_breadth to 2 if missing."""
@@ -111,12 +100,6 @@ def test_perform_search_node_query_breadth_default(
     mock_tool.invoke.return_value = mock_tavily_results
     mock_tavily_search.return_value = mock_tool
     
-    mock_create_trace_event.side_effect = [
-        {"event": "trace", "type": "node_call"},
-        {"event": "trace", "type": "search"},
-        {"event": "trace", "type": "search"},
-    ]
-    
     from polyplexity_agent.graphs.nodes.researcher.perform_search import perform_search_node
     
     state = {
@@ -130,19 +113,17 @@ def test_perform_search_node_query_breadth_default(
     mock_tavily_search.assert_called_once_with(max_results=2, topic="general")
 
 
-@patch("polyplexity_agent.graphs.subgraphs.researcher._state_logger")
 @patch("polyplexity_agent.streaming.stream_writer.get_stream_writer")
 @patch("polyplexity_agent.graphs.nodes.researcher.perform_search.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.researcher.perform_search.stream_trace_event")
+@patch("polyplexity_agent.graphs.nodes.researcher.perform_search.stream_node_events", side_effect=fake_stream_node_events)
 @patch("polyplexity_agent.graphs.nodes.researcher.perform_search.TavilySearch")
 @patch("polyplexity_agent.graphs.nodes.researcher.perform_search.log_node_state")
 def test_perform_search_node_error_handling(
     mock_log_node_state,
     mock_tavily_search,
-    mock_stream_trace_event,
+    mock_stream_node_events,
     mock_stream_custom_event,
     mock_get_stream_writer,
-    mock_state_logger,
     sample_state,
 ):
     """Test perform_search_node handles errors gracefully."""
@@ -162,21 +143,17 @@ def test_perform_search_node_error_handling(
     assert len(error_calls) >= 1
 
 
-@patch("polyplexity_agent.graphs.subgraphs.researcher._state_logger")
 @patch("polyplexity_agent.graphs.nodes.researcher.perform_search.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.researcher.perform_search.stream_trace_event")
+@patch("polyplexity_agent.graphs.nodes.researcher.perform_search.stream_node_events", side_effect=fake_stream_node_events)
 @patch("polyplexity_agent.graphs.nodes.researcher.perform_search.TavilySearch")
-@patch("polyplexity_agent.graphs.nodes.researcher.perform_search.create_trace_event")
 @patch("polyplexity_agent.graphs.nodes.researcher.perform_search.log_node_state")
 @patch("polyplexity_agent.graphs.nodes.researcher.perform_search.format_search_url_markdown")
 def test_perform_search_node_empty_results(
     mock_format_markdown,
     mock_log_node_state,
-    mock_create_trace_event,
     mock_tavily_search,
-    mock_stream_trace_event,
+    mock_stream_node_events,
     mock_stream_custom_event,
-    mock_state_logger,
     sample_state,
 ):
     """Test perform_search_node handles empty search results."""
@@ -185,12 +162,6 @@ def test_perform_search_node_empty_results(
     mock_tool.invoke.return_value = {"results": []}
     mock_tavily_search.return_value = mock_tool
     
-    mock_create_trace_event.side_effect = [
-        {"event": "trace", "type": "node_call"},
-        {"event": "trace", "type": "search"},
-        {"event": "trace", "type": "search"},
-    ]
-    
     from polyplexity_agent.graphs.nodes.researcher.perform_search import perform_search_node
     
     result = perform_search_node(sample_state)
@@ -200,8 +171,64 @@ def test_perform_search_node_empty_results(
     assert "artificial intelligence" in result["search_results"][0]
     
     # Verify no web_search_url events were emitted
-    url_calls = [
-        call for call in mock_stream_custom_event.call_args_list
-        if call[0][0] == "web_search_url"
+    url_events = [
+        name for call in mock_stream_node_events.call_args_list
+        for name, _ in call.kwargs.get("custom_events", ())
+        if name == "web_search_url"
     ]
-    assert len(url_calls) == 0
+    assert len(url_events) == 0
+
+
+@patch("polyplexity_agent.graphs.nodes.researcher.perform_search.stream_custom_event")
+@patch("polyplexity_agent.graphs.nodes.researcher.perform_search.stream_node_events", side_effect=fake_stream_node_events)
+@patch("polyplexity_agent.graphs.nodes.researcher.perform_search.TavilySearch")
+@patch("polyplexity_agent.graphs.nodes.researcher.perform_search.log_node_state")
+def test_perform_search_node_reuses_cached_results(
+    mock_log_node_state,
+    mock_tavily_search,
+    mock_stream_node_events,
+    mock_stream_custom_event,
+    sample_state,
+    mock_tavily_results,
+):
+    """Test a repeated query is served from the cache without another search."""
+    mock_tool = Mock()
+    mock_tool.invoke.return_value = mock_tavily_results
+    mock_tavily_search.return_value = mock_tool
+    
+    from polyplexity_agent.graphs.nodes.researcher.perform_search import perform_search_node
+    
+    first = perform_search_node(sample_state)
+    second = perform_search_node({"query": "Artificial  Intelligence", "query_breadth": 3})
+    
+    mock_tavily_search.assert_called_once_with(max_results=3, topic="general")
+    mock_tool.invoke.assert_called_once()
+    assert "AI Overview" in second["search_results"][0]
+    assert len(second["execution_trace"]) == len(first["execution_trace"]) + 1
+    assert any(event["data"].get("event") == "cache_hit" for event in second["execution_trace"])
+
+
+@pytest.mark.asyncio
+@patch("polyplexity_agent.graphs.nodes.researcher.perform_search.stream_custom_event")
+@patch("polyplexity_agent.graphs.nodes.researcher.perform_search.stream_node_events", side_effect=fake_stream_node_events)
+@patch("polyplexity_agent.graphs.nodes.researcher.perform_search.TavilySearch")
+@patch("polyplexity_agent.graphs.nodes.researcher.perform_search.log_node_state")
+async def test_aperform_search_node(
+    mock_log_node_state,
+    mock_tavily_search,
+    mock_stream_node_events,
+    mock_stream_custom_event,
+    sample_state,
+    mock_tavily_results,
+):
+    """Test aperform_search_node awaits the Tavily search."""
+    mock_tool = mock_tavily_search.return_value
+    mock_tool.ainvoke = AsyncMock(return_value=mock_tavily_results)
+    
+    from polyplexity_agent.graphs.nodes.researcher.perform_search import aperform_search_node
+    
+    result = await aperform_search_node(sample_state)
+    
+    assert "AI Overview" in result["search_results"][0]
+    mock_tool.ainvoke.assert_awaited_once_with({"query": "artificial intelligence"})
+    mock_tool.invoke.assert_not_called()
@@ -1,13 +1,15 @@
 """
 Tests for synthesize_research node.
 """
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
-from polyplexity_agent.graphs.nodes.researcher.synthesize_research import synthesize_research_node
+from polyplexity_agent.graphs.nodes.researcher.synthesize_research import asynthesize_research_node, synthesize_research_node
 from polyplexity_agent.graphs.state import ResearcherState
 
+from tests.conftest import fake_stream_node_events
+
 
 @pytest.fixture
 def sample_state():
@@ -16,27 +18,25 @@ def sample_state():
         "topic": "artificial intelligence",
         "queries": ["AI definition", "AI applications"],
         "search_results": [
-            "--- Results for 'AI definition' ---\nTitle: [AI Overview](https://example.com/ai)\nContent: AI is...\n\n",
-            "--- Results for 'AI applications' ---\nTitle: [ML Basics](https://example.com/ml)\nContent: ML is...\n\n",
+            "--- Results for 'AI definition' ---\nTitle: [AI Overview](https://example.com/ai)\n"
+            "Content: AI is a branch of computer science concerned with building systems that reason, learn and act.\n\n",
+            "--- Results for 'AI applications' ---\nTitle: [ML Basics](https://example.com/ml)\n"
+            "Content: ML is a subset of AI in which models learn patterns from data instead of following rules.\n\n",
         ],
         "research_summary": "",
         "query_breadth": 3,
     }
 
 
-@patch("polyplexity_agent.graphs.subgraphs.researcher._state_logger")
 @patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.stream_trace_event")
+@patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.stream_node_events", side_effect=fake_stream_node_events)
 @patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.create_llm_model")
-@patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.create_trace_event")
 @patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.log_node_state")
 def test_synthesize_research_node(
     mock_log_node_state,
-    mock_create_trace_event,
     mock_create_llm_model,
-    mock_stream_trace_event,
+    mock_stream_node_events,
     mock_stream_custom_event,
-    mock_state_logger,
     sample_state,
 ):
     """Test synthesize_research_node synthesizes search results."""
@@ -45,14 +45,9 @@ def test_synthesize_research_node(
     mock_response = Mock()
     mock_response.content = "Artificial intelligence (AI) is a branch of computer science..."
     mock_llm_chain = Mock()
-    mock_llm_chain.invoke.return_value = mock_response
+    mock_llm_chain.stream.return_value = iter([mock_response])
     mock_create_llm_model.return_value = mock_llm_chain
     
-    mock_create_trace_event.side_effect = [
-        {"event": "trace", "type": "node_call"},
-        {"event": "trace", "type": "custom"},
-    ]
-    
     result = synthesize_research_node(sample_state)
     
     assert "research_summary" in result
@@ -62,7 +57,7 @@ def test_synthesize_research_node(
     assert len(result["execution_trace"]) == 2
     
     # Verify LLM was called with search results
-    invoke_call = mock_llm_chain.invoke
+    invoke_call = mock_llm_chain.stream
     assert invoke_call.called
     call_args = invoke_call.call_args[0][0]
     assert len(call_args) == 1
@@ -71,47 +66,43 @@ def test_synthesize_research_node(
     assert "AI Overview" in prompt_content or "AI definition" in prompt_content
     
     # Verify streaming functions were called
-    assert mock_stream_trace_event.call_count >= 2  # node_call and custom trace events
-    assert mock_stream_custom_event.call_count >= 1  # research_synthesis_done
+    mock_stream_node_events.assert_called_once()  # node_call and custom trace events
+    mock_stream_custom_event.assert_any_call(
+        "research_synthesis_delta",
+        "synthesize_research",
+        {"topic": "artificial intelligence", "delta": mock_response.content},
+    )
+    assert mock_stream_custom_event.call_count >= 2  # research_synthesis_delta, research_synthesis_done
     
     # Verify log_node_state was called
     assert mock_log_node_state.call_count == 2  # BEFORE and AFTER
 
 
-@patch("polyplexity_agent.graphs.subgraphs.researcher._state_logger")
 @patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.stream_trace_event")
+@patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.stream_node_events", side_effect=fake_stream_node_events)
 @patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.create_llm_model")
-@patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.create_trace_event")
 @patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.log_node_state")
 def test_synthesize_research_node_multiple_results(
     mock_log_node_state,
-    mock_create_trace_event,
     mock_create_llm_model,
-    mock_stream_trace_event,
+    mock_stream_node_events,
     mock_stream_custom_event,
-    mock_state_logger,
 ):
     """Test synthesize_research_node with multiple search results."""
     
     mock_response = Mock()
     mock_response.content = "Comprehensive summary of all research findings..."
     mock_llm_chain = Mock()
-    mock_llm_chain.invoke.return_value = mock_response
+    mock_llm_chain.stream.return_value = iter([mock_response])
     mock_create_llm_model.return_value = mock_llm_chain
     
-    mock_create_trace_event.side_effect = [
-        {"event": "trace", "type": "node_call"},
-        {"event": "trace", "type": "custom"},
-    ]
-    
     state = {
         "topic": "quantum computing",
         "queries": ["query1", "query2", "query3"],
         "search_results": [
-            "Result 1 content",
-            "Result 2 content",
-            "Result 3 content",
+            f"--- Results for 'query{i}' ---\nTitle: [Source {i}](https://example.com/{i})\n"
+            f"Content: Result {i} content describing recent progress in quantum error correction.\n\n"
+            for i in (1, 2, 3)
         ],
         "research_summary": "",
         "query_breadth": 5,
@@ -123,7 +114,7 @@ def test_synthesize_research_node_multiple_results(
     assert len(result["research_summary"]) > 0
     
     # Verify all search results were included in prompt
-    invoke_call = mock_llm_chain.invoke
+    invoke_call = mock_llm_chain.stream
     call_args = invoke_call.call_args[0][0]
     prompt_content = call_args[0].content
     assert "Result 1" in prompt_content
@@ -131,19 +122,17 @@ def test_synthesize_research_node_multiple_results(
     assert "Result 3" in prompt_content
 
 
-@patch("polyplexity_agent.graphs.subgraphs.researcher._state_logger")
 @patch("polyplexity_agent.streaming.stream_writer.get_stream_writer")
 @patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.stream_trace_event")
+@patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.stream_node_events", side_effect=fake_stream_node_events)
 @patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.create_llm_model")
 @patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.log_node_state")
 def test_synthesize_research_node_error_handling(
     mock_log_node_state,
     mock_create_llm_model,
-    mock_stream_trace_event,
+    mock_stream_node_events,
     mock_stream_custom_event,
     mock_get_stream_writer,
-    mock_state_logger,
     sample_state,
 ):
     """Test synthesize_research_node handles errors gracefully."""
@@ -161,43 +150,83 @@ def test_synthesize_research_node_error_handling(
     assert len(error_calls) >= 1
 
 
-@patch("polyplexity_agent.graphs.subgraphs.researcher._state_logger")
 @patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.stream_trace_event")
+@patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.stream_node_events", side_effect=fake_stream_node_events)
 @patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.create_llm_model")
-@patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.create_trace_event")
 @patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.log_node_state")
 def test_synthesize_research_node_empty_results(
     mock_log_node_state,
-    mock_create_trace_event,
     mock_create_llm_model,
-    mock_stream_trace_event,
+    mock_stream_node_events,
     mock_stream_custom_event,
-    mock_state_logger,
 ):
-    """Test synthesize_research_node handles empty search results."""
-    
-    mock_response = Mock()
-    mock_response.content = "No results found."
-    mock_llm_chain = Mock()
-    mock_llm_chain.invoke.return_value = mock_response
-    mock_create_llm_model.return_value = mock_llm_chain
-    
-    mock_create_trace_event.side_effect = [
-        {"event": "trace", "type": "node_call"},
-        {"event": "trace", "type": "custom"},
-    ]
-    
+    """Test synthesize_research_node skips the LLM when the searches found nothing."""
     state = {
         "topic": "test topic",
-        "queries": [],
-        "search_results": [],
+        "queries": ["q1", "q2"],
+        "search_results": ["--- Results for 'q1' ---\n", "--- Results for 'q2' ---\n"],
         "research_summary": "",
         "query_breadth": 3,
     }
     
     result = synthesize_research_node(state)
     
-    assert "research_summary" in result
-    # Even with empty results, LLM should be called and return a summary
-    assert mock_create_llm_model.called
+    assert result["research_summary"] == "No search results were found for test topic."
+    assert len(result["execution_trace"]) == 2
+    mock_create_llm_model.assert_not_called()
+
+
+@patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.stream_custom_event")
+@patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.stream_node_events", side_effect=fake_stream_node_events)
+@patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.create_llm_model")
+@patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.log_node_state")
+def test_synthesize_research_node_uses_small_results_directly(
+    mock_log_node_state,
+    mock_create_llm_model,
+    mock_stream_node_events,
+    mock_stream_custom_event,
+):
+    """Test results below synthesis_min_chars become the summary without an LLM call."""
+    block = "--- Results for 'q' ---\nTitle: [Note](https://example.com)\nContent: Short fact.\n\n"
+    state = {"topic": "test topic", "queries": ["q"], "search_results": [block], "research_summary": "", "query_breadth": 3}
+    
+    result = synthesize_research_node(state)
+    
+    assert result["research_summary"] == block
+    mock_create_llm_model.assert_not_called()
+    mock_stream_custom_event.assert_any_call(
+        "research_synthesis_delta", "synthesize_research", {"topic": "test topic", "delta": block}
+    )
+
+
+@pytest.mark.asyncio
+@patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.stream_custom_event")
+@patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.stream_node_events", side_effect=fake_stream_node_events)
+@patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.create_llm_model")
+@patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.log_node_state")
+async def test_asynthesize_research_node(
+    mock_log_node_state,
+    mock_create_llm_model,
+    mock_stream_node_events,
+    mock_stream_custom_event,
+    sample_state,
+):
+    """Test asynthesize_research_node awaits the LLM call."""
+    mock_llm = mock_create_llm_model.return_value
+    
+    async def mock_astream(messages):
+        for content in ["AI ", "", "summary"]:
+            yield Mock(content=content)
+    
+    mock_llm.astream = mock_astream
+    
+    result = await asynthesize_research_node(sample_state)
+    
+    assert result["research_summary"] == "AI summary"
+    deltas = [
+        call[0][2]["delta"] for call in mock_stream_custom_event.call_args_list
+        if call[0][0] == "research_synthesis_delta"
+    ]
+    assert deltas == ["AI ", "summary"]
+    mock_llm.stream.assert_not_called()
+
@@ -5,8 +5,17 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from polyplexity_agent.graphs.nodes.supervisor.call_researcher import call_researcher_node
+from polyplexity_agent.graphs.nodes.supervisor.call_researcher import acall_researcher_node, call_researcher_node
 from polyplexity_agent.graphs.state import SupervisorState
+from polyplexity_agent.utils.research_cache import clear_research_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_research_cache():
+    """Start every test with an empty research cache."""
+    clear_research_cache()
+    yield
+    clear_research_cache()
 
 
 @pytest.fixture
@@ -22,24 +31,22 @@ def sample_state():
 
 
 @patch("polyplexity_agent.orchestrator._state_logger")
-@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.stream_trace_event")
-@patch("langgraph.config.get_stream_writer")
+@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.stream_node_events")
+@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.get_stream_writer")
 @patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.researcher_graph")
-@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.create_trace_event")
 @patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.log_node_state")
 def test_call_researcher_node(
     mock_log_node_state,
-    mock_create_trace_event,
     mock_researcher_graph,
     mock_get_stream_writer,
-    mock_stream_trace_event,
+    mock_stream_node_events,
     mock_state_logger,
     sample_state,
 ):
     """Test call_researcher_node invokes researcher subgraph."""
     mock_writer = Mock()
     mock_get_stream_writer.return_value = mock_writer
-    mock_create_trace_event.return_value = {"event": "trace", "type": "node_call"}
+    mock_stream_node_events.return_value = [{"event": "trace", "type": "node_call"}]
     
     # Mock researcher_graph.stream to yield custom and values
     def mock_stream(input_state, stream_mode):
@@ -53,29 +60,28 @@ def test_call_researcher_node(
     assert "research_notes" in result
     assert len(result["research_notes"]) == 1
     assert "AI research" in result["research_notes"][0]
-    assert "execution_trace" in result
+    assert result["notes_context"] == "\n\n" + result["research_notes"][0]
+    assert result["execution_trace"] == [{"event": "trace", "type": "node_call"}]
     mock_writer.assert_called()
 
 
 @patch("polyplexity_agent.orchestrator._state_logger")
-@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.stream_trace_event")
-@patch("langgraph.config.get_stream_writer")
+@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.stream_node_events")
+@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.get_stream_writer")
 @patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.researcher_graph")
-@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.create_trace_event")
 @patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.log_node_state")
 def test_call_researcher_node_url_deduplication(
     mock_log_node_state,
-    mock_create_trace_event,
     mock_researcher_graph,
     mock_get_stream_writer,
-    mock_stream_trace_event,
+    mock_stream_node_events,
     mock_state_logger,
     sample_state,
 ):
     """Test call_researcher_node deduplicates web_search_url events."""
     mock_writer = Mock()
     mock_get_stream_writer.return_value = mock_writer
-    mock_create_trace_event.return_value = {"event": "trace", "type": "node_call"}
+    mock_stream_node_events.return_value = [{"event": "trace", "type": "node_call"}]
     
     def mock_stream(input_state, stream_mode):
         yield ("custom", [{"event": "web_search_url", "url": "https://example.com"}])
@@ -92,24 +98,22 @@ def test_call_researcher_node_url_deduplication(
 
 
 @patch("polyplexity_agent.orchestrator._state_logger")
-@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.stream_trace_event")
-@patch("langgraph.config.get_stream_writer")
+@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.stream_node_events")
+@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.get_stream_writer")
 @patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.researcher_graph")
-@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.create_trace_event")
 @patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.log_node_state")
 def test_call_researcher_node_breadth_concise(
     mock_log_node_state,
-    mock_create_trace_event,
     mock_researcher_graph,
     mock_get_stream_writer,
-    mock_stream_trace_event,
+    mock_stream_node_events,
     mock_state_logger,
     sample_state,
 ):
     """Test call_researcher_node uses correct breadth for concise format."""
     mock_writer = Mock()
     mock_get_stream_writer.return_value = mock_writer
-    mock_create_trace_event.return_value = {"event": "trace", "type": "node_call"}
+    mock_stream_node_events.return_value = [{"event": "trace", "type": "node_call"}]
     sample_state["answer_format"] = "concise"
     
     def mock_stream(input_state, stream_mode):
@@ -122,24 +126,22 @@ def test_call_researcher_node_breadth_concise(
 
 
 @patch("polyplexity_agent.orchestrator._state_logger")
-@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.stream_trace_event")
-@patch("langgraph.config.get_stream_writer")
+@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.stream_node_events")
+@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.get_stream_writer")
 @patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.researcher_graph")
-@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.create_trace_event")
 @patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.log_node_state")
 def test_call_researcher_node_breadth_report(
     mock_log_node_state,
-    mock_create_trace_event,
     mock_researcher_graph,
     mock_get_stream_writer,
-    mock_stream_trace_event,
+    mock_stream_node_events,
     mock_state_logger,
     sample_state,
 ):
     """Test call_researcher_node uses correct breadth for report format."""
     mock_writer = Mock()
     mock_get_stream_writer.return_value = mock_writer
-    mock_create_trace_event.return_value = {"event": "trace", "type": "node_call"}
+    mock_stream_node_events.return_value = [{"event": "trace", "type": "node_call"}]
     sample_state["answer_format"] = "report"
     
     def mock_stream(input_state, stream_mode):
@@ -149,3 +151,66 @@ def test_call_researcher_node_breadth_report(
     mock_researcher_graph.stream = mock_stream
     
     call_researcher_node(sample_state)
+
+
+@pytest.mark.asyncio
+@patch("polyplexity_agent.orchestrator._state_logger")
+@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.stream_node_events")
+@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.get_stream_writer")
+@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.researcher_graph")
+@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.log_node_state")
+async def test_acall_researcher_node(
+    mock_log_node_state,
+    mock_researcher_graph,
+    mock_get_stream_writer,
+    mock_stream_node_events,
+    mock_state_logger,
+    sample_state,
+):
+    """Test acall_researcher_node consumes the researcher subgraph via astream."""
+    mock_writer = Mock()
+    mock_get_stream_writer.return_value = mock_writer
+    mock_stream_node_events.return_value = [{"event": "trace", "type": "node_call"}]
+    
+    async def mock_astream(input_state, stream_mode):
+        assert input_state["topic"] == "AI research"
+        yield ("custom", [{"event": "web_search_url", "url": "https://example.com"}])
+        yield ("custom", [{"event": "web_search_url", "url": "https://example.com"}])
+        yield ("values", {"research_summary": "AI is advancing rapidly"})
+    
+    mock_researcher_graph.astream = mock_astream
+    
+    result = await acall_researcher_node(sample_state)
+    
+    assert result["research_notes"] == ["## Research on: AI research\nAI is advancing rapidly"]
+    assert mock_writer.call_count == 1
+
+
+@patch("polyplexity_agent.orchestrator._state_logger")
+@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.stream_node_events")
+@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.get_stream_writer")
+@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.researcher_graph")
+@patch("polyplexity_agent.graphs.nodes.supervisor.call_researcher.log_node_state")
+def test_call_researcher_node_reuses_cached_research(
+    mock_log_node_state,
+    mock_researcher_graph,
+    mock_get_stream_writer,
+    mock_stream_node_events,
+    mock_state_logger,
+    sample_state,
+):
+    """Test a topic researched earlier the same day skips the researcher subgraph."""
+    mock_stream_node_events.return_value = [{"event": "trace", "type": "node_call"}]
+    mock_researcher_graph.stream.return_value = iter([("values", {"research_summary": "AI is advancing rapidly"})])
+    sample_state["_current_date"] = "01 02 25"
+    
+    first = call_researcher_node(sample_state)
+    second = call_researcher_node(sample_state)
+    sample_state["_current_date"] = "01 03 25"
+    mock_researcher_graph.stream.return_value = iter([("values", {"research_summary": "Newer findings"})])
+    next_day = call_researcher_node(sample_state)
+    
+    assert second["research_notes"] == first["research_notes"]
+    assert "Newer findings" in next_day["research_notes"][0]
+    assert mock_researcher_graph.stream.call_count == 2
+
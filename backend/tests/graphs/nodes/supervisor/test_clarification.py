@@ -22,22 +22,18 @@ def sample_state():
 
 
 @patch("polyplexity_agent.orchestrator._state_logger")
-@patch("polyplexity_agent.graphs.nodes.supervisor.clarification.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.supervisor.clarification.stream_trace_event")
-@patch("polyplexity_agent.graphs.nodes.supervisor.clarification.create_trace_event")
+@patch("polyplexity_agent.graphs.nodes.supervisor.clarification.stream_node_events")
 @patch("polyplexity_agent.graphs.nodes.supervisor.clarification.save_messages_and_trace")
 @patch("polyplexity_agent.graphs.nodes.supervisor.clarification.log_node_state")
 def test_clarification_node(
     mock_log_node_state,
     mock_save_messages,
-    mock_create_trace_event,
-    mock_stream_trace_event,
-    mock_stream_custom_event,
+    mock_stream_node_events,
     mock_state_logger,
     sample_state,
 ):
     """Test clarification_node generates clarification question."""
-    mock_create_trace_event.return_value = {"event": "trace", "type": "node_call"}
+    mock_stream_node_events.return_value = [{"event": "trace", "type": "node_call"}]
     
     result = clarification_node(sample_state)
     
@@ -45,28 +41,27 @@ def test_clarification_node(
     assert "What location" in result["final_report"]
     assert result["next_topic"] == "FINISH"
     assert "conversation_history" in result
-    # Verify streaming functions were called
-    mock_stream_trace_event.assert_called_once()
-    mock_stream_custom_event.assert_called_once()
+    assert result["execution_trace"] == [{"event": "trace", "type": "node_call"}]
+    # node_call trace and final_report_complete go out in one stream write
+    mock_stream_node_events.assert_called_once()
+    assert mock_stream_node_events.call_args.kwargs["custom_events"] == [
+        ("final_report_complete", {"report": "What location are you interested in?"})
+    ]
 
 
 @patch("polyplexity_agent.orchestrator._state_logger")
-@patch("polyplexity_agent.graphs.nodes.supervisor.clarification.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.supervisor.clarification.stream_trace_event")
-@patch("polyplexity_agent.graphs.nodes.supervisor.clarification.create_trace_event")
+@patch("polyplexity_agent.graphs.nodes.supervisor.clarification.stream_node_events")
 @patch("polyplexity_agent.graphs.nodes.supervisor.clarification.save_messages_and_trace")
 @patch("polyplexity_agent.graphs.nodes.supervisor.clarification.log_node_state")
 def test_clarification_node_default_question(
     mock_log_node_state,
     mock_save_messages,
-    mock_create_trace_event,
-    mock_stream_trace_event,
-    mock_stream_custom_event,
+    mock_stream_node_events,
     mock_state_logger,
     sample_state,
 ):
     """Test clarification_node uses default question when no CLARIFY prefix."""
-    mock_create_trace_event.return_value = {"event": "trace", "type": "node_call"}
+    mock_stream_node_events.return_value = [{"event": "trace", "type": "node_call"}]
     sample_state["next_topic"] = "FINISH"
     
     result = clarification_node(sample_state)
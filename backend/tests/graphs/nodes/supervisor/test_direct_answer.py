@@ -1,12 +1,13 @@
 """
 Tests for direct_answer node.
 """
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
 
-from polyplexity_agent.graphs.nodes.supervisor.direct_answer import direct_answer_node
+from polyplexity_agent.graphs.nodes.supervisor.direct_answer import adirect_answer_node, direct_answer_node
 from polyplexity_agent.graphs.state import SupervisorState
+from polyplexity_agent.utils.helpers import wait_for_background_tasks
 
 
 @pytest.fixture
@@ -22,19 +23,15 @@ def sample_state():
 
 
 @patch("polyplexity_agent.orchestrator._state_logger")
-@patch("polyplexity_agent.graphs.nodes.supervisor.direct_answer.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.supervisor.direct_answer.stream_trace_event")
+@patch("polyplexity_agent.graphs.nodes.supervisor.direct_answer.stream_node_events")
 @patch("polyplexity_agent.graphs.nodes.supervisor.direct_answer.create_llm_model")
-@patch("polyplexity_agent.graphs.nodes.supervisor.direct_answer.create_trace_event")
 @patch("polyplexity_agent.graphs.nodes.supervisor.direct_answer.save_messages_and_trace")
 @patch("polyplexity_agent.graphs.nodes.supervisor.direct_answer.log_node_state")
 def test_direct_answer_node(
     mock_log_node_state,
     mock_save_messages,
-    mock_create_trace_event,
     mock_create_llm_model,
-    mock_stream_trace_event,
-    mock_stream_custom_event,
+    mock_stream_node_events,
     mock_state_logger,
     sample_state,
 ):
@@ -42,9 +39,9 @@ def test_direct_answer_node(
     mock_llm = Mock()
     mock_llm.invoke.return_value.content = "The answer is 4"
     mock_create_llm_model.return_value = mock_llm
-    mock_create_trace_event.side_effect = [
-        {"event": "trace", "type": "node_call"},
-        {"event": "trace", "type": "custom"},
+    mock_stream_node_events.side_effect = [
+        [{"event": "trace", "type": "node_call"}],
+        [{"event": "trace", "type": "custom"}],
     ]
     
     result = direct_answer_node(sample_state)
@@ -54,25 +51,27 @@ def test_direct_answer_node(
     assert result["next_topic"] == "FINISH"
     assert result["current_report_version"] == 1
     assert "conversation_history" in result
-    # Verify streaming functions were called
-    assert mock_stream_trace_event.call_count >= 2  # node_call and custom trace
-    mock_stream_custom_event.assert_called_once()  # final_report_complete
+    assert result["execution_trace"] == [
+        {"event": "trace", "type": "node_call"},
+        {"event": "trace", "type": "custom"},
+    ]
+    # node_call, then the completion trace and final_report_complete in one stream write
+    assert mock_stream_node_events.call_count == 2
+    assert mock_stream_node_events.call_args_list[1].kwargs["custom_events"] == [
+        ("final_report_complete", {"report": "The answer is 4"})
+    ]
 
 
 @patch("polyplexity_agent.orchestrator._state_logger")
-@patch("polyplexity_agent.graphs.nodes.supervisor.direct_answer.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.supervisor.direct_answer.stream_trace_event")
+@patch("polyplexity_agent.graphs.nodes.supervisor.direct_answer.stream_node_events")
 @patch("polyplexity_agent.graphs.nodes.supervisor.direct_answer.create_llm_model")
-@patch("polyplexity_agent.graphs.nodes.supervisor.direct_answer.create_trace_event")
 @patch("polyplexity_agent.graphs.nodes.supervisor.direct_answer.save_messages_and_trace")
 @patch("polyplexity_agent.graphs.nodes.supervisor.direct_answer.log_node_state")
 def test_direct_answer_node_saves_trace(
     mock_log_node_state,
     mock_save_messages,
-    mock_create_trace_event,
     mock_create_llm_model,
-    mock_stream_trace_event,
-    mock_stream_custom_event,
+    mock_stream_node_events,
     mock_state_logger,
     sample_state,
 ):
@@ -80,11 +79,42 @@ def test_direct_answer_node_saves_trace(
     mock_llm = Mock()
     mock_llm.invoke.return_value.content = "Answer"
     mock_create_llm_model.return_value = mock_llm
-    mock_create_trace_event.side_effect = [
-        {"event": "trace", "type": "node_call"},
-        {"event": "trace", "type": "custom"},
+    mock_stream_node_events.side_effect = [
+        [{"event": "trace", "type": "node_call"}],
+        [{"event": "trace", "type": "custom"}],
     ]
     
     direct_answer_node(sample_state)
     
+    wait_for_background_tasks()
+    mock_save_messages.assert_called_once()
+
+
+@pytest.mark.asyncio
+@patch("polyplexity_agent.orchestrator._state_logger")
+@patch("polyplexity_agent.graphs.nodes.supervisor.direct_answer.stream_node_events")
+@patch("polyplexity_agent.graphs.nodes.supervisor.direct_answer.create_llm_model")
+@patch("polyplexity_agent.graphs.nodes.supervisor.direct_answer.save_messages_and_trace")
+@patch("polyplexity_agent.graphs.nodes.supervisor.direct_answer.log_node_state")
+async def test_adirect_answer_node(
+    mock_log_node_state,
+    mock_save_messages,
+    mock_create_llm_model,
+    mock_stream_node_events,
+    mock_state_logger,
+    sample_state,
+):
+    """Test adirect_answer_node awaits the model and saves the exchange."""
+    mock_llm = Mock()
+    mock_llm.ainvoke = AsyncMock(return_value=Mock(content="The answer is 4"))
+    mock_create_llm_model.return_value = mock_llm
+    mock_stream_node_events.return_value = [{"event": "trace", "type": "node_call"}]
+    
+    result = await adirect_answer_node(sample_state)
+    
+    assert result["final_report"] == "The answer is 4"
+    assert result["next_topic"] == "FINISH"
+    mock_llm.ainvoke.assert_awaited_once()
+    mock_llm.invoke.assert_not_called()
+    wait_for_background_tasks()
     mock_save_messages.assert_called_once()
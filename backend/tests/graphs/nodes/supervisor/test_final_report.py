@@ -5,8 +5,13 @@ from unittest.mock import Mock, patch
 
 import pytest
 
-from polyplexity_agent.graphs.nodes.supervisor.final_report import final_report_node
+from polyplexity_agent.graphs.nodes.supervisor.final_report import (
+    _build_final_report_prompt,
+    afinal_report_node,
+    final_report_node,
+)
 from polyplexity_agent.graphs.state import SupervisorState
+from polyplexity_agent.utils.helpers import wait_for_background_tasks
 
 
 @pytest.fixture
@@ -24,28 +29,26 @@ def sample_state():
 
 @patch("polyplexity_agent.orchestrator._state_logger")
 @patch("polyplexity_agent.graphs.nodes.supervisor.final_report.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.supervisor.final_report.stream_trace_event")
+@patch("polyplexity_agent.graphs.nodes.supervisor.final_report.stream_node_events")
 @patch("polyplexity_agent.graphs.nodes.supervisor.final_report.create_llm_model")
-@patch("polyplexity_agent.graphs.nodes.supervisor.final_report.create_trace_event")
 @patch("polyplexity_agent.graphs.nodes.supervisor.final_report.save_messages_and_trace")
 @patch("polyplexity_agent.graphs.nodes.supervisor.final_report.log_node_state")
 def test_final_report_node(
     mock_log_node_state,
     mock_save_messages,
-    mock_create_trace_event,
     mock_create_llm_model,
-    mock_stream_trace_event,
+    mock_stream_node_events,
     mock_stream_custom_event,
     mock_state_logger,
     sample_state,
 ):
     """Test final_report_node generates report."""
     mock_llm = Mock()
-    mock_llm.invoke.return_value.content = "Final report on AI"
+    mock_llm.stream.return_value = iter([Mock(content="Final report"), Mock(content=""), Mock(content=" on AI")])
     mock_create_llm_model.return_value = mock_llm
-    mock_create_trace_event.side_effect = [
-        {"event": "trace", "type": "node_call"},
-        {"event": "trace", "type": "custom"},
+    mock_stream_node_events.side_effect = [
+        [{"event": "trace", "type": "node_call"}],
+        [{"event": "trace", "type": "custom"}],
     ]
     
     result = final_report_node(sample_state)
@@ -54,35 +57,42 @@ def test_final_report_node(
     assert result["final_report"] == "Final report on AI"
     assert result["current_report_version"] == 1
     assert "conversation_history" in result
-    # Verify streaming functions were called
-    assert mock_stream_trace_event.call_count >= 2  # node_call and custom trace
-    assert mock_stream_custom_event.call_count >= 2  # writing_report and final_report_complete
+    assert result["execution_trace"] == [
+        {"event": "trace", "type": "node_call"},
+        {"event": "trace", "type": "custom"},
+    ]
+    # node_call/writing_report and the completion events are each one stream write
+    assert mock_stream_node_events.call_count == 2
+    assert mock_stream_node_events.call_args_list[1].kwargs["custom_events"] == [
+        ("final_report_complete", {"report": "Final report on AI"})
+    ]
+    mock_llm.invoke.assert_not_called()
+    deltas = [c.args[2]["delta"] for c in mock_stream_custom_event.call_args_list if c.args[0] == "final_report_delta"]
+    assert deltas == ["Final report", " on AI"]
 
 
 @patch("polyplexity_agent.orchestrator._state_logger")
 @patch("polyplexity_agent.graphs.nodes.supervisor.final_report.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.supervisor.final_report.stream_trace_event")
+@patch("polyplexity_agent.graphs.nodes.supervisor.final_report.stream_node_events")
 @patch("polyplexity_agent.graphs.nodes.supervisor.final_report.create_llm_model")
-@patch("polyplexity_agent.graphs.nodes.supervisor.final_report.create_trace_event")
 @patch("polyplexity_agent.graphs.nodes.supervisor.final_report.save_messages_and_trace")
 @patch("polyplexity_agent.graphs.nodes.supervisor.final_report.log_node_state")
 def test_final_report_node_refinement(
     mock_log_node_state,
     mock_save_messages,
-    mock_create_trace_event,
     mock_create_llm_model,
-    mock_stream_trace_event,
+    mock_stream_node_events,
     mock_stream_custom_event,
     mock_state_logger,
     sample_state,
 ):
     """Test final_report_node handles report refinement."""
     mock_llm = Mock()
-    mock_llm.invoke.return_value.content = "Refined report"
+    mock_llm.stream.return_value = iter([Mock(content="Refined report")])
     mock_create_llm_model.return_value = mock_llm
-    mock_create_trace_event.side_effect = [
-        {"event": "trace", "type": "node_call"},
-        {"event": "trace", "type": "custom"},
+    mock_stream_node_events.side_effect = [
+        [{"event": "trace", "type": "node_call"}],
+        [{"event": "trace", "type": "custom"}],
     ]
     sample_state["final_report"] = "Original report"
     sample_state["current_report_version"] = 1
@@ -91,37 +101,86 @@ def test_final_report_node_refinement(
     
     assert result["current_report_version"] == 2
     # Verify refinement prompt was used (check LLM was called)
-    mock_create_llm_model.return_value.invoke.assert_called_once()
+    mock_create_llm_model.return_value.stream.assert_called_once()
 
 
 @patch("polyplexity_agent.orchestrator._state_logger")
 @patch("polyplexity_agent.graphs.nodes.supervisor.final_report.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.supervisor.final_report.stream_trace_event")
+@patch("polyplexity_agent.graphs.nodes.supervisor.final_report.stream_node_events")
 @patch("polyplexity_agent.graphs.nodes.supervisor.final_report.create_llm_model")
-@patch("polyplexity_agent.graphs.nodes.supervisor.final_report.create_trace_event")
 @patch("polyplexity_agent.graphs.nodes.supervisor.final_report.save_messages_and_trace")
 @patch("polyplexity_agent.graphs.nodes.supervisor.final_report.log_node_state")
 def test_final_report_node_report_format(
     mock_log_node_state,
     mock_save_messages,
-    mock_create_trace_event,
     mock_create_llm_model,
-    mock_stream_trace_event,
+    mock_stream_node_events,
     mock_stream_custom_event,
     mock_state_logger,
     sample_state,
 ):
     """Test final_report_node uses report format instructions."""
     mock_llm = Mock()
-    mock_llm.invoke.return_value.content = "Report"
+    mock_llm.stream.return_value = iter([Mock(content="Report")])
     mock_create_llm_model.return_value = mock_llm
-    mock_create_trace_event.side_effect = [
-        {"event": "trace", "type": "node_call"},
-        {"event": "trace", "type": "custom"},
+    mock_stream_node_events.side_effect = [
+        [{"event": "trace", "type": "node_call"}],
+        [{"event": "trace", "type": "custom"}],
     ]
     sample_state["answer_format"] = "report"
     
     final_report_node(sample_state)
     
     # Verify LLM was called (format instructions would be different)
-    mock_create_llm_model.return_value.invoke.assert_called_once()
+    mock_create_llm_model.return_value.stream.assert_called_once()
+
+
+@pytest.mark.asyncio
+@patch("polyplexity_agent.orchestrator._state_logger")
+@patch("polyplexity_agent.graphs.nodes.supervisor.final_report.stream_custom_event")
+@patch("polyplexity_agent.graphs.nodes.supervisor.final_report.stream_node_events")
+@patch("polyplexity_agent.graphs.nodes.supervisor.final_report.create_llm_model")
+@patch("polyplexity_agent.graphs.nodes.supervisor.final_report.save_messages_and_trace")
+@patch("polyplexity_agent.graphs.nodes.supervisor.final_report.log_node_state")
+async def test_afinal_report_node(
+    mock_log_node_state,
+    mock_save_messages,
+    mock_create_llm_model,
+    mock_stream_node_events,
+    mock_stream_custom_event,
+    mock_state_logger,
+    sample_state,
+):
+    """Test afinal_report_node streams the report deltas and saves the exchange."""
+    async def mock_astream(messages):
+        for content in ["Final report", "", " on AI"]:
+            yield Mock(content=content)
+    
+    mock_llm = Mock()
+    mock_llm.astream = mock_astream
+    mock_create_llm_model.return_value = mock_llm
+    mock_stream_node_events.return_value = [{"event": "trace", "type": "node_call"}]
+    
+    result = await afinal_report_node(sample_state)
+    
+    assert result["final_report"] == "Final report on AI"
+    assert result["current_report_version"] == 1
+    mock_llm.invoke.assert_not_called()
+    deltas = [c.args[2]["delta"] for c in mock_stream_custom_event.call_args_list if c.args[0] == "final_report_delta"]
+    assert deltas == ["Final report", " on AI"]
+    wait_for_background_tasks()
+    mock_save_messages.assert_called_once()
+
+
+@patch("polyplexity_agent.graphs.nodes.supervisor.final_report.settings")
+def test_final_report_prompt_condenses_notes_over_limit(mock_settings, sample_state):
+    """Test the report prompt condenses older notes once they exceed the size limit."""
+    mock_settings.final_report_notes_max_chars = 100
+    mock_settings.supervisor_note_digest_chars = 10
+    sample_state["research_notes"] = ["## Research on: A\n" + "a" * 200, "## Research on: B\nlatest"]
+    
+    prompt = _build_final_report_prompt(sample_state)
+    
+    assert "## Research on: A\naaaaaaaaaa..." in prompt
+    assert "a" * 11 not in prompt
+    assert "## Research on: B\nlatest" in prompt
@@ -43,6 +43,18 @@ def test_manage_chat_history_limit():
     
     assert len(result) == 50
     assert result[-1]["content"] == "New message"
+    assert result[0]["content"] == "Message 1"
+
+
+def test_manage_chat_history_limit_with_large_update():
+    """Test an update larger than the limit keeps only its own newest messages."""
+    current = [{"role": "user", "content": "Old"}]
+    new = [{"role": "user", "content": f"Message {i}"} for i in range(60)]
+    
+    result = manage_chat_history(current, new)
+    
+    assert len(result) == 50
+    assert result[0]["content"] == "Message 10"
 
 
 @pytest.fixture
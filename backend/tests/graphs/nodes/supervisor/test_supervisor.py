@@ -1,13 +1,31 @@
 """
 Tests for supervisor node.
 """
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import AsyncMock, MagicMock, Mock, call, patch
 
 import pytest
 
-from polyplexity_agent.graphs.nodes.supervisor.supervisor import supervisor_node
+from polyplexity_agent.graphs.nodes.supervisor.supervisor import (
+    _build_supervisor_prompts,
+    _effective_next_step,
+    _named_threads,
+    _save_thread_name,
+    _thread_needing_name,
+    asupervisor_node,
+    supervisor_node,
+)
 from polyplexity_agent.graphs.state import SupervisorState
 from polyplexity_agent.models import SupervisorDecision
+from polyplexity_agent.prompts.supervisor import SUPERVISOR_THREAD_NAME_REQUEST
+from polyplexity_agent.utils.helpers import wait_for_background_tasks
+
+
+@pytest.fixture(autouse=True)
+def no_named_threads():
+    """Start every test without any thread remembered as named."""
+    _named_threads.clear()
+    yield
+    _named_threads.clear()
 
 
 @pytest.fixture
@@ -37,48 +55,93 @@ def mock_decision():
 
 
 @patch("polyplexity_agent.orchestrator._state_logger")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_node_events")
 @patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_trace_event")
-@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor._make_supervisor_decision")
-@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.create_trace_event")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.create_llm_model")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.invoke_structured")
 @patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.log_node_state")
 def test_supervisor_node_research_decision(
     mock_log_node_state,
-    mock_create_trace_event,
-    mock_make_decision,
-    mock_stream_trace_event,
+    mock_invoke_structured,
+    mock_create_llm_model,
     mock_stream_custom_event,
+    mock_stream_node_events,
     mock_state_logger,
     sample_state,
     mock_decision,
 ):
     """Test supervisor node with research decision."""
-    mock_make_decision.return_value = mock_decision
-    mock_create_trace_event.return_value = {"event": "trace", "type": "node_call"}
+    mock_invoke_structured.return_value = mock_decision
+    mock_stream_node_events.side_effect = [
+        [{"event": "trace", "type": "node_call"}],
+        [{"event": "trace", "type": "reasoning"}],
+    ]
     
     result = supervisor_node(sample_state)
     
     assert "next_topic" in result
     assert result["next_topic"] == "weather information"
     assert result["iterations"] == 1
-    assert "execution_trace" in result
-    # Verify streaming functions were called
-    assert mock_stream_trace_event.call_count >= 2  # node_call and reasoning
-    mock_stream_custom_event.assert_called_once()  # supervisor_decision
+    assert result["execution_trace"] == [
+        {"event": "trace", "type": "node_call"},
+        {"event": "trace", "type": "reasoning"},
+    ]
+    # node_call streams up front; reasoning and the decision share one write
+    mock_stream_custom_event.assert_not_called()
+    assert mock_stream_node_events.call_count == 2
+    assert mock_stream_node_events.call_args_list[0] == call("supervisor", traces=[("node_call", {})])
+    assert mock_stream_node_events.call_args_list[1] == call(
+        "supervisor",
+        traces=[("reasoning", {"reasoning": "Need to research weather"})],
+        custom_events=[("supervisor_decision", {
+            "decision": "research",
+            "reasoning": "Need to research weather",
+            "topic": "weather information",
+        })],
+    )
 
 
 @patch("polyplexity_agent.orchestrator._state_logger")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_node_events", return_value=[])
 @patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_trace_event")
-@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor._make_supervisor_decision")
-@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.create_trace_event")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.create_llm_model")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.invoke_structured")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.log_node_state")
+def test_supervisor_node_parallel_research_topics(
+    mock_log_node_state,
+    mock_invoke_structured,
+    mock_create_llm_model,
+    mock_stream_custom_event,
+    mock_stream_node_events,
+    mock_state_logger,
+    sample_state,
+):
+    """Test supervisor node de-duplicates and caps parallel research topics."""
+    mock_invoke_structured.return_value = SupervisorDecision(
+        next_step="research",
+        research_topic="AI chips",
+        research_topics=["ai chips", "AI regulation", "", "AI funding", "AI talent"],
+        reasoning="Independent subjects",
+    )
+    
+    result = supervisor_node(sample_state)
+    
+    assert result["next_topic"] == "AI chips"
+    assert result["research_topics"] == ["AI chips", "AI regulation", "AI funding"]
+
+
+@patch("polyplexity_agent.orchestrator._state_logger")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_node_events", return_value=[])
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_custom_event")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.create_llm_model")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.invoke_structured")
 @patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.log_node_state")
 def test_supervisor_node_finish_decision(
     mock_log_node_state,
-    mock_create_trace_event,
-    mock_make_decision,
-    mock_stream_trace_event,
+    mock_invoke_structured,
+    mock_create_llm_model,
     mock_stream_custom_event,
+    mock_stream_node_events,
     mock_state_logger,
     sample_state,
 ):
@@ -88,8 +151,7 @@ def test_supervisor_node_finish_decision(
     decision.research_topic = "done"
     decision.reasoning = "Have enough info"
     decision.answer_format = "concise"
-    mock_make_decision.return_value = decision
-    mock_create_trace_event.return_value = {"event": "trace", "type": "node_call"}
+    mock_invoke_structured.return_value = decision
     
     result = supervisor_node(sample_state)
     
@@ -98,17 +160,17 @@ def test_supervisor_node_finish_decision(
 
 
 @patch("polyplexity_agent.orchestrator._state_logger")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_node_events", return_value=[])
 @patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_trace_event")
-@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor._make_supervisor_decision")
-@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.create_trace_event")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.create_llm_model")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.invoke_structured")
 @patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.log_node_state")
 def test_supervisor_node_clarify_decision(
     mock_log_node_state,
-    mock_create_trace_event,
-    mock_make_decision,
-    mock_stream_trace_event,
+    mock_invoke_structured,
+    mock_create_llm_model,
     mock_stream_custom_event,
+    mock_stream_node_events,
     mock_state_logger,
     sample_state,
 ):
@@ -118,8 +180,7 @@ def test_supervisor_node_clarify_decision(
     decision.research_topic = "need clarification"
     decision.reasoning = "What location?"
     decision.answer_format = "concise"
-    mock_make_decision.return_value = decision
-    mock_create_trace_event.return_value = {"event": "trace", "type": "node_call"}
+    mock_invoke_structured.return_value = decision
     
     result = supervisor_node(sample_state)
     
@@ -128,53 +189,244 @@ def test_supervisor_node_clarify_decision(
 
 
 @patch("polyplexity_agent.orchestrator._state_logger")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_node_events", return_value=[])
 @patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_trace_event")
-@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor._handle_thread_name_generation")
-@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.create_trace_event")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor._save_thread_name")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor._thread_needing_name")
 @patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.log_node_state")
-@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor._make_supervisor_decision")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.create_llm_model")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.invoke_structured")
 def test_supervisor_node_thread_name_generation(
-    mock_make_decision,
+    mock_invoke_structured,
+    mock_create_llm_model,
     mock_log_node_state,
-    mock_create_trace_event,
-    mock_handle_thread_name,
-    mock_stream_trace_event,
+    mock_thread_needing_name,
+    mock_save_thread_name,
     mock_stream_custom_event,
+    mock_stream_node_events,
     mock_state_logger,
     sample_state,
     mock_decision,
 ):
-    """Test supervisor node generates thread name on first iteration."""
-    mock_make_decision.return_value = mock_decision
-    mock_create_trace_event.return_value = {"event": "trace", "type": "node_call"}
+    """Test supervisor node names a new thread from the first decision call."""
+    mock_invoke_structured.return_value = mock_decision
+    mock_thread_needing_name.return_value = "test_thread"
     sample_state["_thread_id"] = "test_thread"
+    sample_state["user_request"] = "What will the weather be like in Paris tomorrow?"
     
     supervisor_node(sample_state)
     
-    mock_handle_thread_name.assert_called_once()
+    _, _, (_, user_msg) = mock_invoke_structured.call_args.args
+    assert user_msg.content.endswith(SUPERVISOR_THREAD_NAME_REQUEST)
+    mock_save_thread_name.assert_called_once_with(sample_state, "test_thread", mock_decision)
+
+
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.get_database_manager")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_custom_event")
+def test_save_thread_name_uses_short_request(mock_stream_custom_event, mock_get_db_manager, sample_state):
+    """Test a request of five words or fewer is used as the thread name as-is."""
+    decision = SupervisorDecision(next_step="research", research_topic="weather", reasoning="why", thread_name="Weather Today")
+    
+    _save_thread_name(sample_state, "test_thread", decision)
+    wait_for_background_tasks()
+    
+    mock_get_db_manager.return_value.save_thread_name.assert_called_once_with("test_thread", "What is the weather?")
+
+
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.get_database_manager")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_custom_event")
+def test_save_thread_name_uses_decision_title(mock_stream_custom_event, mock_get_db_manager, sample_state):
+    """Test the thread name from the decision is cleaned up, saved and streamed."""
+    sample_state["user_request"] = "What will the weather be like in Paris tomorrow?"
+    decision = SupervisorDecision(next_step="research", research_topic="weather", reasoning="why", thread_name='"Weather Today"')
+    
+    _save_thread_name(sample_state, "test_thread", decision)
+    wait_for_background_tasks()
+    
+    mock_get_db_manager.return_value.save_thread_name.assert_called_once_with("test_thread", "Weather Today")
+    mock_stream_custom_event.assert_called_once_with("thread_name", "supervisor", {"thread_id": "test_thread", "name": "Weather Today"})
+
+
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.get_database_manager")
+def test_thread_needing_name_remembers_named_threads(mock_get_db_manager, sample_state):
+    """Test a thread found to be named is not looked up again."""
+    existing_thread = Mock()
+    existing_thread.name = "Weather"
+    mock_get_db_manager.return_value.get_thread.return_value = existing_thread
+    sample_state["_thread_id"] = "test_thread"
+    
+    assert _thread_needing_name(sample_state) is None
+    assert _thread_needing_name(sample_state) is None
+    
+    mock_get_db_manager.assert_called_once()
+
+
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.get_database_manager")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_custom_event")
+def test_save_thread_name_skips_later_lookups(mock_stream_custom_event, mock_get_db_manager, sample_state):
+    """Test a newly named thread no longer needs a name on follow-ups."""
+    mock_get_db_manager.return_value.get_thread.return_value = None
+    sample_state["_thread_id"] = "test_thread"
+    decision = SupervisorDecision(next_step="research", research_topic="weather", reasoning="why", thread_name="Weather")
+    
+    assert _thread_needing_name(sample_state) == "test_thread"
+    _save_thread_name(sample_state, "test_thread", decision)
+    wait_for_background_tasks()
+    
+    assert _thread_needing_name(sample_state) is None
+    mock_get_db_manager.return_value.get_thread.assert_called_once_with("test_thread")
 
 
 @patch("polyplexity_agent.orchestrator._state_logger")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_node_events")
 @patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_custom_event")
-@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_trace_event")
-@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.create_trace_event")
 @patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.log_node_state")
 def test_supervisor_node_max_iterations(
     mock_log_node_state,
-    mock_create_trace_event,
-    mock_stream_trace_event,
     mock_stream_custom_event,
+    mock_stream_node_events,
     mock_state_logger,
     sample_state,
 ):
     """Test supervisor node enforces max iterations limit."""
-    mock_create_trace_event.return_value = {"event": "trace", "type": "node_call"}
+    mock_stream_node_events.return_value = [{"event": "trace", "type": "node_call"}]
     sample_state["iterations"] = 10
     
     result = supervisor_node(sample_state)
     
     assert result["next_topic"] == "FINISH"
-    # Verify streaming functions were called
-    mock_stream_trace_event.assert_called_once()  # node_call
-    mock_stream_custom_event.assert_called_once()  # supervisor_log
+    assert result["execution_trace"] == [{"event": "trace", "type": "node_call"}]
+    # node_call and supervisor_log go out in one write
+    mock_stream_node_events.assert_called_once_with(
+        "supervisor",
+        traces=[("node_call", {})],
+        custom_events=[("supervisor_log", {"message": "Max iterations reached. Forcing finish."})],
+    )
+    mock_stream_custom_event.assert_not_called()
+
+
+@pytest.mark.asyncio
+@patch("polyplexity_agent.orchestrator._state_logger")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor._thread_needing_name", return_value=None)
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_node_events", return_value=[])
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_custom_event")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.create_llm_model")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.ainvoke_structured", new_callable=AsyncMock)
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.log_node_state")
+async def test_asupervisor_node_research_decision(
+    mock_log_node_state,
+    mock_ainvoke_structured,
+    mock_create_llm_model,
+    mock_stream_custom_event,
+    mock_stream_node_events,
+    mock_thread_name,
+    mock_state_logger,
+    sample_state,
+    mock_decision,
+):
+    """Test asupervisor_node awaits the decision and builds the same update."""
+    mock_ainvoke_structured.return_value = mock_decision
+    
+    result = await asupervisor_node(sample_state)
+    
+    assert result["next_topic"] == "weather information"
+    assert result["iterations"] == 1
+    mock_ainvoke_structured.assert_awaited_once()
+    _, _, (_, user_msg) = mock_ainvoke_structured.call_args.args
+    assert SUPERVISOR_THREAD_NAME_REQUEST not in user_msg.content
+    mock_thread_name.assert_called_once_with(sample_state)
+
+
+@patch("polyplexity_agent.orchestrator._state_logger")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_node_events", return_value=[])
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.log_node_state")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.create_llm_model")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.invoke_structured")
+def test_supervisor_node_feeds_back_validation_errors(
+    mock_invoke_structured,
+    mock_create_llm_model,
+    mock_log_node_state,
+    mock_stream_node_events,
+    mock_state_logger,
+    sample_state,
+):
+    """Test the decision goes through invoke_structured, which retries invalid output with feedback."""
+    mock_invoke_structured.return_value = SupervisorDecision(next_step="finish", reasoning="done")
+    
+    assert supervisor_node(sample_state)["next_topic"] == "FINISH"
+    
+    model, schema, messages = mock_invoke_structured.call_args.args
+    assert model is mock_create_llm_model.return_value
+    assert schema is SupervisorDecision
+    assert len(messages) == 2
+
+
+@patch("polyplexity_agent.orchestrator._state_logger")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.stream_node_events", return_value=[])
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.log_node_state")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.create_llm_model")
+@patch("polyplexity_agent.graphs.nodes.supervisor.supervisor.invoke_structured")
+def test_supervisor_node_reuses_cached_decision(
+    mock_invoke_structured,
+    mock_create_llm_model,
+    mock_log_node_state,
+    mock_stream_node_events,
+    mock_state_logger,
+    sample_state,
+):
+    """Test an identical supervisor prompt reuses the earlier decision."""
+    mock_invoke_structured.return_value = SupervisorDecision(next_step="finish", reasoning="done")
+    
+    supervisor_node(sample_state)
+    result = supervisor_node(sample_state)
+    
+    assert result["next_topic"] == "FINISH"
+    mock_invoke_structured.assert_called_once()
+
+
+def test_supervisor_decision_bounds_each_research_topic():
+    """Test parallel research topics share the length limit of research_topic."""
+    with pytest.raises(ValueError):
+        SupervisorDecision(next_step="research", reasoning="why", research_topics=["a" * 513])
+
+
+def test_build_supervisor_prompts_keeps_system_prompt_static(sample_state):
+    """Test the system prompt is invariant across iterations and notes come last."""
+    first_system, first_user = _build_supervisor_prompts(sample_state, 0)
+    sample_state["research_notes"] = ["## Research on: weather\nSunny"]
+    second_system, second_user = _build_supervisor_prompts(sample_state, 1)
+    
+    assert first_system == second_system
+    assert "{current_date}" not in second_system
+    assert second_user.endswith("Sunny")
+
+
+def test_build_supervisor_prompts_condenses_older_notes(sample_state):
+    """Test only the latest notes are sent in full once there are many."""
+    long_summary = "x" * 1000
+    sample_state["research_notes"] = [f"## Research on: topic {i}\n{long_summary}" for i in range(5)]
+    
+    _, user_msg = _build_supervisor_prompts(sample_state, 2)
+    
+    assert "## Research on: topic 0" in user_msg
+    assert user_msg.count(long_summary) == 3
+    assert user_msg.index("Earlier Research (condensed):") < user_msg.index("Latest Research:")
+
+
+def test_effective_next_step_finishes_when_confident(sample_state):
+    """Test a confident research decision finishes once this turn has research notes."""
+    decision = SupervisorDecision(next_step="research", research_topic="weather", reasoning="why", confidence=0.9)
+    
+    assert _effective_next_step(sample_state, decision, 1) == "research"
+    sample_state["research_notes"] = ["## Research on: weather\nSunny"]
+    assert _effective_next_step(sample_state, decision, 1) == "finish"
+    decision.confidence = 0.5
+    assert _effective_next_step(sample_state, decision, 1) == "research"
+
+
+def test_effective_next_step_ignores_notes_from_earlier_turns(sample_state):
+    """Test notes carried over from a previous question do not finish a new one before it is researched."""
+    decision = SupervisorDecision(next_step="research", research_topic="weather", reasoning="why", confidence=0.9)
+    sample_state["research_notes"] = ["## Research on: an earlier question\nNotes"]
+    
+    assert _effective_next_step(sample_state, decision, 0) == "research"
@@ -6,7 +6,9 @@ from unittest.mock import MagicMock, Mock, patch
 import pytest
 
 from polyplexity_agent.config import Settings
-from polyplexity_agent.graphs.agent_graph import create_agent_graph
+from langgraph.types import Send
+
+from polyplexity_agent.graphs.agent_graph import create_agent_graph, route_supervisor
 
 
 @pytest.fixture
@@ -60,8 +62,8 @@ def test_create_agent_graph_with_checkpointer(
     # Verify checkpointer.setup was called
     mock_checkpointer.setup.assert_called_once()
     
-    # Verify draw_graph was called
-    mock_draw_graph.assert_called_once()
+    # Graph rendering is opt-in via POLYPLEXITY_DRAW_GRAPH
+    mock_draw_graph.assert_not_called()
     
     # Verify graph was created
     assert graph is not None
@@ -76,6 +78,7 @@ def test_create_agent_graph_with_checkpointer(
 @patch("polyplexity_agent.graphs.agent_graph.route_supervisor")
 @patch("polyplexity_agent.graphs.agent_graph.draw_graph")
 @patch("polyplexity_agent.graphs.agent_graph.create_checkpointer")
+@patch("polyplexity_agent.graphs.agent_graph.DRAW_GRAPH", True)
 def test_create_agent_graph_without_checkpointer(
     mock_create_checkpointer,
     mock_draw_graph,
@@ -130,7 +133,7 @@ def test_create_agent_graph_default_settings(
     
     # Verify graph was created
     assert graph is not None
-    mock_draw_graph.assert_called_once()
+    mock_draw_graph.assert_not_called()
 
 
 @patch("polyplexity_agent.graphs.agent_graph.supervisor_node")
@@ -165,5 +168,43 @@ def test_create_agent_graph_checkpointer_setup_failure(
     
     # Verify graph was still created
     assert graph is not None
-    mock_draw_graph.assert_called_once()
+    mock_draw_graph.assert_not_called()
+
+
+def test_route_supervisor_single_topic():
+    """Test route_supervisor routes a single topic to call_researcher."""
+    state = {"next_topic": "AI", "research_topics": ["AI"], "answer_format": "concise", "iterations": 0}
+    
+    assert route_supervisor(state) == "call_researcher"
+
 
+def test_route_supervisor_fans_out_parallel_topics():
+    """Test route_supervisor sends one call_researcher task per research topic."""
+    state = {
+        "next_topic": "AI chips",
+        "research_topics": ["AI chips", "AI regulation"],
+        "answer_format": "report",
+        "iterations": 1,
+    }
+    
+    result = route_supervisor(state)
+    
+    assert isinstance(result, list)
+    assert all(isinstance(send, Send) and send.node == "call_researcher" for send in result)
+    assert [send.arg["next_topic"] for send in result] == ["AI chips", "AI regulation"]
+    assert result[0].arg == {"next_topic": "AI chips", "answer_format": "report", "iterations": 1, "_current_date": ""}
+
+
+@pytest.mark.parametrize("iterations, expected", [(5, "call_researcher"), (8, "final_report")])
+def test_route_supervisor_caps_report_research_rounds(iterations, expected):
+    """Test report runs keep researching past five rounds, up to max_supervisor_iterations."""
+    state = {"next_topic": "AI", "research_topics": ["AI"], "answer_format": "report", "iterations": iterations}
+    
+    assert route_supervisor(state) == expected
+
+
+def test_route_supervisor_finish_ignores_topics():
+    """Test route_supervisor does not fan out once the supervisor finishes."""
+    state = {"next_topic": "FINISH", "research_topics": [], "research_notes": ["note"], "iterations": 1}
+    
+    assert route_supervisor(state) == "final_report"
@@ -9,22 +9,19 @@ from typing import Any, Dict
 
 import pytest
 
-from polyplexity_agent.entrypoint import run_research_agent
+from polyplexity_agent.entrypoint import _process_stream_chunk, arun_research_agent, run_research_agent
 from polyplexity_agent.models import SupervisorDecision
+from polyplexity_agent.utils.helpers import wait_for_background_tasks
+from polyplexity_agent.utils.state_manager import get_state_logger
 
 
 @pytest.mark.e2e
 @patch("polyplexity_agent.entrypoint._checkpointer", None)
-@patch("polyplexity_agent.entrypoint._state_logger", None)
-@patch("polyplexity_agent.entrypoint.set_state_logger")
-@patch("polyplexity_agent.entrypoint.set_researcher_logger")
 @patch("polyplexity_agent.entrypoint.StateLogger")
 @patch("polyplexity_agent.entrypoint.ensure_trace_completeness")
 def test_end_to_end_research_flow(
     mock_ensure_trace,
     mock_state_logger_class,
-    mock_set_researcher_logger,
-    mock_set_state_logger,
     mock_graph,
     mock_researcher_graph,
     mock_llm,
@@ -32,8 +29,11 @@ def test_end_to_end_research_flow(
 ):
     """Test end-to-end flow with research path."""
     # Setup mock graph stream to simulate graph execution
+    seen_loggers = []
+    
     def mock_graph_stream(initial_state, config, stream_mode):
         """Simulate graph execution stream."""
+        seen_loggers.append(get_state_logger())
         # Supervisor decision event
         yield ("custom", {"event": "supervisor_decision", "decision": "research", "topic": "test topic"})
         yield ("custom", {"event": "trace", "type": "node_call", "node": "supervisor"})
@@ -72,24 +72,48 @@ def test_end_to_end_research_flow(
     report_events = [e for e in events if isinstance(e[1], dict) and e[1].get("event") == "final_report_complete"]
     assert len(report_events) > 0
     
-    # Verify state logger was set up
-    mock_set_state_logger.assert_called()
-    mock_set_researcher_logger.assert_called()
+    # Verify the run's state logger was visible to nodes and unregistered afterwards
+    assert seen_loggers == [mock_state_logger]
+    assert get_state_logger() is None
+    mock_state_logger.close.assert_called()
+
+
+@pytest.mark.e2e
+@pytest.mark.asyncio
+@patch("polyplexity_agent.entrypoint._checkpointer", None)
+@patch("polyplexity_agent.entrypoint.StateLogger")
+@patch("polyplexity_agent.entrypoint.ensure_trace_completeness")
+async def test_end_to_end_async_flow(
+    mock_ensure_trace,
+    mock_state_logger_class,
+    mock_graph,
+):
+    """Test arun_research_agent drives the graph through astream."""
+    async def mock_graph_astream(initial_state, config, stream_mode):
+        """Simulate async graph execution stream."""
+        yield ("custom", {"event": "supervisor_decision", "decision": "finish"})
+        yield ("custom", {"event": "final_report_complete", "report": "Async answer"})
+        yield ("updates", {"direct_answer": {"final_report": "Async answer"}})
+    
+    mock_graph.astream = mock_graph_astream
+    mock_state_logger = Mock()
+    mock_state_logger_class.return_value = mock_state_logger
+    
+    events = [event async for event in arun_research_agent("What is 2+2?", graph=mock_graph)]
+    
+    report_events = [e for e in events if isinstance(e[1], dict) and e[1].get("event") == "final_report_complete"]
+    assert report_events[0][1]["payload"]["report"] == "Async answer"
+    assert ("updates", {"direct_answer": {"final_report": "Async answer"}}) in events
     mock_state_logger.close.assert_called()
 
 
 @pytest.mark.e2e
 @patch("polyplexity_agent.entrypoint._checkpointer", None)
-@patch("polyplexity_agent.entrypoint._state_logger", None)
-@patch("polyplexity_agent.entrypoint.set_state_logger")
-@patch("polyplexity_agent.entrypoint.set_researcher_logger")
 @patch("polyplexity_agent.entrypoint.StateLogger")
 @patch("polyplexity_agent.entrypoint.ensure_trace_completeness")
 def test_end_to_end_direct_answer_flow(
     mock_ensure_trace,
     mock_state_logger_class,
-    mock_set_researcher_logger,
-    mock_set_state_logger,
     mock_graph,
     mock_llm,
     mock_settings,
@@ -138,16 +162,11 @@ def test_end_to_end_direct_answer_flow(
 
 @pytest.mark.e2e
 @patch("polyplexity_agent.entrypoint._checkpointer", None)
-@patch("polyplexity_agent.entrypoint._state_logger", None)
-@patch("polyplexity_agent.entrypoint.set_state_logger")
-@patch("polyplexity_agent.entrypoint.set_researcher_logger")
 @patch("polyplexity_agent.entrypoint.StateLogger")
 @patch("polyplexity_agent.entrypoint.ensure_trace_completeness")
 def test_end_to_end_clarification_flow(
     mock_ensure_trace,
     mock_state_logger_class,
-    mock_set_researcher_logger,
-    mock_set_state_logger,
     mock_graph,
     mock_llm,
     mock_settings,
@@ -196,16 +215,11 @@ def test_end_to_end_clarification_flow(
 
 @pytest.mark.e2e
 @patch("polyplexity_agent.entrypoint._checkpointer")
-@patch("polyplexity_agent.entrypoint._state_logger", None)
-@patch("polyplexity_agent.entrypoint.set_state_logger")
-@patch("polyplexity_agent.entrypoint.set_researcher_logger")
 @patch("polyplexity_agent.entrypoint.StateLogger")
 @patch("polyplexity_agent.entrypoint.ensure_trace_completeness")
 def test_end_to_end_with_checkpointer(
     mock_ensure_trace,
     mock_state_logger_class,
-    mock_set_researcher_logger,
-    mock_set_state_logger,
     mock_checkpointer_patch,
     mock_graph,
     mock_researcher_graph,
@@ -242,22 +256,18 @@ def test_end_to_end_with_checkpointer(
     assert len(thread_events) > 0
     assert thread_events[0][1]["thread_id"] == "test_thread"
     
-    # Verify trace completeness was ensured
+    # Verify trace completeness was ensured in the background
+    wait_for_background_tasks(timeout=5)
     mock_ensure_trace.assert_called_once()
 
 
 @pytest.mark.e2e
 @patch("polyplexity_agent.entrypoint._checkpointer")
-@patch("polyplexity_agent.entrypoint._state_logger", None)
-@patch("polyplexity_agent.entrypoint.set_state_logger")
-@patch("polyplexity_agent.entrypoint.set_researcher_logger")
 @patch("polyplexity_agent.entrypoint.StateLogger")
 @patch("polyplexity_agent.entrypoint.ensure_trace_completeness")
 def test_end_to_end_follow_up_conversation(
     mock_ensure_trace,
     mock_state_logger_class,
-    mock_set_researcher_logger,
-    mock_set_state_logger,
     mock_checkpointer_patch,
     mock_graph,
     mock_llm,
@@ -302,16 +312,11 @@ def test_end_to_end_follow_up_conversation(
 
 @pytest.mark.e2e
 @patch("polyplexity_agent.entrypoint._checkpointer", None)
-@patch("polyplexity_agent.entrypoint._state_logger", None)
-@patch("polyplexity_agent.entrypoint.set_state_logger")
-@patch("polyplexity_agent.entrypoint.set_researcher_logger")
 @patch("polyplexity_agent.entrypoint.StateLogger")
 @patch("polyplexity_agent.entrypoint.ensure_trace_completeness")
 def test_end_to_end_event_streaming(
     mock_ensure_trace,
     mock_state_logger_class,
-    mock_set_researcher_logger,
-    mock_set_state_logger,
     mock_graph,
     mock_researcher_graph,
     mock_llm,
@@ -362,16 +367,11 @@ def test_end_to_end_event_streaming(
 
 @pytest.mark.e2e
 @patch("polyplexity_agent.entrypoint._checkpointer", None)
-@patch("polyplexity_agent.entrypoint._state_logger", None)
-@patch("polyplexity_agent.entrypoint.set_state_logger")
-@patch("polyplexity_agent.entrypoint.set_researcher_logger")
 @patch("polyplexity_agent.entrypoint.StateLogger")
 @patch("polyplexity_agent.entrypoint.ensure_trace_completeness")
 def test_end_to_end_error_handling(
     mock_ensure_trace,
     mock_state_logger_class,
-    mock_set_researcher_logger,
-    mock_set_state_logger,
     mock_graph,
     mock_llm,
     mock_settings,
@@ -392,22 +392,16 @@ def test_end_to_end_error_handling(
     
     # Verify logger was cleaned up even on error
     mock_state_logger.close.assert_called()
-    mock_set_state_logger.assert_called_with(None)
-    mock_set_researcher_logger.assert_called_with(None)
+    assert get_state_logger() is None
 
 
 @pytest.mark.e2e
 @patch("polyplexity_agent.entrypoint._checkpointer", None)
-@patch("polyplexity_agent.entrypoint._state_logger", None)
-@patch("polyplexity_agent.entrypoint.set_state_logger")
-@patch("polyplexity_agent.entrypoint.set_researcher_logger")
 @patch("polyplexity_agent.entrypoint.StateLogger")
 @patch("polyplexity_agent.entrypoint.ensure_trace_completeness")
 def test_end_to_end_multi_iteration_research(
     mock_ensure_trace,
     mock_state_logger_class,
-    mock_set_researcher_logger,
-    mock_set_state_logger,
     mock_graph,
     mock_researcher_graph,
     mock_llm,
@@ -442,16 +436,11 @@ def test_end_to_end_multi_iteration_research(
 
 @pytest.mark.e2e
 @patch("polyplexity_agent.entrypoint._checkpointer", None)
-@patch("polyplexity_agent.entrypoint._state_logger", None)
-@patch("polyplexity_agent.entrypoint.set_state_logger")
-@patch("polyplexity_agent.entrypoint.set_researcher_logger")
 @patch("polyplexity_agent.entrypoint.StateLogger")
 @patch("polyplexity_agent.entrypoint.ensure_trace_completeness")
 def test_end_to_end_max_iterations_limit(
     mock_ensure_trace,
     mock_state_logger_class,
-    mock_set_researcher_logger,
-    mock_set_state_logger,
     mock_graph,
     mock_llm,
     mock_settings,
@@ -478,16 +467,11 @@ def test_end_to_end_max_iterations_limit(
 
 @pytest.mark.e2e
 @patch("polyplexity_agent.entrypoint._checkpointer", None)
-@patch("polyplexity_agent.entrypoint._state_logger", None)
-@patch("polyplexity_agent.entrypoint.set_state_logger")
-@patch("polyplexity_agent.entrypoint.set_researcher_logger")
 @patch("polyplexity_agent.entrypoint.StateLogger")
 @patch("polyplexity_agent.entrypoint.ensure_trace_completeness")
 def test_end_to_end_empty_response_handling(
     mock_ensure_trace,
     mock_state_logger_class,
-    mock_set_researcher_logger,
-    mock_set_state_logger,
     mock_graph,
     mock_llm,
     mock_settings,
@@ -506,3 +490,40 @@ def test_end_to_end_empty_response_handling(
     events = list(run_research_agent("", graph=mock_graph))
 
     assert len(events) > 0
+
+
+def test_process_stream_chunk_collects_each_trace_once():
+    """Test final_report trace events are not collected again from its state update."""
+    trace_event = {"type": "node_call", "node": "final_report", "timestamp": 1, "data": {}}
+    question_execution_trace = []
+    
+    _process_stream_chunk("custom", {"type": "trace", "node": "final_report", "event": "node_call", "payload": trace_event}, question_execution_trace)
+    _process_stream_chunk("updates", {"final_report": {"final_report": "Report", "execution_trace": [trace_event]}}, question_execution_trace)
+    
+    assert question_execution_trace == [trace_event]
+
+
+@pytest.mark.e2e
+@patch("polyplexity_agent.entrypoint._checkpointer")
+@patch("polyplexity_agent.entrypoint.StateLogger")
+@patch("polyplexity_agent.entrypoint.ensure_trace_completeness")
+def test_end_to_end_new_thread_skips_state_probe(
+    mock_ensure_trace,
+    mock_state_logger_class,
+    mock_checkpointer_patch,
+    mock_graph,
+    mock_llm,
+    mock_settings,
+):
+    """Test a freshly generated thread ID does not look up checkpointed state."""
+    def mock_graph_stream(initial_state, config, stream_mode):
+        """Simulate graph execution stream."""
+        yield ("updates", {"direct_answer": {"final_report": "Answer"}})
+    
+    mock_graph.stream = mock_graph_stream
+    
+    events = list(run_research_agent("Test question", graph=mock_graph))
+    
+    thread_events = [e for e in events if isinstance(e[1], dict) and e[1].get("event") == "thread_id"]
+    assert thread_events[0][1]["thread_id"].startswith("thread_")
+    mock_graph.get_state.assert_not_called()
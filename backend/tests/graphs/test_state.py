@@ -7,9 +7,13 @@ from typing import List
 import pytest
 
 from polyplexity_agent.graphs.state import (
+    MAX_EXECUTION_TRACE,
+    MAX_SEARCH_RESULTS_CHARS,
     MarketResearchState,
     ResearcherState,
     SupervisorState,
+    manage_execution_trace,
+    merge_search_results,
 )
 
 
@@ -79,7 +83,7 @@ def test_supervisor_state_structure():
 
 def test_researcher_state_reducer():
     """
-    Test that ResearcherState search_results uses operator.add reducer.
+    Test that ResearcherState search_results uses the merge_search_results reducer.
     """
     # The reducer is defined in the type annotation
     # We can't directly test it, but we verify the annotation exists
@@ -89,9 +93,39 @@ def test_researcher_state_reducer():
     search_results_annotation = hints.get("search_results")
     
     assert search_results_annotation is not None
-    # Verify it's an Annotated type with operator.add
-    from typing import Annotated
-    assert hasattr(search_results_annotation, "__metadata__")
+    assert search_results_annotation.__metadata__[0] is merge_search_results
+
+
+def _search_block(query: str, urls: List[str]) -> str:
+    """Build a search result block in perform_search's format."""
+    entries = "".join(f"Title: [{url}]({url})\nContent: about {url}\n\n" for url in urls)
+    return f"--- Results for '{query}' ---\n{entries}"
+
+
+def test_merge_search_results_skips_duplicate_blocks():
+    """
+    Test merge_search_results drops repeated blocks and blocks with only seen URLs.
+    """
+    first = _search_block("ai", ["https://a.com", "https://b.com"])
+    overlap = _search_block("AI overview", ["https://b.com", "https://a.com"])
+    partial = _search_block("ai uses", ["https://a.com", "https://c.com"])
+    
+    result = merge_search_results([first], [first, overlap, partial])
+    
+    assert result == [first, partial]
+
+
+def test_merge_search_results_caps_total_size():
+    """
+    Test merge_search_results drops blocks that would exceed MAX_SEARCH_RESULTS_CHARS.
+    """
+    large = "x" * (MAX_SEARCH_RESULTS_CHARS - 10)
+    too_big = "y" * 20
+    small = "z" * 5
+    
+    result = merge_search_results([], [large, too_big, small])
+    
+    assert result == [large, small]
 
 
 def test_supervisor_state_reducers():
@@ -106,7 +140,22 @@ def test_supervisor_state_reducers():
     research_notes_annotation = hints.get("research_notes")
     assert research_notes_annotation is not None
     
-    # Check execution_trace uses operator.add
+    # Check execution_trace uses the bounded manage_execution_trace reducer
     execution_trace_annotation = hints.get("execution_trace")
     assert execution_trace_annotation is not None
+    assert execution_trace_annotation.__metadata__[0] is manage_execution_trace
+
+
+def test_manage_execution_trace_resets_and_bounds():
+    """Test manage_execution_trace handles the reset signal and keeps only recent events."""
+    events = [{"type": "node_call", "index": i} for i in range(MAX_EXECUTION_TRACE)]
+    
+    assert manage_execution_trace(events, [{"type": "reset"}]) == []
+    assert manage_execution_trace([], [{"type": "reset"}, events[0]]) == [events[0]]
+    
+    extra = {"type": "custom", "index": "new"}
+    bounded = manage_execution_trace(events, [extra])
+    assert len(bounded) == MAX_EXECUTION_TRACE
+    assert bounded[0] == events[1]
+    assert bounded[-1] == extra
 
@@ -2,10 +2,12 @@
 Tests for event serializers module.
 """
 import time
+from unittest.mock import patch
 
 import pytest
 from polyplexity_agent.streaming.event_serializers import (
     TraceEventType,
+    collect_trace_events,
     create_trace_event,
     serialize_custom_event,
     serialize_event,
@@ -172,3 +174,17 @@ def test_create_trace_event_nested_data():
     assert event["data"]["outer"]["inner"]["list"] == [1, 2, 3]
     assert len(event["data"]["array"]) == 2
     assert event["data"]["array"][0]["item"] == 1
+
+
+@patch("polyplexity_agent.streaming.event_serializers.TRACING_ENABLED", False)
+def test_create_trace_event_disabled():
+    """Test trace events are skipped when tracing is disabled."""
+    assert create_trace_event("node_call", "test_node", {}) is None
+
+
+def test_collect_trace_events_drops_disabled_events():
+    """Test collect_trace_events keeps real events and drops None placeholders."""
+    event = create_trace_event("node_call", "test_node", {})
+    
+    assert collect_trace_events(event, None) == [event]
+    assert collect_trace_events(None, None) == []
@@ -4,6 +4,7 @@ Tests for SSE module.
 import json
 import pytest
 from polyplexity_agent.streaming.sse import (
+    create_sse_generator,
     format_completion_event,
     format_error_event,
     format_sse_event,
@@ -128,3 +129,33 @@ def test_normalize_event_default():
     assert normalized["event"] == "unknown"
     assert normalized["payload"] == event
     assert "timestamp" in normalized
+
+
+@pytest.mark.asyncio
+async def test_create_sse_generator_async_iterator():
+    """Test the SSE generator accepts async (mode, data) iterators."""
+    async def events():
+        yield ("custom", {"event": "final_report_complete", "report": "Done"})
+    
+    lines = [line async for line in create_sse_generator(events())]
+    
+    parsed = [json.loads(line[6:-2]) for line in lines]
+    assert parsed[0]["event"] == "final_report_complete"
+    assert parsed[-1]["event"] == "complete"
+    assert parsed[-1]["payload"]["response"] == "Done"
+
+
+@pytest.mark.asyncio
+async def test_create_sse_generator_batches_event_lists():
+    """Test a batched list of custom events is written as one chunk of SSE lines."""
+    async def events():
+        yield ("custom", [
+            {"type": "trace", "node": "final_report", "event": "node_call", "payload": {}},
+            {"type": "custom", "node": "final_report", "event": "writing_report", "payload": {}},
+        ])
+    
+    chunks = [chunk async for chunk in create_sse_generator(events())]
+    
+    assert len(chunks) == 2  # the batch and the completion event
+    parsed = [json.loads(line[6:]) for line in chunks[0].split("\n\n") if line]
+    assert [event["event"] for event in parsed] == ["node_call", "writing_report"]
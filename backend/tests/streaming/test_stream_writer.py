@@ -7,6 +7,7 @@ from unittest.mock import Mock, patch
 from polyplexity_agent.streaming.stream_writer import (
     stream_custom_event,
     stream_event,
+    stream_node_events,
     stream_state_update,
     stream_trace_event,
 )
@@ -31,6 +32,53 @@ def test_stream_trace_event(mock_get_writer):
     assert "payload" in call_args
 
 
+@patch("polyplexity_agent.streaming.event_serializers.TRACING_ENABLED", False)
+@patch("polyplexity_agent.streaming.stream_writer.get_stream_writer")
+def test_stream_trace_event_disabled(mock_get_writer):
+    """Test trace events are not streamed when tracing is disabled."""
+    stream_trace_event("node_call", "test_node", {"query": "test"})
+    
+    mock_get_writer.assert_not_called()
+
+
+@patch("polyplexity_agent.streaming.stream_writer.get_stream_writer")
+def test_stream_node_events_single_write(mock_get_writer):
+    """Test a node's trace and custom events go out in one writer call."""
+    mock_writer = Mock()
+    mock_get_writer.return_value = mock_writer
+    
+    trace_events = stream_node_events(
+        "supervisor",
+        traces=[("reasoning", {"reasoning": "why"})],
+        custom_events=[("supervisor_decision", {"decision": "research"})]
+    )
+    
+    mock_writer.assert_called_once()
+    envelopes = mock_writer.call_args[0][0]
+    assert [(e["type"], e["event"]) for e in envelopes] == [("trace", "reasoning"), ("custom", "supervisor_decision")]
+    assert envelopes[0]["payload"] is trace_events[0]
+    assert trace_events[0]["data"] == {"reasoning": "why"}
+    assert len({e["timestamp"] for e in envelopes} | {trace_events[0]["timestamp"]}) == 1
+
+
+@patch("polyplexity_agent.streaming.event_serializers.TRACING_ENABLED", False)
+@patch("polyplexity_agent.streaming.stream_writer.get_stream_writer")
+def test_stream_node_events_tracing_disabled(mock_get_writer):
+    """Test only custom events are streamed when tracing is disabled."""
+    mock_writer = Mock()
+    mock_get_writer.return_value = mock_writer
+    
+    trace_events = stream_node_events(
+        "final_report",
+        traces=[("node_call", {})],
+        custom_events=[("writing_report", {})]
+    )
+    
+    assert trace_events == []
+    envelopes = mock_writer.call_args[0][0]
+    assert [e["event"] for e in envelopes] == ["writing_report"]
+
+
 @patch("polyplexity_agent.streaming.stream_writer.get_stream_writer")
 def test_stream_custom_event(mock_get_writer):
     """Test streaming custom events."""
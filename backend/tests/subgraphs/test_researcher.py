@@ -37,18 +37,17 @@ def mock_tavily_results():
             {
                 "title": "AI Overview",
                 "url": "https://example.com/ai",
-                "content": "Artificial intelligence is a branch of computer science...",
+                "content": "Artificial intelligence is a branch of computer science concerned with building systems that reason, learn and act.",
             },
             {
                 "title": "Machine Learning Basics",
                 "url": "https://example.com/ml",
-                "content": "Machine learning is a subset of AI...",
+                "content": "Machine learning is a subset of AI in which models learn patterns from data instead of following hand-written rules.",
             },
         ]
     }
 
 
-@patch("polyplexity_agent.graphs.subgraphs.researcher._state_logger")
 @patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.create_llm_model")
 @patch("polyplexity_agent.graphs.nodes.researcher.perform_search.TavilySearch")
 @patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.create_llm_model")
@@ -56,7 +55,6 @@ def test_researcher_subgraph_full_flow(
     mock_synthesize_llm,
     mock_tavily_search,
     mock_generate_llm,
-    mock_state_logger,
     initial_state,
     mock_search_queries,
     mock_tavily_results,
@@ -66,7 +64,7 @@ def test_researcher_subgraph_full_flow(
     
     # Mock query generation LLM
     mock_generate_chain = Mock()
-    mock_generate_chain.with_structured_output.return_value.with_retry.return_value.invoke.return_value = mock_search_queries
+    mock_generate_chain.with_structured_output.return_value.with_retry.return_value.invoke.return_value = {"raw": Mock(), "parsed": mock_search_queries, "parsing_error": None}
     mock_generate_llm.return_value = mock_generate_chain
     
     # Mock Tavily search
@@ -78,7 +76,7 @@ def test_researcher_subgraph_full_flow(
     mock_synthesize_response = Mock()
     mock_synthesize_response.content = "Artificial intelligence (AI) is a branch of computer science that aims to create intelligent machines..."
     mock_synthesize_chain = Mock()
-    mock_synthesize_chain.invoke.return_value = mock_synthesize_response
+    mock_synthesize_chain.stream.side_effect = lambda messages: iter([mock_synthesize_response])
     mock_synthesize_llm.return_value = mock_synthesize_chain
     
     # Execute subgraph
@@ -101,14 +99,14 @@ def test_researcher_subgraph_full_flow(
     # Verify LLM was called for query generation
     assert mock_generate_llm.called
     
-    # Verify TavilySearch was called (should be called 3 times, once per query)
-    assert mock_tavily_search.call_count == 3
+    # Verify one shared TavilySearch client ran a search per query
+    mock_tavily_search.assert_called_once()
+    assert mock_tool.invoke.call_count == 3
     
     # Verify synthesis LLM was called
     assert mock_synthesize_llm.called
 
 
-@patch("polyplexity_agent.graphs.subgraphs.researcher._state_logger")
 @patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.create_llm_model")
 @patch("polyplexity_agent.graphs.nodes.researcher.perform_search.TavilySearch")
 @patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.create_llm_model")
@@ -116,7 +114,6 @@ def test_researcher_subgraph_streaming(
     mock_synthesize_llm,
     mock_tavily_search,
     mock_generate_llm,
-    mock_state_logger,
     initial_state,
     mock_search_queries,
     mock_tavily_results,
@@ -126,7 +123,7 @@ def test_researcher_subgraph_streaming(
     
     # Mock query generation LLM
     mock_generate_chain = Mock()
-    mock_generate_chain.with_structured_output.return_value.with_retry.return_value.invoke.return_value = mock_search_queries
+    mock_generate_chain.with_structured_output.return_value.with_retry.return_value.invoke.return_value = {"raw": Mock(), "parsed": mock_search_queries, "parsing_error": None}
     mock_generate_llm.return_value = mock_generate_chain
     
     # Mock Tavily search
@@ -138,7 +135,7 @@ def test_researcher_subgraph_streaming(
     mock_synthesize_response = Mock()
     mock_synthesize_response.content = "Research summary"
     mock_synthesize_chain = Mock()
-    mock_synthesize_chain.invoke.return_value = mock_synthesize_response
+    mock_synthesize_chain.stream.side_effect = lambda messages: iter([mock_synthesize_response])
     mock_synthesize_llm.return_value = mock_synthesize_chain
     
     # Stream subgraph execution
@@ -161,7 +158,6 @@ def test_researcher_subgraph_streaming(
         assert "research_summary" in final_state or any("research_summary" in str(v) for v in final_state.values())
 
 
-@patch("polyplexity_agent.graphs.subgraphs.researcher._state_logger")
 @patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.create_llm_model")
 @patch("polyplexity_agent.graphs.nodes.researcher.perform_search.TavilySearch")
 @patch("polyplexity_agent.graphs.nodes.researcher.synthesize_research.create_llm_model")
@@ -169,7 +165,6 @@ def test_researcher_subgraph_query_breadth(
     mock_synthesize_llm,
     mock_tavily_search,
     mock_generate_llm,
-    mock_state_logger,
     mock_search_queries,
     mock_tavily_results,
 ):
@@ -178,7 +173,7 @@ def test_researcher_subgraph_query_breadth(
     
     # Mock query generation LLM
     mock_generate_chain = Mock()
-    mock_generate_chain.with_structured_output.return_value.with_retry.return_value.invoke.return_value = mock_search_queries
+    mock_generate_chain.with_structured_output.return_value.with_retry.return_value.invoke.return_value = {"raw": Mock(), "parsed": mock_search_queries, "parsing_error": None}
     mock_generate_llm.return_value = mock_generate_chain
     
     # Mock Tavily search
@@ -190,7 +185,7 @@ def test_researcher_subgraph_query_breadth(
     mock_synthesize_response = Mock()
     mock_synthesize_response.content = "Summary"
     mock_synthesize_chain = Mock()
-    mock_synthesize_chain.invoke.return_value = mock_synthesize_response
+    mock_synthesize_chain.stream.side_effect = lambda messages: iter([mock_synthesize_response])
     mock_synthesize_llm.return_value = mock_synthesize_chain
     
     # Test with different query_breadth values
@@ -205,20 +200,15 @@ def test_researcher_subgraph_query_breadth(
         
         researcher_graph.invoke(state)
         
-        # Verify TavilySearch was called 3 times (once per query)
-        # Each call should use the correct max_results (breadth)
-        assert mock_tavily_search.call_count == 3
-        # Verify each call used the correct breadth
-        for call in mock_tavily_search.call_args_list:
-            assert call[1]["max_results"] == breadth or call[0][0] == breadth
+        # Verify one TavilySearch client is built per breadth and runs each query
+        mock_tavily_search.assert_called_once_with(max_results=breadth, topic="general")
+        assert mock_tool.invoke.call_count == 3
         
         mock_tavily_search.reset_mock()
+        mock_tool.invoke.reset_mock()
 
 
-@patch("polyplexity_agent.graphs.subgraphs.researcher._state_logger")
-def test_map_queries_function(
-    mock_state_logger,
-):
+def test_map_queries_function():
     """Test map_queries routing function."""
     from polyplexity_agent.graphs.subgraphs.researcher import map_queries
     
@@ -241,10 +231,7 @@ def test_map_queries_function(
             assert "query_breadth" in send_obj.arg or send_obj.arg.get("query_breadth") == 5
 
 
-@patch("polyplexity_agent.graphs.subgraphs.researcher._state_logger")
-def test_map_queries_default_breadth(
-    mock_state_logger,
-):
+def test_map_queries_default_breadth():
     """Test map_queries defaults query_breadth to 2 if missing."""
     from polyplexity_agent.graphs.subgraphs.researcher import map_queries
     
@@ -259,11 +246,23 @@ def test_map_queries_default_breadth(
     assert len(result) == 2
 
 
-@patch("polyplexity_agent.graphs.subgraphs.researcher._state_logger")
+def test_map_queries_skips_duplicate_queries():
+    """Test map_queries sends queries differing only in case or spacing once."""
+    from polyplexity_agent.graphs.subgraphs.researcher import map_queries
+    
+    state = {
+        "queries": ["AI chips", "ai  chips", "AI regulation"],
+        "query_breadth": 3,
+    }
+    
+    result = map_queries(state)
+    
+    assert [send_obj.arg["query"] for send_obj in result] == ["AI chips", "AI regulation"]
+
+
 @patch("polyplexity_agent.graphs.nodes.researcher.generate_queries.create_llm_model")
 def test_researcher_subgraph_error_propagation(
     mock_generate_llm,
-    mock_state_logger,
     initial_state,
 ):
     """Test that errors in nodes propagate correctly through subgraph."""
@@ -277,10 +276,7 @@ def test_researcher_subgraph_error_propagation(
         researcher_graph.invoke(initial_state)
 
 
-@patch("polyplexity_agent.graphs.subgraphs.researcher._state_logger")
-def test_create_researcher_graph(
-    mock_state_logger,
-):
+def test_create_researcher_graph():
     """Test create_researcher_graph function creates a valid graph."""
     from polyplexity_agent.graphs.subgraphs.researcher import create_researcher_graph
     
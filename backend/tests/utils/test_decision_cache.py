@@ -0,0 +1,53 @@
+"""
+Tests for the supervisor decision cache.
+"""
+from unittest.mock import Mock
+
+import pytest
+
+from polyplexity_agent.models import SupervisorDecision
+from polyplexity_agent.utils.decision_cache import (
+    cache_decision,
+    clear_decision_cache,
+    get_cached_decision,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Start every test with an empty decision cache."""
+    clear_decision_cache()
+    yield
+    clear_decision_cache()
+
+
+def test_cache_miss_returns_none():
+    """Test unknown prompts are a cache miss."""
+    assert get_cached_decision("system", "user") is None
+
+
+def test_cache_hit_returns_equal_decision():
+    """Test a cached decision is returned as a fresh, equal instance."""
+    decision = SupervisorDecision(next_step="research", research_topic="topic", reasoning="why")
+    cache_decision("system", "user", decision)
+    
+    cached = get_cached_decision("system", "user")
+    
+    assert cached == decision
+    assert cached is not decision
+    assert get_cached_decision("system", "other user") is None
+
+
+def test_cache_hit_ignores_whitespace_differences():
+    """Test prompts that differ only in spacing reuse the cached decision."""
+    decision = SupervisorDecision(next_step="finish", reasoning="done")
+    cache_decision("system", "User Request: weather\n", decision)
+    
+    assert get_cached_decision("system ", "User Request:  weather") == decision
+
+
+def test_cache_ignores_non_decision_values():
+    """Test values that are not SupervisorDecision instances are not cached."""
+    cache_decision("system", "user", Mock())
+    
+    assert get_cached_decision("system", "user") is None
@@ -1,19 +1,30 @@
 """
 Tests for utility helper functions.
 """
+import threading
 from unittest.mock import Mock, patch
-from datetime import datetime
+from datetime import date, datetime
 
 import pytest
 
 from polyplexity_agent.utils.helpers import (
     format_date,
+    get_current_date,
+    get_notes_context,
+    compact_notes,
+    report_preview,
     create_llm_model,
+    bind_structured_output,
+    invoke_structured,
+    ainvoke_structured,
     generate_thread_name,
     log_node_state,
+    log_text_summary,
     format_search_url_markdown,
     save_messages_and_trace,
     ensure_trace_completeness,
+    run_in_background,
+    wait_for_background_tasks,
 )
 
 
@@ -36,13 +47,70 @@ def test_format_date():
         pytest.fail("format_date returned invalid date format")
 
 
+@patch("polyplexity_agent.utils.helpers.date")
+def test_format_date_follows_day_changes(mock_date):
+    """Test format_date reuses the formatted string within a day and updates on a new day."""
+    mock_date.fromordinal.side_effect = date.fromordinal
+    mock_date.today.return_value = date(2025, 1, 2)
+    assert format_date() == "01 02 25"
+    assert format_date() == "01 02 25"
+    mock_date.today.return_value = date(2025, 1, 3)
+    assert format_date() == "01 03 25"
+
+
+def test_get_notes_context_uses_accumulated_field():
+    """Test get_notes_context strips the leading separator from notes_context."""
+    state = {"research_notes": ["a", "b"], "notes_context": "\n\na\n\nb"}
+    
+    assert get_notes_context(state) == "a\n\nb"
+
+
+def test_get_notes_context_falls_back_to_research_notes():
+    """Test get_notes_context joins research_notes when notes_context is missing."""
+    assert get_notes_context({"research_notes": ["a", "b"]}) == "a\n\nb"
+    assert get_notes_context({}) == ""
+
+
+@patch("polyplexity_agent.utils.helpers.format_date", return_value="01 02 25")
+def test_get_current_date_prefers_request_date(mock_format_date):
+    """Test get_current_date reads the request's date and falls back to today."""
+    assert get_current_date({"_current_date": "12 31 24"}) == "12 31 24"
+    mock_format_date.assert_not_called()
+    assert get_current_date({}) == "01 02 25"
+
+
+def test_compact_notes_keeps_notes_within_budget():
+    """Test compact_notes joins notes verbatim when they fit the budget."""
+    notes = ["## Research on: A\nalpha", "## Research on: B\nbeta"]
+    assert compact_notes(notes, 1000, 3) == "## Research on: A\nalpha\n\n## Research on: B\nbeta"
+
+
+def test_compact_notes_condenses_oldest_notes():
+    """Test compact_notes condenses older notes and keeps the latest verbatim."""
+    notes = ["## Research on: A\n" + "a" * 50, "## Research on: B\n" + "b" * 50, "## Research on: C\n" + "c" * 50]
+    
+    result = compact_notes(notes, 80, 5)
+    
+    assert result == (
+        "Earlier Research (condensed):\n## Research on: A\naaaaa...\n\n## Research on: B\nbbbbb..."
+        "\n\nLatest Research:\n## Research on: C\n" + "c" * 50
+    )
+
+
+def test_report_preview_truncates_long_reports():
+    """Test report_preview keeps short reports and truncates long ones."""
+    assert report_preview("short") == "short"
+    assert report_preview("x" * 1500) == "x" * 1000 + "..."
+
+
 @patch("polyplexity_agent.utils.helpers._settings")
 def test_create_llm_model_defaults(mock_settings):
     """Test create_llm_model uses default settings."""
     mock_settings.model_name = "test-model"
     mock_settings.temperature = 0.5
     
-    with patch("polyplexity_agent.utils.helpers.ChatGroq") as mock_chatgroq:
+    with patch("polyplexity_agent.utils.helpers.ChatGroq") as mock_chatgroq, \
+            patch.dict("polyplexity_agent.utils.helpers._llm_models", clear=True):
         mock_model = Mock()
         mock_chatgroq.return_value = mock_model
         
@@ -52,13 +120,33 @@ def test_create_llm_model_defaults(mock_settings):
         assert result == mock_model
 
 
+@patch("polyplexity_agent.utils.helpers._settings")
+def test_create_llm_model_reuses_instances(mock_settings):
+    """Test create_llm_model builds one instance per model configuration."""
+    mock_settings.model_name = "test-model"
+    mock_settings.temperature = 0.0
+    
+    with patch("polyplexity_agent.utils.helpers.ChatGroq") as mock_chatgroq, \
+            patch.dict("polyplexity_agent.utils.helpers._llm_models", clear=True):
+        mock_chatgroq.side_effect = lambda **kwargs: Mock()
+        
+        first = create_llm_model()
+        second = create_llm_model()
+        other = create_llm_model(temperature=0.7)
+        
+        assert first is second
+        assert other is not first
+        assert mock_chatgroq.call_count == 2
+
+
 @patch("polyplexity_agent.utils.helpers._settings")
 def test_create_llm_model_with_overrides(mock_settings):
     """Test create_llm_model accepts model name and temperature overrides."""
     mock_settings.model_name = "default-model"
     mock_settings.temperature = 0.0
     
-    with patch("polyplexity_agent.utils.helpers.ChatGroq") as mock_chatgroq:
+    with patch("polyplexity_agent.utils.helpers.ChatGroq") as mock_chatgroq, \
+            patch.dict("polyplexity_agent.utils.helpers._llm_models", clear=True):
         mock_model = Mock()
         mock_chatgroq.return_value = mock_model
         
@@ -68,10 +156,122 @@ def test_create_llm_model_with_overrides(mock_settings):
         assert result == mock_model
 
 
+@patch("polyplexity_agent.utils.helpers._structured_models", {})
+def test_bind_structured_output_reuses_binding():
+    """Test bind_structured_output binds once per schema and model configuration."""
+    from polyplexity_agent.models import SearchQueries
+    
+    mock_model = Mock(model_name="test-model", temperature=0.0)
+    
+    first = bind_structured_output(mock_model, SearchQueries)
+    second = bind_structured_output(mock_model, SearchQueries)
+    
+    assert first is second
+    mock_model.with_structured_output.assert_called_once_with(SearchQueries)
+
+
+@patch("polyplexity_agent.utils.helpers._raw_structured_models", {})
+def test_invoke_structured_feeds_back_parsing_error():
+    """Test a parsing failure is retried with the model's reply and the error appended."""
+    from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+    from polyplexity_agent.models import SearchQueries
+    
+    queries = SearchQueries(queries=["a", "b"])
+    bad_reply = AIMessage(content='{"query": "a"}')
+    mock_model = Mock(model_name="test-model", temperature=0.0)
+    structured = mock_model.with_structured_output.return_value.with_retry.return_value
+    structured.invoke.side_effect = [
+        {"raw": bad_reply, "parsed": None, "parsing_error": ValueError("queries missing")},
+        {"raw": Mock(), "parsed": queries, "parsing_error": None},
+    ]
+    messages = [SystemMessage(content="system"), HumanMessage(content="topic")]
+    
+    result = invoke_structured(mock_model, SearchQueries, messages)
+    
+    assert result is queries
+    mock_model.with_structured_output.assert_called_once_with(SearchQueries, include_raw=True)
+    mock_model.with_structured_output.return_value.with_retry.assert_called_once_with(stop_after_attempt=3)
+    retry_messages = structured.invoke.call_args_list[1][0][0]
+    assert retry_messages[:3] == messages + [bad_reply]
+    assert "queries missing" in retry_messages[3].content
+    assert len(messages) == 2
+
+
+@patch("polyplexity_agent.utils.helpers._raw_structured_models", {})
+def test_invoke_structured_answers_failed_tool_calls():
+    """Test a failed tool call gets the validation error back as its tool result."""
+    from langchain_core.messages import AIMessage, ToolMessage
+    from polyplexity_agent.models import SearchQueries
+    
+    queries = SearchQueries(queries=["a"])
+    bad_reply = AIMessage(content="", tool_calls=[{"name": "SearchQueries", "args": {}, "id": "call_1"}])
+    mock_model = Mock(model_name="test-model", temperature=0.0)
+    structured = mock_model.with_structured_output.return_value.with_retry.return_value
+    structured.invoke.side_effect = [
+        {"raw": bad_reply, "parsed": None, "parsing_error": ValueError("queries missing")},
+        {"raw": Mock(), "parsed": queries, "parsing_error": None},
+    ]
+    
+    assert invoke_structured(mock_model, SearchQueries, []) is queries
+    
+    retry_messages = structured.invoke.call_args_list[1][0][0]
+    assert retry_messages[0] is bad_reply
+    assert isinstance(retry_messages[1], ToolMessage)
+    assert retry_messages[1].tool_call_id == "call_1"
+    assert "queries missing" in retry_messages[1].content
+
+
+@patch("polyplexity_agent.utils.helpers._raw_structured_models", {})
+def test_invoke_structured_raises_after_max_attempts():
+    """Test invoke_structured gives up after max_structured_output_retries attempts."""
+    from polyplexity_agent.models import SearchQueries
+    
+    mock_model = Mock(model_name="test-model", temperature=0.0)
+    structured = mock_model.with_structured_output.return_value.with_retry.return_value
+    structured.invoke.return_value = {"raw": Mock(), "parsed": None, "parsing_error": ValueError("bad")}
+    
+    with pytest.raises(ValueError, match="bad"):
+        invoke_structured(mock_model, SearchQueries, [])
+    
+    assert structured.invoke.call_count == 3
+
+
+@pytest.mark.asyncio
+@patch("polyplexity_agent.utils.helpers._raw_structured_models", {})
+async def test_ainvoke_structured_leaves_api_errors_to_with_retry():
+    """Test API errors escaping with_retry are raised rather than retried again."""
+    from unittest.mock import AsyncMock
+    from polyplexity_agent.models import SearchQueries
+    
+    mock_model = Mock(model_name="test-model", temperature=0.0)
+    structured = mock_model.with_structured_output.return_value.with_retry.return_value
+    structured.ainvoke = AsyncMock(side_effect=RuntimeError("unauthorized"))
+    
+    with pytest.raises(RuntimeError, match="unauthorized"):
+        await ainvoke_structured(mock_model, SearchQueries, [])
+    
+    assert structured.ainvoke.await_count == 1
+
+
+@patch("polyplexity_agent.utils.helpers.create_llm_model")
+def test_generate_thread_name_uses_thread_name_model(mock_create_llm_model):
+    """Test generate_thread_name asks create_llm_model for the thread name model configuration."""
+    from polyplexity_agent.utils import helpers
+    
+    mock_create_llm_model.return_value.invoke.return_value = Mock(content="AI Research")
+    
+    generate_thread_name("What is AI?")
+    
+    mock_create_llm_model.assert_called_once_with(
+        helpers._settings.thread_name_model, helpers._settings.thread_name_temperature
+    )
+
+
 @patch("polyplexity_agent.logging.get_logger")
-@patch("polyplexity_agent.utils.helpers._thread_name_model")
-def test_generate_thread_name_success(mock_model, mock_get_logger):
+@patch("polyplexity_agent.utils.helpers.create_llm_model")
+def test_generate_thread_name_success(mock_create_llm_model, mock_get_logger):
     """Test generate_thread_name generates name from LLM response."""
+    mock_model = mock_create_llm_model.return_value
     mock_response = Mock()
     mock_response.content = "Artificial Intelligence Research"
     mock_model.invoke.return_value = mock_response
@@ -83,9 +283,10 @@ def test_generate_thread_name_success(mock_model, mock_get_logger):
 
 
 @patch("polyplexity_agent.logging.get_logger")
-@patch("polyplexity_agent.utils.helpers._thread_name_model")
-def test_generate_thread_name_removes_quotes(mock_model, mock_get_logger):
+@patch("polyplexity_agent.utils.helpers.create_llm_model")
+def test_generate_thread_name_removes_quotes(mock_create_llm_model, mock_get_logger):
     """Test generate_thread_name removes surrounding quotes."""
+    mock_model = mock_create_llm_model.return_value
     mock_response = Mock()
     mock_response.content = '"AI Research Topic"'
     mock_model.invoke.return_value = mock_response
@@ -98,9 +299,10 @@ def test_generate_thread_name_removes_quotes(mock_model, mock_get_logger):
 
 
 @patch("polyplexity_agent.logging.get_logger")
-@patch("polyplexity_agent.utils.helpers._thread_name_model")
-def test_generate_thread_name_truncates_long_names(mock_model, mock_get_logger):
+@patch("polyplexity_agent.utils.helpers.create_llm_model")
+def test_generate_thread_name_truncates_long_names(mock_create_llm_model, mock_get_logger):
     """Test generate_thread_name truncates names longer than 5 words."""
+    mock_model = mock_create_llm_model.return_value
     mock_response = Mock()
     mock_response.content = "This is a very long thread name that exceeds five words"
     mock_model.invoke.return_value = mock_response
@@ -113,9 +315,10 @@ def test_generate_thread_name_truncates_long_names(mock_model, mock_get_logger):
 
 
 @patch("polyplexity_agent.logging.get_logger")
-@patch("polyplexity_agent.utils.helpers._thread_name_model")
-def test_generate_thread_name_fallback_on_error(mock_model, mock_get_logger):
+@patch("polyplexity_agent.utils.helpers.create_llm_model")
+def test_generate_thread_name_fallback_on_error(mock_create_llm_model, mock_get_logger):
     """Test generate_thread_name falls back to truncated query on error."""
+    mock_model = mock_create_llm_model.return_value
     mock_logger = Mock()
     mock_get_logger.return_value = mock_logger
     mock_model.invoke.side_effect = Exception("LLM error")
@@ -130,9 +333,10 @@ def test_generate_thread_name_fallback_on_error(mock_model, mock_get_logger):
 
 
 @patch("polyplexity_agent.logging.get_logger")
-@patch("polyplexity_agent.utils.helpers._thread_name_model")
-def test_generate_thread_name_fallback_on_empty(mock_model, mock_get_logger):
+@patch("polyplexity_agent.utils.helpers.create_llm_model")
+def test_generate_thread_name_fallback_on_empty(mock_create_llm_model, mock_get_logger):
     """Test generate_thread_name falls back when LLM returns empty name."""
+    mock_model = mock_create_llm_model.return_value
     mock_response = Mock()
     mock_response.content = ""
     mock_model.invoke.return_value = mock_response
@@ -198,6 +402,15 @@ def test_format_search_url_markdown_without_www():
     assert result == "[example.com](https://example.com/page)"
 
 
+def test_log_text_summary_keeps_preview_and_length():
+    """Test long text is reduced to a preview and its length for state logs."""
+    text = "x" * 500
+    
+    summary = log_text_summary("research_summary", text)
+    
+    assert summary == {"research_summary_preview": "x" * 200, "research_summary_len": 500}
+
+
 def test_format_search_url_markdown_invalid_url():
     """Test format_search_url_markdown handles invalid URL gracefully."""
     url = "not-a-valid-url"
@@ -229,7 +442,15 @@ def test_save_messages_and_trace_success(mock_get_logger, mock_get_db_manager):
     
     assert result == "assistant_msg_456"
     assert mock_db_manager.save_message.call_count == 2
-    mock_db_manager.save_execution_trace.assert_called_once()
+    mock_db_manager.save_execution_traces.assert_called_once()
+    message_id, rows = mock_db_manager.save_execution_traces.call_args[0]
+    assert message_id == "assistant_msg_456"
+    assert rows == [{
+        "event_type": "node_call",
+        "event_data": {"key": "value", "node": "test_node"},
+        "timestamp": 1234567890,
+        "event_index": 0,
+    }]
 
 
 @patch("polyplexity_agent.utils.helpers.get_database_manager")
@@ -253,6 +474,25 @@ def test_save_messages_and_trace_handles_error(mock_get_logger, mock_get_db_mana
     mock_logger.warning.assert_called_once()
 
 
+def test_run_in_background_and_wait():
+    """Test background tasks run off-thread and can be awaited."""
+    release = threading.Event()
+    calls = []
+    
+    def slow_save(value):
+        release.wait(timeout=5)
+        calls.append(value)
+    
+    future = run_in_background(slow_save, "saved")
+    assert calls == []
+    
+    release.set()
+    wait_for_background_tasks(timeout=5)
+    
+    assert future.done()
+    assert calls == ["saved"]
+
+
 @patch("polyplexity_agent.utils.helpers.get_database_manager")
 @patch("polyplexity_agent.logging.get_logger")
 def test_ensure_trace_completeness_no_messages(mock_get_logger, mock_get_db_manager):
@@ -263,7 +503,7 @@ def test_ensure_trace_completeness_no_messages(mock_get_logger, mock_get_db_mana
     
     ensure_trace_completeness("thread_123", [])
     
-    mock_db_manager.get_message_traces.assert_not_called()
+    mock_db_manager.count_message_traces.assert_not_called()
 
 
 @patch("polyplexity_agent.utils.helpers.get_database_manager")
@@ -278,10 +518,7 @@ def test_ensure_trace_completeness_complete_trace(mock_get_logger, mock_get_db_m
     mock_db_manager.get_thread_messages.return_value = [
         {"id": "msg_123", "role": "assistant"}
     ]
-    mock_db_manager.get_message_traces.return_value = [
-        {"event": "trace1"},
-        {"event": "trace2"},
-    ]
+    mock_db_manager.count_message_traces.return_value = 2
     
     expected_trace = [
         {"type": "node_call", "node": "node1", "data": {}, "timestamp": 1234567890},
@@ -291,7 +528,7 @@ def test_ensure_trace_completeness_complete_trace(mock_get_logger, mock_get_db_m
     ensure_trace_completeness("thread_123", expected_trace)
     
     # Should not delete or update since trace is complete
-    mock_db_manager.delete_message_traces.assert_not_called()
+    mock_db_manager.save_execution_traces.assert_not_called()
 
 
 @patch("polyplexity_agent.utils.helpers.get_database_manager")
@@ -306,9 +543,7 @@ def test_ensure_trace_completeness_incomplete_trace(mock_get_logger, mock_get_db
     mock_db_manager.get_thread_messages.return_value = [
         {"id": "msg_123", "role": "assistant"}
     ]
-    mock_db_manager.get_message_traces.return_value = [
-        {"event": "trace1"},  # Only 1 trace, but expected has 2
-    ]
+    mock_db_manager.count_message_traces.return_value = 1  # Only 1 trace, but expected has 2
     
     expected_trace = [
         {"type": "node_call", "node": "node1", "data": {}, "timestamp": 1234567890},
@@ -317,6 +552,12 @@ def test_ensure_trace_completeness_incomplete_trace(mock_get_logger, mock_get_db
     
     ensure_trace_completeness("thread_123", expected_trace)
     
-    # Should delete old traces and save new ones
-    mock_db_manager.delete_message_traces.assert_called_once_with("msg_123")
-    assert mock_db_manager.save_execution_trace.call_count == 2
+    # Should count the stored rows instead of loading them
+    mock_db_manager.count_message_traces.assert_called_once_with("msg_123")
+    mock_db_manager.get_message_traces.assert_not_called()
+    # Should replace old traces with the full trace in one batch
+    mock_db_manager.save_execution_traces.assert_called_once()
+    args, kwargs = mock_db_manager.save_execution_traces.call_args
+    assert args[0] == "msg_123"
+    assert [row["event_index"] for row in args[1]] == [0, 1]
+    assert kwargs == {"replace": True}
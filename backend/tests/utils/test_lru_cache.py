@@ -0,0 +1,45 @@
+"""
+Tests for the shared LRU cache.
+"""
+from unittest.mock import patch
+
+from polyplexity_agent.utils.lru_cache import LRUCache
+
+
+def test_cache_evicts_least_recently_used():
+    """Test the cache stays within its size, evicting the entry used longest ago."""
+    cache = LRUCache(2)
+
+    cache.put("a", "A")
+    cache.put("b", "B")
+    cache.get("a")
+    cache.put("c", "C")
+
+    assert len(cache) == 2
+    assert cache.get("a") == "A"
+    assert cache.get("b") is None
+    assert cache.get("c") == "C"
+
+
+@patch("polyplexity_agent.utils.lru_cache.time")
+def test_cache_entries_expire_after_ttl(mock_time):
+    """Test entries older than the time-to-live are a miss and are dropped."""
+    cache = LRUCache(2, ttl=60.0)
+    mock_time.monotonic.return_value = 1000.0
+    cache.put("a", "A")
+
+    mock_time.monotonic.return_value = 1060.0
+    assert cache.get("a") == "A"
+
+    mock_time.monotonic.return_value = 1061.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_cache_without_size_stores_nothing():
+    """Test a cache sized zero is disabled."""
+    cache = LRUCache(0)
+
+    cache.put("a", "A")
+
+    assert cache.get("a") is None
@@ -0,0 +1,30 @@
+"""
+Tests for pre-parsed prompt templates.
+"""
+import pytest
+
+from polyplexity_agent.prompts.researcher import (
+    QUERY_GENERATION_USER_PROMPT_TEMPLATE,
+    RESEARCH_SYNTHESIS_PROMPT_TEMPLATE,
+)
+from polyplexity_agent.utils.prompt_template import compile_template
+
+
+@pytest.mark.parametrize(
+    "template, values",
+    [
+        (QUERY_GENERATION_USER_PROMPT_TEMPLATE, {"current_date": "01 02 25", "topic": "AI chips"}),
+        (RESEARCH_SYNTHESIS_PROMPT_TEMPLATE, {"current_date": "01 02 25", "topic": "AI chips", "raw_data": "{results}"}),
+        ("Literal {{braces}} around {name} and {name}", {"name": 3}),
+    ],
+)
+def test_compile_template_matches_format(template, values):
+    """Test compiled templates render exactly like str.format."""
+    assert compile_template(template)(**values) == template.format(**values)
+
+
+@pytest.mark.parametrize("template", ["{0}", "{}", "{item.name}", "{value:>10}", "{value!r}"])
+def test_compile_template_rejects_complex_fields(template):
+    """Test fields beyond plain names are rejected when compiling."""
+    with pytest.raises(ValueError):
+        compile_template(template)
@@ -0,0 +1,64 @@
+"""
+Tests for the researcher summary cache.
+"""
+import pytest
+
+from polyplexity_agent.models import SearchQueries
+from polyplexity_agent.utils.research_cache import (
+    cache_queries,
+    cache_research,
+    clear_research_cache,
+    get_cached_queries,
+    get_cached_research,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Start every test with an empty research cache."""
+    clear_research_cache()
+    yield
+    clear_research_cache()
+
+
+def test_cache_hit_normalizes_topic():
+    """Test topics differing only in case or spacing share an entry."""
+    cache_research("AI  regulation", 3, "01 02 25", "Summary")
+    
+    assert get_cached_research("ai regulation", 3, "01 02 25") == "Summary"
+
+
+def test_cache_is_keyed_by_breadth_and_date():
+    """Test research for another breadth or day is a cache miss."""
+    cache_research("AI", 3, "01 02 25", "Summary")
+    
+    assert get_cached_research("AI", 5, "01 02 25") is None
+    assert get_cached_research("AI", 3, "01 03 25") is None
+
+
+def test_cache_ignores_empty_summaries():
+    """Test failed research with no summary is not cached."""
+    cache_research("AI", 3, "01 02 25", "")
+    
+    assert get_cached_research("AI", 3, "01 02 25") is None
+
+
+def test_query_cache_hit_returns_fresh_instance():
+    """Test cached queries are shared across breadths but not across days."""
+    resp = SearchQueries(queries=["AI definition", "AI history"])
+    cache_queries("AI  Regulation", "01 02 25", resp)
+    
+    cached = get_cached_queries("ai regulation", "01 02 25")
+    
+    assert cached == resp
+    assert cached is not resp
+    assert get_cached_queries("ai regulation", "01 03 25") is None
+
+
+def test_query_cache_ignores_empty_or_invalid_responses():
+    """Test only non-empty SearchQueries responses are cached."""
+    cache_queries("AI", "d", SearchQueries(queries=[]))
+    cache_queries("ML", "d", {"queries": ["ML"]})
+    
+    assert get_cached_queries("AI", "d") is None
+    assert get_cached_queries("ML", "d") is None
@@ -0,0 +1,79 @@
+"""
+Tests for the LLM response cache.
+"""
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from polyplexity_agent.utils.response_cache import (
+    ainvoke_cached,
+    cache_response,
+    clear_response_cache,
+    get_cached_response,
+    invoke_cached,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Start every test with an empty response cache."""
+    clear_response_cache()
+    yield
+    clear_response_cache()
+
+
+@pytest.fixture
+def mock_model():
+    """Create a mock chat model with a string model id."""
+    model = Mock()
+    model.model_name = "test-model"
+    model.invoke.return_value = Mock(content="Answer")
+    model.ainvoke = AsyncMock(return_value=Mock(content="Answer"))
+    return model
+
+
+def test_invoke_cached_reuses_response(mock_model):
+    """Test a repeated prompt is served from the cache."""
+    assert invoke_cached(mock_model, "prompt") == "Answer"
+    assert invoke_cached(mock_model, "prompt") == "Answer"
+    
+    mock_model.invoke.assert_called_once()
+
+
+def test_cache_ignores_whitespace_differences(mock_model):
+    """Test prompts that differ only in spacing share a cache entry."""
+    cache_response(mock_model, "User Request: What is AI?\n\nNotes:", "Answer")
+    
+    assert get_cached_response(mock_model, "User Request:  What is AI? \nNotes: ") == "Answer"
+    assert get_cached_response(mock_model, "User Request: What is ML?\n\nNotes:") is None
+
+
+def test_cache_is_keyed_by_model(mock_model):
+    """Test the same prompt for a different model is a cache miss."""
+    cache_response(mock_model, "prompt", "Answer")
+    other_model = Mock()
+    other_model.model_name = "other-model"
+    
+    assert get_cached_response(mock_model, "prompt") == "Answer"
+    assert get_cached_response(other_model, "prompt") is None
+
+
+def test_cache_skips_models_without_string_id():
+    """Test models without a string model id are never cached."""
+    model = Mock()
+    model.invoke.return_value = Mock(content="Answer")
+    
+    invoke_cached(model, "prompt")
+    invoke_cached(model, "prompt")
+    
+    assert model.invoke.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_ainvoke_cached_reuses_response(mock_model):
+    """Test the async variant shares the cache with the sync one."""
+    assert await ainvoke_cached(mock_model, "prompt") == "Answer"
+    assert invoke_cached(mock_model, "prompt") == "Answer"
+    
+    mock_model.ainvoke.assert_awaited_once()
+    mock_model.invoke.assert_not_called()
@@ -0,0 +1,39 @@
+"""
+Tests for the Tavily search result cache.
+"""
+from unittest.mock import patch
+
+import pytest
+
+from polyplexity_agent.utils.search_cache import (
+    cache_search,
+    clear_search_cache,
+    get_cached_search,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Start every test with an empty search cache."""
+    clear_search_cache()
+    yield
+    clear_search_cache()
+
+
+def test_cache_hit_normalizes_query():
+    """Test queries differing only in case or spacing share an entry."""
+    cache_search("AI  regulation ", 2, {"results": []})
+    
+    assert get_cached_search("ai regulation", 2) == {"results": []}
+    assert get_cached_search("ai regulation", 3) is None
+
+
+@patch("polyplexity_agent.utils.lru_cache.time")
+def test_cache_entries_expire(mock_time):
+    """Test entries older than the time-to-live are a cache miss."""
+    mock_time.monotonic.return_value = 1000.0
+    cache_search("AI", 2, {"results": []})
+    
+    mock_time.monotonic.return_value = 1000.0 + 86400.0 + 1
+    
+    assert get_cached_search("AI", 2) is None
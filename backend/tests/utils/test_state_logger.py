@@ -2,6 +2,7 @@
 Tests for StateLogger utility.
 """
 import tempfile
+from collections import ChainMap
 from pathlib import Path
 from unittest.mock import Mock, patch
 
@@ -75,6 +76,26 @@ def test_state_logger_log_state(temp_log_file):
     assert "Test info" in content
 
 
+def test_state_logger_log_state_chainmap_view(temp_log_file):
+    """Test log_state accepts a ChainMap view with updates overriding the state."""
+    logger = StateLogger(temp_log_file)
+    state = {"user_request": "Test question", "iterations": 1}
+    
+    logger.log_state(
+        node_name="test_node",
+        graph_type="MAIN_GRAPH",
+        state=ChainMap({"iterations": 2, "final_report": "Report"}, state),
+        timing="AFTER"
+    )
+    
+    logger.close()
+    
+    content = temp_log_file.read_text()
+    assert content.index("user_request:") < content.index("iterations:\n2") < content.index("final_report:")
+    assert "iterations:\n1" not in content
+    assert state == {"user_request": "Test question", "iterations": 1}
+
+
 def test_state_logger_format_state_value_string(temp_log_file):
     """Test _format_state_value formats strings correctly."""
     logger = StateLogger(temp_log_file)
@@ -237,3 +258,43 @@ def test_state_logger_multiple_logs(temp_log_file):
     assert "node2" in content
     assert "value1" in content
     assert "value2" in content
+
+
+def test_state_logger_summary_mode_before_lists_keys(temp_log_file):
+    """Test non-verbose BEFORE entries list state keys without their values."""
+    logger = StateLogger(temp_log_file, verbose=False)
+    
+    logger.log_state(
+        node_name="test_node",
+        graph_type="MAIN_GRAPH",
+        state={"user_request": "Test question", "research_notes": ["note1", "note2"]},
+        timing="BEFORE"
+    )
+    
+    logger.close()
+    
+    content = temp_log_file.read_text()
+    assert "user_request (len 13)" in content
+    assert "research_notes (len 2)" in content
+    assert "Test question" not in content
+
+
+def test_state_logger_summary_mode_after_logs_update_only(temp_log_file):
+    """Test non-verbose AFTER entries only write the node update of a ChainMap view."""
+    logger = StateLogger(temp_log_file, verbose=False)
+    state = {"user_request": "Test question", "iterations": 1}
+    
+    logger.log_state(
+        node_name="test_node",
+        graph_type="MAIN_GRAPH",
+        state=ChainMap({"iterations": 2, "final_report": "Report"}, state),
+        timing="AFTER"
+    )
+    
+    logger.close()
+    
+    content = temp_log_file.read_text()
+    assert "State update:" in content
+    assert "iterations:\n2" in content
+    assert "final_report:\nReport" in content
+    assert "user_request" not in content
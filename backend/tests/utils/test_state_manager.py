@@ -57,6 +57,28 @@ def test_set_state_logger_none(temp_log_file):
     logger.close()
 
 
+def test_state_logger_is_isolated_per_context(temp_log_file):
+    """Test a logger set in one run's context is not visible to another."""
+    import contextvars
+    from polyplexity_agent.utils import state_manager
+    
+    logger = StateLogger(temp_log_file)
+    
+    def run():
+        token = state_manager.set_state_logger(logger)
+        seen = state_manager.get_state_logger()
+        state_manager.reset_state_logger(token)
+        return seen, state_manager.get_state_logger()
+    
+    seen, after_reset = contextvars.copy_context().run(run)
+    
+    assert seen is logger
+    assert after_reset is None
+    assert state_manager.get_state_logger() is None
+    
+    logger.close()
+
+
 def test_ensure_checkpointer_setup_success():
     """Test successful checkpointer setup."""
     from polyplexity_agent.utils import state_manager
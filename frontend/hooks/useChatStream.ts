@@ -251,6 +251,13 @@ export function useChatStream({
       setStage("answering");
     }
 
+    if (eventName === "final_report_delta") {
+      const delta = payload.delta;
+      if (delta) {
+        setStreamingContent((prev) => prev + delta);
+      }
+    }
+
     if (eventName === "final_report_complete") {
       const report = payload.report || event.report;
       setCurrentStatus(null);